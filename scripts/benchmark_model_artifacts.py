@@ -0,0 +1,81 @@
+"""Compares the size and load time of the trained models saved as a pickle, with
+``PickleDataset``, and in the native format of their library, with
+``ModelArtifactDataset``.
+
+Run it from the project root after a full run, which saved the models:
+
+    python scripts/benchmark_model_artifacts.py --repeats 20
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from kedro.framework.session import KedroSession
+from kedro.framework.startup import bootstrap_project
+from kedro_datasets.pickle import PickleDataset
+
+from energy_forcasting_model.datasets import ModelArtifactDataset
+from energy_forcasting_model.training import MODELS
+
+# Library and file extension of the model of every model pipeline
+LIBRARIES = {
+    "xgboost": ("xgboost", "ubj"),
+    "lightgbm": ("lightgbm", "txt"),
+    "catboost": ("catboost", "cbm"),
+    "random_forest": ("sklearn", "pkl"),
+}
+
+
+def best_load_time(dataset, repeats: int) -> float:
+    """The shortest of `repeats` loads of the dataset, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        dataset.load()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def files_size(directory: Path, stem: str) -> float:
+    """The size of the files of a saved model, its sidecar included, in kilobytes."""
+    return sum(path.stat().st_size for path in directory.glob(f"{stem}.*")) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=20, help="loads timed per model")
+    args = parser.parse_args()
+
+    project_path = Path.cwd()
+    bootstrap_project(project_path)
+    with KedroSession.create(project_path=project_path) as session:
+        catalog = session.load_context().catalog
+
+    print(
+        f"{'model':<15}{'pickle KB':>11}{'native KB':>11}{'pickle ms':>11}"
+        f"{'native ms':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for name in MODELS:
+            model = catalog.load(f"{name}_model")
+            library, extension = LIBRARIES[name]
+            pickled = PickleDataset(filepath=str(directory / f"{name}_pickle.pkl"))
+            native = ModelArtifactDataset(
+                filepath=str(directory / f"{name}_native.{extension}"), library=library
+            )
+            pickled.save(model)
+            native.save(model)
+            print(
+                f"{name:<15}"
+                f"{files_size(directory, f'{name}_pickle'):>11.0f}"
+                f"{files_size(directory, f'{name}_native'):>11.0f}"
+                f"{best_load_time(pickled, args.repeats):>11.1f}"
+                f"{best_load_time(native, args.repeats):>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Custom Kedro datasets used by the energy-forcasting-model catalog."""
+
+from .feature_cache_dataset import FeatureCacheDataset
+from .memmap_dataset import MemmapDataset
+from .model_artifact_dataset import ModelArtifactDataset
+from .model_input_cache_dataset import ModelInputCacheDataset
+from .month_partitioned_parquet_dataset import MonthPartitionedParquetDataset
+from .optional_dataset import OptionalDataset
+from .plot_spec_dataset import PlotSpecDataset
+from .schema_dataset import SchemaDataset, apply_schema
+from .tuning_study_dataset import TuningStudy, TuningStudyDataset
+
+__all__ = [
+    "FeatureCacheDataset",
+    "MemmapDataset",
+    "ModelArtifactDataset",
+    "ModelInputCacheDataset",
+    "MonthPartitionedParquetDataset",
+    "OptionalDataset",
+    "PlotSpecDataset",
+    "SchemaDataset",
+    "TuningStudy",
+    "TuningStudyDataset",
+    "apply_schema",
+]
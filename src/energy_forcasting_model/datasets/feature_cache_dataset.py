@@ -0,0 +1,104 @@
+"""``FeatureCacheDataset`` stores computed feature columns as ``.npy`` files, grouped by
+a fingerprint of the source column they were computed from, and loads them lazily.
+"""
+
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from kedro.io import AbstractDataset
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureCacheDataset(
+    AbstractDataset[
+        Dict[str, Dict[str, Optional[Any]]], Dict[str, Dict[str, Callable]]
+    ]
+):
+    """Cache of feature columns, laid out as ``<filepath>/<fingerprint>/<feature
+    name>.npy``, where the fingerprint is that of the source column and index.
+
+    Loading returns ``{fingerprint: {feature name: loader}}``, where each loader reads
+    its column only when called, so listing the cache reads no data. Saving takes the
+    entries the cache must hold, ``{fingerprint: {feature name: array or None}}``: the
+    arrays are written, the ``None`` entries are kept as cached, and every other
+    cached entry is deleted, so the cache does not grow with features and data that
+    are no longer requested. An empty or missing cache loads as ``{}``.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        feature_cache:
+          type: energy_forcasting_model.datasets.FeatureCacheDataset
+          filepath: data/02_processed/feature_cache
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        mmap_mode: Optional[str] = "r",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``FeatureCacheDataset``.
+
+        Args:
+            filepath: Local directory holding the cache.
+            mmap_mode: Passed to ``np.load``. Memory-maps the cached columns by default.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._mmap_mode = mmap_mode
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self._filepath)}
+
+    @staticmethod
+    def _check_name(name: str) -> str:
+        if not re.fullmatch(r"[\w.\-]+", name):
+            raise ValueError(f"'{name}' cannot be used as a feature cache entry name.")
+        return name
+
+    def _load(self) -> Dict[str, Dict[str, Callable]]:
+        cache = {}
+        if not self._filepath.exists():
+            return cache
+        for fingerprint_dir in sorted(p for p in self._filepath.iterdir() if p.is_dir()):
+            cache[fingerprint_dir.name] = {
+                path.stem: (
+                    lambda path=path: np.load(path, mmap_mode=self._mmap_mode)
+                )
+                for path in sorted(fingerprint_dir.glob("*.npy"))
+            }
+        return cache
+
+    def _save(self, data: Dict[str, Dict[str, Optional[Any]]]) -> None:
+        n_saved, n_pruned = 0, 0
+        if self._filepath.exists():
+            for fingerprint_dir in self._filepath.iterdir():
+                if fingerprint_dir.is_dir() and fingerprint_dir.name not in data:
+                    n_pruned += len(list(fingerprint_dir.glob("*.npy")))
+                    shutil.rmtree(fingerprint_dir)
+        for fingerprint, features in data.items():
+            fingerprint_dir = self._filepath / self._check_name(fingerprint)
+            fingerprint_dir.mkdir(parents=True, exist_ok=True)
+            for path in fingerprint_dir.glob("*.npy"):
+                if path.stem not in features:
+                    path.unlink()
+                    n_pruned += 1
+            for name, values in features.items():
+                if values is not None:
+                    np.save(fingerprint_dir / f"{self._check_name(name)}.npy", values)
+                    n_saved += 1
+        logger.info(
+            f"Saved {n_saved} new entries to the feature cache, pruned {n_pruned}."
+        )
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
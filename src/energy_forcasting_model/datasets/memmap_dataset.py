@@ -0,0 +1,195 @@
+"""``MemmapDataset`` stores a DataFrame or Series as one raw binary file plus a JSON
+manifest, and loads it as memory-mapped, zero-copy views of that file.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 64
+
+
+def _column_runs(data: pd.DataFrame) -> List[List[int]]:
+    """Splits the column positions of a DataFrame into runs of consecutive columns
+    sharing a dtype, so every run can be stored as one contiguous block."""
+    runs = []
+    for position, dtype in enumerate(data.dtypes):
+        if runs and data.dtypes.iloc[runs[-1][0]] == dtype:
+            runs[-1].append(position)
+        else:
+            runs.append([position])
+    return runs
+
+
+class MemmapDataset(AbstractDataset[Union[pd.DataFrame, pd.Series], pd.DataFrame]):
+    """Dataset storing a feature matrix as a raw contiguous binary file.
+
+    The data is laid out in ``<filepath>/data.bin`` as one block per run of consecutive
+    columns sharing a dtype, each column contiguous, followed by the numeric levels of
+    the index. ``<filepath>/manifest.json`` records the column names, dtypes, block
+    offsets and the index. Loading memory-maps the blocks and wraps them in a DataFrame
+    without copying, so load time does not depend on the width of the matrix, and
+    processes loading the same file share its pages through the OS page cache.
+
+    Only numeric, boolean and datetime columns can be stored. Saving writes to a
+    temporary file first, so processes still reading the previous version are not
+    affected.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        X_train:
+          type: energy_forcasting_model.datasets.MemmapDataset
+          filepath: data/03_training_data/X_train
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        mmap_mode: Optional[str] = "r",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``MemmapDataset``.
+
+        Args:
+            filepath: Local directory holding ``data.bin`` and ``manifest.json``.
+            mmap_mode: ``r`` for read-only views, ``c`` for copy-on-write views, or
+                None to read the data into memory.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._mmap_mode = mmap_mode
+        self.metadata = metadata
+
+    @property
+    def _data_path(self) -> Path:
+        return self._filepath / "data.bin"
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self._filepath / "manifest.json"
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self._filepath), "mmap_mode": self._mmap_mode}
+
+    def _save(self, data: Union[pd.DataFrame, pd.Series]) -> None:
+        is_series = isinstance(data, pd.Series)
+        frame = data.to_frame() if is_series else data
+        for column, dtype in frame.dtypes.items():
+            if dtype.kind not in "biufM":
+                raise DatasetError(
+                    f"Column '{column}' has dtype {dtype}, only numeric, boolean and "
+                    f"datetime columns can be stored in a MemmapDataset."
+                )
+
+        manifest = {
+            "n_rows": len(frame),
+            "series": is_series,
+            "columns": [str(column) for column in frame.columns],
+            "blocks": [],
+            "index": {"names": list(frame.index.names), "levels": []},
+        }
+        self._filepath.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._data_path.with_suffix(".bin.tmp")
+        with open(tmp_path, "wb") as file:
+
+            def write(array: np.ndarray) -> int:
+                padding = -file.tell() % _ALIGNMENT
+                file.write(b"\0" * padding)
+                offset = file.tell()
+                file.write(np.ascontiguousarray(array).tobytes())
+                return offset
+
+            for run in _column_runs(frame):
+                # One row per column, so every column is contiguous in the file
+                block = frame.iloc[:, run].to_numpy().T
+                manifest["blocks"].append(
+                    {
+                        "dtype": block.dtype.str,
+                        "columns": [run[0], run[-1] + 1],
+                        "offset": write(block),
+                    }
+                )
+
+            for level in range(frame.index.nlevels):
+                values = frame.index.get_level_values(level)
+                if values.dtype.kind in "biufM":
+                    array = values.to_numpy()
+                    manifest["index"]["levels"].append(
+                        {"dtype": array.dtype.str, "offset": write(array)}
+                    )
+                else:
+                    manifest["index"]["levels"].append({"values": values.tolist()})
+
+        os.replace(tmp_path, self._data_path)
+        with open(self._manifest_path, "w") as file:
+            json.dump(manifest, file)
+
+    def _array(self, dtype: str, offset: int, shape: tuple) -> np.ndarray:
+        if self._mmap_mode is None:
+            with open(self._data_path, "rb") as file:
+                file.seek(offset)
+                count = int(np.prod(shape))
+                return np.fromfile(file, dtype=dtype, count=count).reshape(shape)
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.asarray(
+            np.memmap(
+                self._data_path,
+                dtype=dtype,
+                mode=self._mmap_mode,
+                offset=offset,
+                shape=shape,
+            )
+        )
+
+    def _load(self) -> Union[pd.DataFrame, pd.Series]:
+        with open(self._manifest_path) as file:
+            manifest = json.load(file)
+        n_rows = manifest["n_rows"]
+
+        levels = [
+            level["values"]
+            if "values" in level
+            else self._array(level["dtype"], level["offset"], (n_rows,))
+            for level in manifest["index"]["levels"]
+        ]
+        names = manifest["index"]["names"]
+        if len(levels) == 1:
+            index = pd.Index(levels[0], name=names[0])
+        else:
+            index = pd.MultiIndex.from_arrays(levels, names=names)
+
+        columns = manifest["columns"]
+        frames = []
+        for block in manifest["blocks"]:
+            start, stop = block["columns"]
+            values = self._array(block["dtype"], block["offset"], (stop - start, n_rows))
+            frames.append(
+                pd.DataFrame(
+                    values.T, index=index, columns=columns[start:stop], copy=False
+                )
+            )
+        if not frames:
+            data = pd.DataFrame(index=index, columns=columns)
+        elif len(frames) == 1:
+            data = frames[0]
+        else:
+            data = pd.concat(frames, axis=1, copy=False)
+
+        if manifest["series"]:
+            return data.iloc[:, 0]
+        return data
+
+    def _exists(self) -> bool:
+        return self._manifest_path.exists() and self._data_path.exists()
@@ -0,0 +1,256 @@
+"""``ModelArtifactDataset`` saves a trained model in the native format of its library,
+with a small JSON metadata sidecar.
+"""
+
+import functools
+import importlib
+import json
+import logging
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from kedro.io import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+
+def _model_class(metadata: Dict[str, Any]) -> type:
+    module, _, name = metadata["model_class"].rpartition(".")
+    return getattr(importlib.import_module(module), name)
+
+
+def _save_xgboost(model: Any, path: Path) -> None:
+    model.save_model(str(path))
+
+
+def _load_xgboost(path: Path, metadata: Dict[str, Any]) -> Any:
+    model = _model_class(metadata)()
+    model.load_model(str(path))
+    # The model file keeps the scikit-learn parameters of the models fitted by the
+    # wrapper only, not of those trained with the native API
+    return model.set_params(**metadata["params"])
+
+
+def _describe_xgboost(model: Any, path: Path) -> Dict[str, Any]:
+    booster = model.get_booster()
+    try:
+        best_iteration = booster.best_iteration
+    except AttributeError:
+        best_iteration = None
+    return {
+        "feature_names": booster.feature_names,
+        "feature_types": booster.feature_types,
+        "best_iteration": best_iteration,
+        "n_trees": booster.num_boosted_rounds(),
+    }
+
+
+def _save_lightgbm(model: Any, path: Path) -> None:
+    # Saves the iterations up to the best one, those the model predicts with
+    model.booster_.save_model(str(path))
+
+
+def _load_lightgbm(path: Path, metadata: Dict[str, Any]) -> Any:
+    import lightgbm as lgb
+
+    booster = lgb.Booster(model_file=str(path))
+    booster.best_iteration = metadata["best_iteration"] or 0
+    model = _model_class(metadata)(**metadata["params"])
+    # LightGBM has no public API restoring its scikit-learn wrapper from a booster, so
+    # the fitted state is set as at the end of ``LGBMModel.fit``
+    model._Booster = booster
+    model._n_features = booster.num_feature()
+    model.n_features_in_ = booster.num_feature()
+    model._fitted_with_feature_names = metadata["feature_names"] != [
+        f"Column_{index}" for index in range(booster.num_feature())
+    ]
+    model._objective = metadata["params"].get("objective") or "regression"
+    model._evals_result = {}
+    model._best_iteration = booster.best_iteration
+    model._best_score = {}
+    model.fitted_ = True
+    return model
+
+
+def _describe_lightgbm(model: Any, path: Path) -> Dict[str, Any]:
+    # The feature infos in the header of the model file are the value ranges of the
+    # numerical features, e.g. [0:1], and the categories of the categorical ones
+    with open(path) as model_file:
+        header = next(line for line in model_file if line.startswith("feature_infos="))
+    infos = header.strip().split("=", 1)[1].split(" ")
+    booster = model.booster_
+    best_iteration = booster.best_iteration if booster.best_iteration > 0 else None
+    return {
+        "feature_names": booster.feature_name(),
+        "feature_types": [
+            "numerical" if info.startswith("[") or info == "none" else "categorical"
+            for info in infos
+        ],
+        "best_iteration": best_iteration,
+        "n_trees": best_iteration or booster.current_iteration(),
+    }
+
+
+def _save_catboost(model: Any, path: Path) -> None:
+    model.save_model(str(path), format="cbm")
+
+
+def _load_catboost(path: Path, metadata: Dict[str, Any]) -> Any:
+    # Loading from a file sets the parameters to the training parameters of the model
+    # file, e.g. its early stopping, while loading from a stream keeps those the model
+    # is created with
+    model = _model_class(metadata)(**metadata["params"])
+    with open(path, "rb") as model_file:
+        return model.load_model(stream=model_file)
+
+
+def _describe_catboost(model: Any, path: Path) -> Dict[str, Any]:
+    categorical = set(model.get_cat_feature_indices())
+    return {
+        "feature_names": model.feature_names_,
+        "feature_types": [
+            "categorical" if index in categorical else "numerical"
+            for index in range(len(model.feature_names_))
+        ],
+        "best_iteration": model.get_best_iteration(),
+        "n_trees": model.tree_count_,
+    }
+
+
+def _save_sklearn(model: Any, path: Path) -> None:
+    # Pickle is the persistence format of scikit-learn, which has no native one
+    with open(path, "wb") as model_file:
+        pickle.dump(model, model_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_sklearn(path: Path, metadata: Dict[str, Any]) -> Any:
+    with open(path, "rb") as model_file:
+        return pickle.load(model_file)
+
+
+def _describe_sklearn(model: Any, path: Path) -> Dict[str, Any]:
+    feature_names = getattr(model, "feature_names_in_", None)
+    return {
+        "feature_names": None if feature_names is None else list(feature_names),
+        # The scikit-learn trees split on float32 copies of the features
+        "feature_types": ["float32"] * model.n_features_in_,
+        "best_iteration": None,
+        "n_trees": len(getattr(model, "estimators_", [])) or None,
+    }
+
+
+# Saver, loader and metadata of the model of every library
+_FORMATS = {
+    "xgboost": (_save_xgboost, _load_xgboost, _describe_xgboost),
+    "lightgbm": (_save_lightgbm, _load_lightgbm, _describe_lightgbm),
+    "catboost": (_save_catboost, _load_catboost, _describe_catboost),
+    "sklearn": (_save_sklearn, _load_sklearn, _describe_sklearn),
+}
+
+
+class ModelArtifactDataset(AbstractDataset[Any, Any]):
+    """Dataset saving a trained model in the native format of its library.
+
+    The formats are the binary UBJSON model of XGBoost, the text model of LightGBM,
+    limited to its best iteration, the binary ``cbm`` model of CatBoost, and a pickle
+    for scikit-learn. Unlike a pickle of the scikit-learn wrappers, the native models
+    can be loaded by other versions of their library. A sidecar,
+    ``<filepath stem>.meta.json``, records the class, parameters and library version of
+    the model, its feature names and types, its best iteration and its number of trees.
+    The scikit-learn wrappers of the boosting models are rebuilt from the native model
+    and the parameters of the sidecar.
+
+    With ``lazy``, loading returns a loader, which deserializes the model on its first
+    call only, so a node can take a model it only uses in some runs.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        xgboost_model:
+          type: energy_forcasting_model.datasets.ModelArtifactDataset
+          filepath: data/05_model_output/xgboost/xgboost_model.ubj
+          library: xgboost
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        library: str,
+        lazy: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``ModelArtifactDataset``.
+
+        Args:
+            filepath: Local path of the model file.
+            library: `xgboost`, `lightgbm`, `catboost` or `sklearn`.
+            lazy: Whether to load a loader of the model rather than the model.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        if library not in _FORMATS:
+            raise DatasetError(f"Unsupported model library '{library}'.")
+        self._filepath = Path(filepath)
+        self._library = library
+        self._lazy = lazy
+        self._sidecar = self._filepath.with_suffix(".meta.json")
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "library": self._library,
+            "lazy": self._lazy,
+        }
+
+    def _load(self) -> Union[Any, Callable[[], Any]]:
+        if self._lazy:
+            return functools.cache(self._load_model)
+        return self._load_model()
+
+    def _load_model(self) -> Any:
+        start = time.perf_counter()
+        with open(self._sidecar) as sidecar:
+            metadata = json.load(sidecar)
+        _, load, _ = _FORMATS[self._library]
+        model = load(self._filepath, metadata)
+        logger.info(
+            f"Loaded the {self._library} model {self._filepath} in "
+            f"{time.perf_counter() - start:.3f}s."
+        )
+        return model
+
+    def _save(self, data: Any) -> None:
+        params = data.get_params()
+        # The parameters are set back from the sidecar when the model is loaded, so
+        # they are checked before anything is written
+        try:
+            json.dumps(params)
+        except TypeError as exc:
+            raise DatasetError(
+                f"The parameters of the {self._library} model are not JSON "
+                f"serializable: {exc}."
+            ) from exc
+        save, _, describe = _FORMATS[self._library]
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        save(data, self._filepath)
+        model_class = type(data)
+        metadata = {
+            "library": self._library,
+            "library_version": sys.modules[
+                model_class.__module__.split(".")[0]
+            ].__version__,
+            "model_class": f"{model_class.__module__}.{model_class.__qualname__}",
+            "params": params,
+            **describe(data, self._filepath),
+            "size_bytes": self._filepath.stat().st_size,
+        }
+        with open(self._sidecar, "w") as sidecar:
+            json.dump(metadata, sidecar, indent=2)
+
+    def _exists(self) -> bool:
+        return self._filepath.exists() and self._sidecar.exists()
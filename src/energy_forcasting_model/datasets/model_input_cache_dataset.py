@@ -0,0 +1,127 @@
+"""``ModelInputCacheDataset`` stores the native training datasets of the model libraries,
+grouped by a fingerprint of the model input they were built from, and loads them lazily.
+"""
+
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from kedro.io import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+
+def _save_xgboost(data: Any, path: Path) -> None:
+    data.save_binary(str(path), silent=True)
+
+
+def _load_xgboost(path: Path) -> Any:
+    import xgboost as xgb
+
+    return xgb.DMatrix(str(path))
+
+
+def _save_catboost(data: Any, path: Path) -> None:
+    data.save(str(path))
+
+
+def _load_catboost(path: Path) -> Any:
+    from catboost import Pool
+
+    return Pool(f"quantized://{path}")
+
+
+# File extension, saver and loader of the native dataset of every library
+_FORMATS = {
+    "xgboost": ("buffer", _save_xgboost, _load_xgboost),
+    "catboost": ("qpool", _save_catboost, _load_catboost),
+}
+
+
+class ModelInputCacheDataset(
+    AbstractDataset[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Callable]]]
+):
+    """Cache of native training datasets, laid out as
+    ``<filepath>/<fingerprint>/<library>.<extension>``.
+
+    The datasets are an XGBoost ``DMatrix`` binary buffer and a quantized CatBoost
+    ``Pool``. Loading returns ``{fingerprint: {library: loader}}``, where each loader
+    reads its dataset only when called. Saving takes the same mapping with the native
+    datasets instead of loaders, and ``None`` for the datasets already cached. It only
+    writes the new datasets, and deletes the fingerprints and datasets missing from
+    the mapping, so the cache only holds the datasets of the last model input. The
+    libraries are imported when a dataset of theirs is loaded or saved.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        model_input_cache:
+          type: energy_forcasting_model.datasets.ModelInputCacheDataset
+          filepath: data/03_training_data/model_input_cache
+    """
+
+    def __init__(
+        self, *, filepath: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Creates a new instance of ``ModelInputCacheDataset``.
+
+        Args:
+            filepath: Local directory holding the cache.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self._filepath)}
+
+    def _load(self) -> Dict[str, Dict[str, Callable]]:
+        cache = {}
+        if not self._filepath.exists():
+            return cache
+        for fingerprint_dir in sorted(p for p in self._filepath.iterdir() if p.is_dir()):
+            cache[fingerprint_dir.name] = {
+                library: (lambda path=path, load=load: load(path))
+                for library, (extension, _, load) in _FORMATS.items()
+                for path in [fingerprint_dir / f"{library}.{extension}"]
+                if path.exists()
+            }
+        return cache
+
+    def _save(self, data: Dict[str, Dict[str, Optional[Any]]]) -> None:
+        for fingerprint, datasets in data.items():
+            if not re.fullmatch(r"[\w.\-]+", fingerprint):
+                raise DatasetError(f"'{fingerprint}' cannot be used as a fingerprint.")
+            unsupported = set(datasets) - set(_FORMATS)
+            if unsupported:
+                raise DatasetError(
+                    f"Unsupported model libraries {sorted(unsupported)}."
+                )
+        n_saved, n_pruned = 0, 0
+        if self._filepath.exists():
+            for fingerprint_dir in self._filepath.iterdir():
+                if fingerprint_dir.is_dir() and fingerprint_dir.name not in data:
+                    n_pruned += sum(1 for path in fingerprint_dir.iterdir())
+                    shutil.rmtree(fingerprint_dir)
+        for fingerprint, datasets in data.items():
+            fingerprint_dir = self._filepath / fingerprint
+            fingerprint_dir.mkdir(parents=True, exist_ok=True)
+            for path in fingerprint_dir.iterdir():
+                if path.stem not in datasets:
+                    path.unlink()
+                    n_pruned += 1
+            for library, native_dataset in datasets.items():
+                if native_dataset is not None:
+                    extension, save, _ = _FORMATS[library]
+                    save(native_dataset, fingerprint_dir / f"{library}.{extension}")
+                    n_saved += 1
+        logger.info(
+            f"Saved {n_saved} new native datasets to the model input cache, pruned "
+            f"{n_pruned}."
+        )
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
@@ -0,0 +1,438 @@
+"""``MonthPartitionedParquetDataset`` caches a raw, semicolon separated CSV (such as the
+zipped household power consumption archive) as typed Parquet files partitioned by month,
+and loads them back in batches, with column and date-range pushdown.
+"""
+
+import bz2
+import gzip
+import hashlib
+import json
+import logging
+import lzma
+import shutil
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from kedro.io import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+_COMPRESSION_SUFFIXES = {".zip": "zip", ".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+_COMPRESSION_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+# The source rows to append are spooled to disk beyond this size
+_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+class MonthPartitionedParquetDataset(AbstractDataset[None, Iterator[pd.DataFrame]]):
+    """Read-only dataset backed by a CSV source and a month-partitioned Parquet cache.
+
+    On the first load the source CSV is streamed in chunks, its date and time columns are
+    parsed once, and every chunk is written to ``<filepath>/month=YYYY-MM/``. Later loads
+    only read the requested ``columns`` from the partitions that overlap
+    ``[start_date, end_date]``.
+
+    The source is expected to grow by appending newer rows, in date order. When it
+    changes, only its rows from the month of the last cached day onwards are parsed and
+    written: that last, possibly partial, month partition is rewritten and newer months
+    are added, while the older partitions are kept as they are. The manifest records a
+    SHA-256 of the source rows of those older months, which are read again, without
+    being parsed, to check it. The cache is rebuilt from scratch when it has no
+    manifest, the source moved or shrank, or the rows of the older months changed,
+    e.g. when the source is re-exported with corrected historical rows.
+
+    Loading returns an iterator of DataFrames of at most ``chunksize`` rows (see
+    ``source_load_args``), converted one batch at a time, so consumers folding the
+    batches hold a single batch in memory.
+
+    When ``watermark_filepath`` points to an existing JSON file holding
+    ``{"watermark": "YYYY-MM-DD"}``, loading starts at that day instead, so incremental
+    runs only read the rows recorded since the last processed day.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        household_power_consumption:
+          type: energy_forcasting_model.datasets.MonthPartitionedParquetDataset
+          filepath: data/01_raw/household_power_consumption_parquet
+          source_filepath: data/01_raw/household_power_consumption.zip
+          source_load_args:
+            sep: ";"
+            compression: zip
+            na_values: ["?"]
+          columns: [Date, Global_active_power]
+          start_date: ${globals:date_interval.start_date}
+          end_date: ${globals:date_interval.end_date}
+    """
+
+    DEFAULT_SOURCE_LOAD_ARGS: Dict[str, Any] = {"chunksize": 200000}
+    MANIFEST_FILE = "_source.json"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        filepath: str,
+        source_filepath: str,
+        source_load_args: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        date_column: str = "Date",
+        date_format: str = "%d/%m/%Y",
+        time_column: Optional[str] = "Time",
+        watermark_filepath: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``MonthPartitionedParquetDataset``.
+
+        Args:
+            filepath: Local directory holding the Parquet partitions.
+            source_filepath: Local path to the raw CSV the cache is built from.
+            source_load_args: Arguments passed to ``pd.read_csv`` when building the cache.
+                ``chunksize`` controls how many rows are held in memory at once, when
+                building the cache and when loading it.
+            columns: Columns to read on load. All columns are read when omitted.
+            start_date: First day (inclusive) to load. No lower bound when omitted.
+            end_date: Last day (inclusive) to load. No upper bound when omitted.
+            date_column: Name of the column holding the day of each row.
+            date_format: ``strftime`` format of ``date_column`` in the source CSV.
+            time_column: Name of the column holding the time of day, stored as a
+                timedelta. Set to ``None`` if the source has no such column.
+            watermark_filepath: Local path to a JSON watermark. When it exists, loading
+                starts at the watermark day (inclusive) if it is after ``start_date``.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._source_filepath = Path(source_filepath)
+        self._source_load_args = deepcopy(self.DEFAULT_SOURCE_LOAD_ARGS)
+        if source_load_args is not None:
+            self._source_load_args.update(source_load_args)
+        self._columns = columns
+        self._start_date = pd.Timestamp(start_date) if start_date else None
+        self._end_date = pd.Timestamp(end_date) if end_date else None
+        self._date_column = date_column
+        self._date_format = date_format
+        self._time_column = time_column
+        self._watermark_filepath = (
+            Path(watermark_filepath) if watermark_filepath else None
+        )
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "source_filepath": str(self._source_filepath),
+            "columns": self._columns,
+            "start_date": self._start_date,
+            "end_date": self._end_date,
+            "watermark_filepath": str(self._watermark_filepath),
+        }
+
+    def _source_signature(self) -> Dict[str, Any]:
+        stat = self._source_filepath.stat()
+        return {
+            "source_filepath": str(self._source_filepath),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        manifest_path = self._filepath / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path) as manifest:
+            return json.load(manifest)
+
+    def _get_start_date(self) -> Optional[pd.Timestamp]:
+        start_date = self._start_date
+        if self._watermark_filepath is not None and self._watermark_filepath.exists():
+            with open(self._watermark_filepath) as watermark_file:
+                watermark = pd.Timestamp(json.load(watermark_file)["watermark"])
+            if start_date is None or watermark > start_date:
+                start_date = watermark
+        return start_date
+
+    @contextmanager
+    def _open_source(self) -> Iterator[BinaryIO]:
+        """Opens the decompressed source CSV as a binary stream."""
+        compression = self._source_load_args.get("compression", "infer")
+        if isinstance(compression, dict):
+            compression = compression.get("method", "infer")
+        if compression == "infer":
+            compression = _COMPRESSION_SUFFIXES.get(self._source_filepath.suffix)
+        if compression is None:
+            with open(self._source_filepath, "rb") as source:
+                yield source
+        elif compression == "zip":
+            with zipfile.ZipFile(self._source_filepath) as archive:
+                members = archive.namelist()
+                if len(members) != 1:
+                    raise DatasetError(
+                        f"Expected one file in '{self._source_filepath}', found "
+                        f"{len(members)}."
+                    )
+                with archive.open(members[0]) as source:
+                    yield source
+        elif compression in _COMPRESSION_OPENERS:
+            with _COMPRESSION_OPENERS[compression](self._source_filepath) as source:
+                yield source
+        else:
+            raise DatasetError(f"Unsupported source compression '{compression}'.")
+
+    def _read_header(self, source: BinaryIO) -> bytes:
+        if self._source_load_args.get("header", "infer") is None:
+            return b""
+        return source.readline()
+
+    @staticmethod
+    def _hash_rows(source: BinaryIO, n_rows: int, digest) -> int:
+        """Feeds the next ``n_rows`` rows of the source to ``digest``, and returns how
+        many there were. Blank lines, which pandas skips, are hashed but not counted."""
+        rows = 0
+        while rows < n_rows:
+            line = source.readline()
+            if not line:
+                break
+            digest.update(line)
+            rows += bool(line.strip())
+        return rows
+
+    def _update_cache(self) -> None:
+        """Brings the cache up to date with the source, appending to it if possible."""
+        manifest = self._read_manifest()
+        signature = self._source_signature()
+        if (
+            manifest is None
+            or manifest.get("prefix_sha256") is None
+            or manifest["source_filepath"] != signature["source_filepath"]
+            or manifest["size"] > signature["size"]
+        ):
+            self._build_cache(signature)
+        elif {key: manifest[key] for key in signature} != signature:
+            if not self._append_to_cache(signature, manifest):
+                self._build_cache(signature)
+
+    def _append_to_cache(
+        self, signature: Dict[str, Any], manifest: Dict[str, Any]
+    ) -> bool:
+        """Converts the source rows from the month of the last cached day onwards, and
+        replaces the partitions of those months.
+
+        The rows of the older months are only read to check that their hash is the one
+        of the manifest, not parsed. Returns False, leaving the cache to be rebuilt,
+        when they changed, e.g. if historical rows were corrected.
+        """
+        since = pd.Timestamp(manifest["last_date"]).to_period("M").start_time
+        with self._open_source() as source, tempfile.SpooledTemporaryFile(
+            max_size=_SPOOL_MAX_BYTES
+        ) as remainder:
+            header = self._read_header(source)
+            prefix = hashlib.sha256(header)
+            rows = self._hash_rows(source, manifest["prefix_rows"], prefix)
+            if (rows, prefix.hexdigest()) != (
+                manifest["prefix_rows"],
+                manifest["prefix_sha256"],
+            ):
+                logger.info(
+                    f"The rows of {self._source_filepath} before {since:%Y-%m-%d} "
+                    f"changed since they were cached."
+                )
+                return False
+            remainder.write(header)
+            shutil.copyfileobj(source, remainder)
+
+            logger.info(
+                f"Appending the rows of {self._source_filepath} since "
+                f"{since:%Y-%m-%d} to the Parquet cache in {self._filepath}..."
+            )
+            # Also drops the newer partitions of an interrupted append
+            for partition in self._filepath.glob("month=*"):
+                if partition.name >= f"month={since:%Y-%m}":
+                    shutil.rmtree(partition)
+            remainder.seek(0)
+            load_args = {
+                key: value
+                for key, value in self._source_load_args.items()
+                if key != "compression"
+            }
+            written = self._write_chunks(pd.read_csv(remainder, **load_args), since)
+            if written["older_rows"] or written["last_date"] is None:
+                logger.info(
+                    f"{written['older_rows']} rows of {self._source_filepath} after "
+                    f"the cached ones are before {since:%Y-%m-%d}."
+                )
+                return False
+
+            # The new prefix ends at the month of the new last day
+            remainder.seek(0)
+            self._read_header(remainder)
+            self._hash_rows(remainder, written["prefix_rows"], prefix)
+        self._write_manifest(
+            signature,
+            written["last_date"],
+            manifest["prefix_rows"] + written["prefix_rows"],
+            prefix.hexdigest(),
+            written["n_rows"],
+        )
+        return True
+
+    def _build_cache(self, signature: Dict[str, Any]) -> None:
+        """Converts the source CSV into typed, month-partitioned Parquet files."""
+        logger.info(
+            f"Building Parquet cache of {self._source_filepath} in {self._filepath}..."
+        )
+        shutil.rmtree(self._filepath, ignore_errors=True)
+        self._filepath.mkdir(parents=True)
+        chunks = pd.read_csv(self._source_filepath, **self._source_load_args)
+        written = self._write_chunks(chunks)
+
+        with self._open_source() as source:
+            prefix = hashlib.sha256(self._read_header(source))
+            self._hash_rows(source, written["prefix_rows"], prefix)
+        self._write_manifest(
+            signature,
+            written["last_date"],
+            written["prefix_rows"],
+            prefix.hexdigest(),
+            written["n_rows"],
+        )
+
+    def _write_chunks(
+        self, chunks: Any, since: Optional[pd.Timestamp] = None
+    ) -> Dict[str, Any]:
+        """Writes the rows of the CSV chunks from ``since`` onwards to their month
+        partitions.
+
+        Returns the number of rows written and skipped as older than ``since``, the last
+        day, and ``prefix_rows``, the number of rows before the first one of the month
+        of that day, which are the rows an append does not parse again.
+        """
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+
+        n_rows = older_rows = 0
+        last_date = None
+        first_rows = {}
+        for chunk_number, chunk in enumerate(chunks):
+            chunk[self._date_column] = pd.to_datetime(
+                chunk[self._date_column], format=self._date_format
+            )
+            if since is not None:
+                newer = chunk[self._date_column] >= since
+                older_rows += int((~newer).sum())
+                chunk = chunk.loc[newer].copy()
+            if chunk.empty:
+                continue
+            if self._time_column is not None:
+                chunk[self._time_column] = pd.to_timedelta(chunk[self._time_column])
+
+            # Parts are numbered by source chunk, so a rewritten part keeps its name
+            months = chunk[self._date_column].dt.strftime("%Y-%m")
+            for month, month_chunk in chunk.groupby(months, sort=False):
+                partition = self._filepath / f"month={month}"
+                partition.mkdir(exist_ok=True)
+                pq.write_table(
+                    pa.Table.from_pandas(month_chunk, preserve_index=False),
+                    partition / f"part-{chunk_number:05d}.parquet",
+                )
+                # The index of the chunks counts the rows of the source, blank lines
+                # excluded
+                first_rows.setdefault(month, int(month_chunk.index[0]))
+            n_rows += len(chunk)
+            chunk_last_date = chunk[self._date_column].max().strftime("%Y-%m-%d")
+            if last_date is None or chunk_last_date > last_date:
+                last_date = chunk_last_date
+
+        return {
+            "n_rows": n_rows,
+            "older_rows": older_rows,
+            "last_date": last_date,
+            "prefix_rows": first_rows[last_date[:7]] if last_date else 0,
+        }
+
+    def _write_manifest(
+        self,
+        signature: Dict[str, Any],
+        last_date: Optional[str],
+        prefix_rows: int,
+        prefix_sha256: str,
+        n_rows: int,
+    ) -> None:
+        # The manifest is written last so an interrupted build is never reused
+        with open(self._filepath / self.MANIFEST_FILE, "w") as manifest:
+            json.dump(
+                {
+                    **signature,
+                    "last_date": last_date,
+                    "prefix_rows": prefix_rows,
+                    "prefix_sha256": prefix_sha256,
+                },
+                manifest,
+            )
+        logger.info(
+            f"Cached {n_rows} rows as month-partitioned Parquet files, up to "
+            f"{last_date}."
+        )
+
+    def _load(self) -> Iterator[pd.DataFrame]:
+        if not self._source_filepath.exists() and not self._filepath.exists():
+            raise DatasetError(
+                f"Neither the Parquet cache '{self._filepath}' nor its source "
+                f"'{self._source_filepath}' exist."
+            )
+        if self._source_filepath.exists():
+            self._update_cache()
+
+        # Prune whole partitions by month, then filter rows by day inside them
+        date = ds.field(self._date_column)
+        month = ds.field("month")
+        row_filter = None
+        start_date = self._get_start_date()
+        if start_date is not None:
+            row_filter = (month >= start_date.strftime("%Y-%m")) & (date >= start_date)
+        if self._end_date is not None:
+            end_filter = (month <= self._end_date.strftime("%Y-%m")) & (
+                date <= self._end_date
+            )
+            row_filter = end_filter if row_filter is None else row_filter & end_filter
+
+        dataset = ds.dataset(
+            self._filepath,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([("month", pa.string())]), flavor="hive"
+            ),
+        )
+        return self._iter_batches(dataset, row_filter)
+
+    def _iter_batches(
+        self, dataset: ds.Dataset, row_filter: Optional[ds.Expression]
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the selected rows batch by batch, or one empty DataFrame if none is."""
+        batches = dataset.to_batches(
+            columns=self._columns,
+            filter=row_filter,
+            batch_size=self._source_load_args["chunksize"],
+        )
+        empty = True
+        for batch in batches:
+            if batch.num_rows:
+                empty = False
+                yield batch.to_pandas()
+        if empty:
+            yield dataset.to_table(columns=self._columns, filter=row_filter).to_pandas()
+
+    def _save(self, data: None) -> None:
+        raise DatasetError(f"{self.__class__.__name__} is a read-only dataset.")
+
+    def _exists(self) -> bool:
+        return self._filepath.exists() or self._source_filepath.exists()
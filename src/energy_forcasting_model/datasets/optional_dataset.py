@@ -0,0 +1,64 @@
+"""``OptionalDataset`` wraps another dataset and loads a default value while the wrapped
+dataset does not exist yet, so a node can take an input that a later pipeline produces.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from kedro.io import AbstractDataset
+
+logger = logging.getLogger(__name__)
+
+
+class OptionalDataset(AbstractDataset[Any, Any]):
+    """Dataset loading a default value when the underlying dataset does not exist.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        selected_features:
+          type: energy_forcasting_model.datasets.OptionalDataset
+          dataset:
+            type: json.JSONDataset
+            filepath: data/04_reporting/pruned_features.json
+          default: null
+    """
+
+    def __init__(
+        self,
+        *,
+        dataset: Dict[str, Any],
+        default: Any = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``OptionalDataset``.
+
+        Args:
+            dataset: Configuration of the underlying dataset, as in ``catalog.yml``.
+            default: The value loaded while the underlying dataset does not exist.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._dataset_config = dataset
+        self._dataset = AbstractDataset.from_config("_optional_dataset", dataset)
+        self._default = default
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset_config, "default": self._default}
+
+    def _load(self) -> Any:
+        if not self._dataset.exists():
+            name = self._dataset_config.get("filepath", self._dataset_config["type"])
+            logger.info(f"{name} does not exist, loading the default value instead.")
+            return self._default
+        return self._dataset.load()
+
+    def _save(self, data: Any) -> None:
+        self._dataset.save(data)
+
+    def _exists(self) -> bool:
+        return True
+
+    def _release(self) -> None:
+        self._dataset.release()
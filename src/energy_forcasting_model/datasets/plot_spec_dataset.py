@@ -0,0 +1,59 @@
+"""``PlotSpecDataset`` saves report plots described as ``PlotSpec``, which are drawn and
+written by the background report renderer rather than by the node saving them.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from kedro.io import AbstractDataset, DatasetError
+
+from ..reporting import renderer
+
+
+class PlotSpecDataset(AbstractDataset[Any, None]):
+    """Dataset writing a plot spec, or a matplotlib figure, to an image file.
+
+    Saving hands the plot to the report renderer configured by ``ReportingHooks``, which
+    draws it in a worker process once the node returned, or skips it when the reports
+    are disabled. The plots are only guaranteed to be written at the end of the run.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        xgboost_feature_importance_plot:
+          type: energy_forcasting_model.datasets.PlotSpecDataset
+          filepath: data/04_reporting/xgboost/xgboost_feature_importance_plot.png
+          save_args:
+            format: png
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        save_args: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``PlotSpecDataset``.
+
+        Args:
+            filepath: Local path of the image file.
+            save_args: Options passed to ``Figure.savefig``.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._save_args = save_args or {}
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self._filepath), "save_args": self._save_args}
+
+    def _load(self) -> None:
+        raise DatasetError(f"Loading not supported for '{self.__class__.__name__}'")
+
+    def _save(self, data: Any) -> None:
+        renderer.submit(data, str(self._filepath), self._save_args)
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
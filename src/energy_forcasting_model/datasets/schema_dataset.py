@@ -0,0 +1,111 @@
+"""``SchemaDataset`` wraps another dataset and enforces a declared dtype schema on the
+DataFrames it loads and saves, so compact dtypes are kept without editing the nodes.
+"""
+
+import logging
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from kedro.io import AbstractDataset
+
+logger = logging.getLogger(__name__)
+
+
+def apply_schema(data: pd.DataFrame, schema: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Casts the columns of a DataFrame to the dtypes declared in a schema.
+
+    The schema is a list of rules, each with a list of ``columns`` (``fnmatch`` patterns)
+    and the ``dtype`` they are cast to. The first rule matching a column wins, and columns
+    matching no rule are left unchanged. Boolean columns holding missing values are cast
+    to the nullable ``boolean`` dtype instead of silently turning them into True.
+
+    Args:
+        data: The DataFrame to cast.
+        schema: The ordered schema rules.
+
+    Returns:
+        The DataFrame with its columns cast.
+    """
+    dtypes = {}
+    for column in data.columns:
+        for rule in schema:
+            if any(fnmatch(str(column), pattern) for pattern in rule["columns"]):
+                dtypes[column] = rule["dtype"]
+                break
+
+    for column, dtype in dtypes.items():
+        if dtype in ("bool", "uint8") and data[column].dtype == object:
+            if data[column].isna().any():
+                dtypes[column] = "boolean"
+            else:
+                data[column] = data[column].astype(bool)
+    return data.astype(dtypes)
+
+
+class SchemaDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """Dataset enforcing a dtype schema on top of another dataset.
+
+    The schema is applied after every load and before every save, and the memory used by
+    the data before and after casting is logged.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        processed_data:
+          type: energy_forcasting_model.datasets.SchemaDataset
+          dataset:
+            type: pandas.CSVDataset
+            filepath: data/02_processed/processed_data.csv
+          schema:
+            - columns: [is_holiday, conditions_*]
+              dtype: bool
+            - columns: ["*"]
+              dtype: float32
+    """
+
+    def __init__(
+        self,
+        *,
+        dataset: Dict[str, Any],
+        schema: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``SchemaDataset``.
+
+        Args:
+            dataset: Configuration of the underlying dataset, as in ``catalog.yml``.
+            schema: Ordered rules mapping column patterns to dtypes (see ``apply_schema``).
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._dataset_config = dataset
+        self._dataset = AbstractDataset.from_config("_schema_dataset", dataset)
+        self._schema = schema
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset_config, "schema": self._schema}
+
+    def _apply_schema(self, data: pd.DataFrame, action: str) -> pd.DataFrame:
+        bytes_before = data.memory_usage(deep=True).sum()
+        data = apply_schema(data, self._schema)
+        bytes_after = data.memory_usage(deep=True).sum()
+        name = self._dataset_config.get("filepath", self._dataset_config["type"])
+        logger.info(
+            f"Schema applied on {action} of {name}: "
+            f"{bytes_before / 1e6:.2f} MB -> {bytes_after / 1e6:.2f} MB."
+        )
+        return data
+
+    def _load(self) -> pd.DataFrame:
+        return self._apply_schema(self._dataset.load(), "load")
+
+    def _save(self, data: pd.DataFrame) -> None:
+        self._dataset.save(self._apply_schema(data.copy(), "save"))
+
+    def _exists(self) -> bool:
+        return self._dataset.exists()
+
+    def _release(self) -> None:
+        self._dataset.release()
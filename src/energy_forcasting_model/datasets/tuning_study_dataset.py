@@ -0,0 +1,145 @@
+"""``TuningStudyDataset`` gives access to a SQLite study of hyperparameter tuning
+trials, which records every trial as soon as it is done, so an interrupted search can
+resume.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    study TEXT NOT NULL,
+    model TEXT NOT NULL,
+    bracket INTEGER NOT NULL,
+    config INTEGER NOT NULL,
+    rung INTEGER NOT NULL,
+    budget REAL NOT NULL,
+    params TEXT NOT NULL,
+    rmse REAL NOT NULL,
+    fit_seconds REAL NOT NULL,
+    finished_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (study, model, bracket, config, rung)
+)
+"""
+
+
+class TuningStudy:
+    """The trials of the tuning studies stored in a SQLite file.
+
+    A trial is identified by its study, model, bracket, configuration and rung. Every
+    call opens its own connection, so the study can be shared with other processes.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.filepath, timeout=30)
+
+    def trial(
+        self, study: str, model: str, bracket: int, config: int, rung: int
+    ) -> Optional[Dict[str, Any]]:
+        """The recorded trial, or None if it has not run yet."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT budget, params, rmse, fit_seconds FROM trials WHERE study = ? "
+                "AND model = ? AND bracket = ? AND config = ? AND rung = ?",
+                (study, model, bracket, config, rung),
+            ).fetchone()
+        if row is None:
+            return None
+        budget, params, rmse, fit_seconds = row
+        return {
+            "budget": budget,
+            "params": json.loads(params),
+            "rmse": rmse,
+            "fit_seconds": fit_seconds,
+        }
+
+    def record(
+        self,
+        study: str,
+        model: str,
+        bracket: int,
+        config: int,
+        rung: int,
+        budget: float,
+        params: Dict[str, Any],
+        rmse: float,
+        fit_seconds: float,
+    ) -> None:
+        """Records a finished trial, replacing a previous run of the same trial."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO trials (study, model, bracket, config, rung, "
+                "budget, params, rmse, fit_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    study,
+                    model,
+                    bracket,
+                    config,
+                    rung,
+                    budget,
+                    json.dumps(params, sort_keys=True),
+                    rmse,
+                    fit_seconds,
+                ),
+            )
+
+    def trials(self, studies: Optional[list] = None) -> pd.DataFrame:
+        """All the recorded trials, or those of the given studies."""
+        query = "SELECT * FROM trials"
+        if studies is not None:
+            query += f" WHERE study IN ({', '.join('?' * len(studies))})"
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(query, connection, params=studies)
+
+
+class TuningStudyDataset(AbstractDataset[None, TuningStudy]):
+    """Dataset loading a ``TuningStudy`` backed by a SQLite file, created if missing.
+
+    Nodes record their trials through the loaded study while they run, rather than
+    returning them, so the trials done before an interruption are kept. The dataset
+    cannot be saved.
+
+    Example usage in ``catalog.yml``:
+
+    .. code-block:: yaml
+
+        tuning_study:
+          type: energy_forcasting_model.datasets.TuningStudyDataset
+          filepath: data/04_reporting/hyperparameter_tuning/tuning_study.db
+    """
+
+    def __init__(
+        self, *, filepath: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Creates a new instance of ``TuningStudyDataset``.
+
+        Args:
+            filepath: Local path of the SQLite file.
+            metadata: Any arbitrary metadata. This is ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self._filepath)}
+
+    def _load(self) -> TuningStudy:
+        return TuningStudy(str(self._filepath))
+
+    def _save(self, data: None) -> None:
+        raise DatasetError(f"Saving not supported for '{self.__class__.__name__}'")
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
@@ -0,0 +1,78 @@
+"""Project hooks."""
+
+from typing import Any, Dict, Optional
+
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+from .reporting import renderer
+from .training import MODELS, TRAINING_TAG, scheduler
+
+
+class ReportingHooks:
+    """Renders the report plots in background worker processes during a run, following
+    the ``reporting`` parameters, and waits for them at the end of the run."""
+
+    @hook_impl
+    def after_catalog_created(self, feed_dict: Dict[str, Any]) -> None:
+        params = feed_dict.get("params:reporting") or {}
+        renderer.configure(
+            enabled=params.get("enabled", True),
+            n_workers=params.get("n_workers", 0),
+        )
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        renderer.wait()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        renderer.cancel()
+
+
+def _trained_model(node: Node) -> Optional[str]:
+    if TRAINING_TAG not in node.tags:
+        return None
+    return next((model for model in MODELS if model in node.tags), None)
+
+
+class TrainingHooks:
+    """Splits the ``training`` core budget between the models trained at the same time
+    during a run, and reports the wall and estimated CPU time of every training."""
+
+    @hook_impl
+    def after_catalog_created(self, feed_dict: Dict[str, Any]) -> None:
+        params = feed_dict.get("params:training") or {}
+        scheduler.configure(
+            core_budget=params.get("core_budget"),
+            shares=params.get("core_shares"),
+        )
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any], pipeline: Pipeline):
+        models = [_trained_model(node) for node in pipeline.nodes]
+        scheduler.plan(
+            [model for model in models if model is not None],
+            concurrent="SequentialRunner" not in str(run_params.get("runner")),
+        )
+
+    @hook_impl
+    def before_node_run(self, node: Node) -> None:
+        model = _trained_model(node)
+        if model is not None:
+            scheduler.start(model)
+
+    @hook_impl
+    def after_node_run(self, node: Node) -> None:
+        model = _trained_model(node)
+        if model is not None:
+            scheduler.stop(model)
+
+    @hook_impl
+    def on_node_error(self, node: Node) -> None:
+        self.after_node_run(node)
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        scheduler.report()
@@ -3,6 +3,8 @@ from typing import Dict
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+from .pipelines import data_processing_pipeline, feature_engineering_pipeline
+
 
 def register_pipelines() -> Dict[str, Pipeline]:
     """Register the project's pipelines.
@@ -11,5 +13,26 @@ def register_pipelines() -> Dict[str, Pipeline]:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
-    pipelines["__default__"] = sum(pipelines.values())
+    # The pruning, the backtesting and the tuning refit the models trained by the
+    # default pipeline many times, and the pruning changes the features it creates, so
+    # they are run on their own rather than as part of it
+    pipelines["__default__"] = sum(
+        pipeline
+        for name, pipeline in pipelines.items()
+        if name
+        not in (
+            "feature_pruning_pipeline",
+            "backtesting_pipeline",
+            "hyperparameter_tuning_pipeline",
+        )
+    )
+    pipelines["data_processing_aggregation_pipeline"] = (
+        data_processing_pipeline.create_aggregation_pipeline()
+    )
+    pipelines["data_processing_incremental_pipeline"] = (
+        data_processing_pipeline.create_incremental_pipeline()
+    )
+    pipelines["feature_engineering_online_pipeline"] = (
+        feature_engineering_pipeline.create_online_pipeline()
+    )
     return pipelines
@@ -0,0 +1,10 @@
+"""
+This is a pipeline 'backtesting_pipeline'
+evaluating the trained models over the walk-forward folds
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
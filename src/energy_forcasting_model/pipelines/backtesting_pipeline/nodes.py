@@ -0,0 +1,148 @@
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from threadpoolctl import threadpool_limits
+
+from ...datasets import MemmapDataset
+from ...training import thread_params
+from ..train_test_split_pipeline.nodes import fold_data
+
+# Shared matrix and thread budget of the current worker process
+_worker = {}
+
+
+def _init_worker(directory: str, threads: int) -> None:
+    """Memory-maps the published matrix and limits the threads of the worker."""
+    threadpool_limits(threads)
+    _worker["features"] = MemmapDataset(filepath=f"{directory}/features").load()
+    _worker["target"] = MemmapDataset(filepath=f"{directory}/target").load()
+    _worker["threads"] = threads
+
+
+def _run_job(name: str, model, fold: dict):
+    """Refits a model on the training window of a fold and scores it on its test
+    window, in a worker holding the shared matrix."""
+    X_train, y_train, X_test, y_test = fold_data(
+        _worker["features"], _worker["target"], fold
+    )
+    X_train_clean = X_train.dropna()
+    y_train_clean = y_train.loc[X_train_clean.index]
+
+    fold_model = clone(model)
+    fold_model.set_params(
+        **{param: _worker["threads"] for param in thread_params(fold_model)}
+    )
+
+    start = time.perf_counter()
+    fold_model.fit(X_train_clean, y_train_clean)
+    fit_seconds = time.perf_counter() - start
+    predictions = fold_model.predict(X_test)
+
+    metrics = {
+        "model": name,
+        "fold": fold["fold"],
+        "origin": fold["origin"],
+        "train_rows": len(X_train_clean),
+        "test_rows": len(X_test),
+        "rmse": np.sqrt(mean_squared_error(y_test, predictions)),
+        "mae": mean_absolute_error(y_test, predictions),
+        "fit_seconds": fit_seconds,
+    }
+    predictions = pd.DataFrame(
+        {
+            "model": name,
+            "fold": fold["fold"],
+            "actual": np.asarray(y_test),
+            "prediction": np.asarray(predictions),
+        },
+        index=y_test.index,
+    )
+    return metrics, predictions
+
+
+# Node 1
+def backtest_models(
+    features: pd.DataFrame,
+    target: pd.Series,
+    folds: list,
+    params: dict,
+    **models,
+):
+    """
+    Refits every model with its own parameters on the training window of every
+    walk-forward fold and scores it on the test window of the fold.
+
+    The feature matrix and target are published once as memory-mapped files, which
+    every worker process maps without copying, and the (model, fold) jobs are fanned out
+    to a process pool, the largest training windows first. Each worker, and the models
+    it trains, use at most `threads_per_worker` threads, so the workers do not compete
+    for the cores.
+
+    Args:
+        features (pd.DataFrame): The feature matrix shared by the folds.
+        target (pd.Series): The target of every row of the matrix.
+        folds (list): The folds from `walk_forward_folds`.
+        params (dict): The executor parameters (`n_workers`, `threads_per_worker`,
+            `shared_dir`).
+        **models: The trained models, by name, whose parameters are reused.
+
+    Returns:
+        tuple: One row per model and fold with the fold origin, the number of training
+            and test rows, the test RMSE and MAE and the fit time, and the test
+            predictions of every model on every fold.
+    """
+    logger = logging.getLogger(__name__)
+
+    threads = params.get("threads_per_worker") or 1
+    n_workers = params.get("n_workers") or max(1, (os.cpu_count() or 1) // threads)
+    jobs = sorted(
+        ((name, model, fold) for fold in folds for name, model in models.items()),
+        key=lambda job: job[2]["train"][0] - job[2]["train"][1],
+    )
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=params.get("shared_dir")) as directory:
+        MemmapDataset(filepath=f"{directory}/features").save(features)
+        MemmapDataset(filepath=f"{directory}/target").save(target)
+
+        if n_workers == 1:
+            _init_worker(directory, threads)
+            outputs = [_run_job(*job) for job in jobs]
+            _worker.clear()
+        else:
+            logger.info(f"Running {len(jobs)} backtest jobs on {n_workers} workers...")
+            # Forked workers can deadlock in the OpenMP runtime of the parent
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(directory, threads),
+            ) as executor:
+                futures = [executor.submit(_run_job, *job) for job in jobs]
+                outputs = [future.result() for future in as_completed(futures)]
+
+    results = pd.DataFrame([metrics for metrics, _ in outputs])
+    predictions = pd.concat([frame for _, frame in outputs] or [pd.DataFrame()])
+    if not results.empty:
+        results = results.sort_values(["fold", "model"], ignore_index=True)
+        predictions = predictions.sort_values(["fold", "model"], kind="stable")
+        summary = results.groupby("model")["rmse"].agg(["mean", "std"])
+        for name, row in summary.iterrows():
+            logger.info(
+                f"{name}: RMSE {row['mean']:.2f} ± {row['std']:.2f} over "
+                f"{len(folds)} folds."
+            )
+    logger.info(
+        f"Backtested {len(models)} models on {len(folds)} folds in "
+        f"{time.perf_counter() - start:.1f}s."
+    )
+    return results, predictions
@@ -0,0 +1,39 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import backtest_models
+
+MODELS = {
+    "xgboost": "xgboost_model",
+    "lightgbm": "lightgbm_model",
+    "catboost": "catboost_model",
+    "random_forest": "random_forest_model",
+}
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(  # Node 1
+                func=backtest_models,
+                inputs={
+                    "features": "walk_forward_features",
+                    "target": "walk_forward_target",
+                    "folds": "walk_forward_folds",
+                    "params": "params:executor",
+                    **MODELS,
+                },
+                outputs=["backtest_results", "backtest_predictions"],
+                name="backtest_models_node",
+                tags=["backtesting", "reporting"],
+            ),
+        ],
+        tags="backtesting_pipeline",
+        namespace="backtesting_pipeline",
+        inputs=[
+            "walk_forward_features",
+            "walk_forward_target",
+            "walk_forward_folds",
+            *MODELS.values(),
+        ],
+        outputs=["backtest_results", "backtest_predictions"],
+    )
@@ -1,21 +1,72 @@
 import logging
 import matplotlib.pyplot as plt
-from catboost import CatBoostRegressor
+from catboost import CatBoostRegressor, Pool
 from shap import TreeExplainer, summary_plot
 from sklearn.inspection import PartialDependenceDisplay
 
-
-def train_catboost_model(X_train, y_train, params):
+from ...reporting import PlotSpec
+from ...training import model_rmse, scheduler, training_info, warm_start_rows
+from ..hyperparameter_tuning_pipeline.nodes import apply_tuned_params
+from ..model_input_pipeline.nodes import native_dataset
+
+
+class StopAfterIterations:
+    """CatBoost training callback stopping the training after a number of iterations,
+    so a warm start adds at most that many trees without changing the `iterations`
+    parameter of the model."""
+
+    def __init__(self, iterations: int) -> None:
+        self.iterations = iterations
+
+    def after_iteration(self, info) -> bool:
+        # Iterations are counted from 1 within the fit, whatever the initial model
+        return info.iteration < self.iterations
+
+
+def train_catboost_model(
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    model_input_cache,
+    model_input_fingerprint,
+    params,
+    tuned_params=None,
+    use_tuned_params=False,
+    previous_model=None,
+    previous_info=None,
+    warm_start=None,
+):
     """
-    Trains a CatBoost regression model using the given training data and parameters.
+    Trains a CatBoost regression model using the given model input and parameters, from
+    the quantized pool cached for that model input.
+
+    With a validation holdout, training stops once the validation metric has not
+    improved for `early_stopping_rounds` rounds, and the model is shrunk to its best
+    iteration.
+
+    With warm starts enabled, the previously saved model keeps boosting, for at most
+    `max_added_trees` iterations, on the recent rows rather than being retrained, unless
+    its features or parameters changed or the new rows drifted.
 
     Args:
-        X_train (DataFrame): Training features.
-        y_train (Series/DataFrame): Training target.
+        X_train (DataFrame): Model input features.
+        y_train (Series/DataFrame): Model input target.
+        X_val (DataFrame): Validation holdout features, possibly empty.
+        y_val (Series): Validation holdout target.
+        model_input_cache (dict): The cached native datasets, by fingerprint.
+        model_input_fingerprint (str): The fingerprint of the model input.
         params (dict): Dictionary containing CatBoost parameters.
+        tuned_params (dict, optional): The parameters found by the hyperparameter
+            tuning, by model, which override `params` when `use_tuned_params` is on.
+        use_tuned_params (bool): Whether to use the tuned parameters.
+        previous_model (callable, optional): Loads the previously saved model, which
+            is only deserialized when it is used.
+        previous_info (dict, optional): The training info of the previous model.
+        warm_start (dict, optional): The warm start parameters.
 
     Returns:
-        CatBoostRegressor: Trained CatBoost model.
+        tuple: Trained CatBoost model and its training info.
     """
     # Initialize logger
     logger = logging.getLogger(__name__)
@@ -29,21 +80,6 @@ def train_catboost_model(X_train, y_train, params):
         f"verbose_eval={params.get('verbose_eval', True)}"
     )
 
-    # Convert specified columns to boolean based on provided data types
-    boolean_columns = params.get("data_types", {}).get("boolean_columns", [])
-    for col in boolean_columns:
-        if col in X_train.columns:
-            logger.debug(f"Converting column {col} to boolean.")
-            X_train[col] = X_train[col].astype("bool")
-
-    # Drop rows with null values from X_train and align y_train
-    X_train_clean = X_train.dropna()
-    y_train_clean = y_train.loc[X_train_clean.index]
-
-    # Log how many rows were dropped
-    dropped_rows = X_train.shape[0] - X_train_clean.shape[0]
-    logger.info(f"Dropped {dropped_rows} rows with null values from training data.")
-
     # Instantiate CatBoostRegressor with the given parameters
     cat_model = CatBoostRegressor(
         allow_writing_files=False,
@@ -54,24 +90,91 @@ def train_catboost_model(X_train, y_train, params):
         eval_metric=params["eval_metric"],
         random_seed=params.get("random_state", 42),
         verbose=params.get("verbose_eval", True),
+        thread_count=scheduler.threads("catboost", -1),
     )
-
-    # Train the model with an evaluation set for monitoring
+    cat_model = apply_tuned_params(
+        cat_model, tuned_params, "catboost", use_tuned_params
+    )
+    info = training_info(cat_model, X_train)
+
+    rows = warm_start_rows(
+        "catboost",
+        previous_model,
+        previous_info,
+        info,
+        X_train,
+        y_train,
+        warm_start or {},
+    )
+    if rows is None:
+        # Train on the cached quantized Pool of the model input
+        pool = native_dataset("catboost", model_input_cache, model_input_fingerprint)
+        init_model = None
+    elif not rows.any():
+        return previous_model(), previous_info
+    else:
+        # Continue boosting the previous model, already shrunk to its best iteration,
+        # on the recent rows
+        pool = Pool(X_train[rows], y_train[rows])
+        init_model = previous_model()
+    # The iterations of a warm start are the trees added, capped by a callback, so the
+    # model keeps its configured iterations, e.g. for backtesting refits
+    callbacks, max_iteration = None, cat_model.get_params()["iterations"]
+    if init_model is not None:
+        callbacks = [StopAfterIterations(warm_start["max_added_trees"])]
+        max_iteration = init_model.tree_count_ + warm_start["max_added_trees"]
+
+    # Early stop on the validation holdout, or only monitor the training set without one
+    early_stopping = len(X_val) > 0
     logger.info("Training the CatBoost model...")
     cat_model.fit(
-        X_train_clean,
-        y_train_clean,
-        eval_set=[(X_train_clean, y_train_clean)],
+        pool,
+        eval_set=Pool(X_val, y_val) if early_stopping else pool,
+        early_stopping_rounds=(
+            params.get("early_stopping_rounds") if early_stopping else None
+        ),
+        use_best_model=early_stopping,
         verbose=params.get("verbose_eval", True),
+        init_model=init_model,
+        callbacks=callbacks,
+    )
+    if early_stopping:
+        metric = params["eval_metric"]
+        logger.info(
+            f"Best iteration: {cat_model.tree_count_} of {max_iteration}, "
+            f"validation {metric} "
+            f"{cat_model.get_best_score()['validation'][metric]:.2f}."
+        )
+
+    # Reference error of the next warm start, on the holdout or else the training set
+    info["rmse"] = (
+        model_rmse(cat_model, X_val, y_val)
+        if len(X_val) > 0
+        else model_rmse(cat_model, X_train, y_train)
     )
 
     # Log the completion of the training process
     logger.info("CatBoost model training completed successfully.")
 
-    return cat_model
+    return cat_model, info
 
 
 def explain_catboost_model(model, X_train):
+    """
+    Describes the SHAP summary plot for the given CatBoost model. The SHAP values are
+    computed when the plot is drawn, by `draw_shap_summary`.
+
+    Args:
+        model: Trained CatBoost model.
+        X_train: Training feature set.
+
+    Returns:
+        PlotSpec: The spec of the SHAP summary plot.
+    """
+    return PlotSpec(draw_shap_summary, {"model": model, "X_train": X_train})
+
+
+def draw_shap_summary(model, X_train):
     """
     Generates a SHAP summary plot for the given CatBoost model.
 
@@ -100,6 +203,29 @@ def explain_catboost_model(model, X_train):
 
 
 def plot_partial_dependence_catboost(model, X_train, features):
+    """
+    Describes a partial dependence plot for specified features using the trained CatBoost
+    model. The partial dependence is computed when the plot is drawn, by
+    `draw_partial_dependence`.
+
+    Args:
+        model: Trained CatBoost model.
+        X_train (DataFrame): Training features.
+        features (list): List of feature names or indices for which to compute partial dependence.
+
+    Returns:
+        PlotSpec: The spec of the partial dependence plot.
+    """
+    # Skip the features that are not in the training set, e.g. pruned ones
+    features = [f for f in features if f in X_train.columns]
+
+    return PlotSpec(
+        draw_partial_dependence,
+        {"model": model, "X_train": X_train, "features": features},
+    )
+
+
+def draw_partial_dependence(model, X_train, features):
     """
     Generates a partial dependence plot for specified features using the trained CatBoost model.
 
@@ -19,13 +19,22 @@ def create_pipeline(**kwargs) -> Pipeline:
             node(  # Node 1: Train CatBoost Model
                 func=train_catboost_model,
                 inputs=[
-                    "X_train",
-                    "y_train",
+                    "model_input_fit_features",
+                    "model_input_fit_target",
+                    "model_input_validation_features",
+                    "model_input_validation_target",
+                    "model_input_cache",
+                    "model_input_fingerprint",
                     "params:catboost_model_params",
+                    "tuned_params",
+                    "params:training.use_tuned_params",
+                    "previous_catboost_model",
+                    "previous_catboost_training_info",
+                    "params:training.warm_start",
                 ],
-                outputs="catboost_model",
+                outputs=["catboost_model", "catboost_training_info"],
                 name="train_catboost_model_node",
-                tags=["model_training", "catboost"],
+                tags=["model_training", "model_fit", "catboost"],
             ),
             node(  # Node 2: Plot Feature Importance
                 func=plot_feature_importance,
@@ -58,6 +67,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                     "y_train",
                     "y_test",
                     "catboost_model_predictions",
+                    "params:reporting.max_plot_points",
                 ],
                 outputs="real_data_and_catboost_predictions_plot",
                 name="plot_real_data_and_predictions_node",
@@ -80,9 +90,29 @@ def create_pipeline(**kwargs) -> Pipeline:
         ],
         tags="model_training",
         namespace="catboost_training_pipeline",
-        inputs=["X_train", "y_train", "X_test", "y_test"],
+        parameters={
+            "params:reporting.max_plot_points",
+            "params:training.use_tuned_params",
+            "params:training.warm_start",
+        },
+        inputs=[
+            "X_train",
+            "y_train",
+            "X_test",
+            "y_test",
+            "model_input_fit_features",
+            "model_input_fit_target",
+            "model_input_validation_features",
+            "model_input_validation_target",
+            "model_input_cache",
+            "model_input_fingerprint",
+            "tuned_params",
+            "previous_catboost_model",
+            "previous_catboost_training_info",
+        ],
         outputs=[
             "catboost_model",
+            "catboost_training_info",
             "catboost_feature_importance_plot",
             "real_data_and_catboost_predictions_plot",
             "catboost_shap_summary_plot",
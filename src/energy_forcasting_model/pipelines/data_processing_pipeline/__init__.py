@@ -3,8 +3,16 @@ This is a boilerplate pipeline 'data_processing'
 generated using Kedro 0.19.3
 """
 
-from .pipeline import create_pipeline
+from .pipeline import (
+    create_aggregation_pipeline,
+    create_incremental_pipeline,
+    create_pipeline,
+)
 
-__all__ = ["create_pipeline"]
+__all__ = [
+    "create_pipeline",
+    "create_aggregation_pipeline",
+    "create_incremental_pipeline",
+]
 
 __version__ = "0.1"
@@ -1,40 +1,282 @@
+import logging
+import numpy as np
 import pandas as pd
 import re
 
 
-def prepare_power_consumption_data(consumptions: pd.DataFrame) -> pd.DataFrame:
+def time_index(index: pd.Index) -> pd.DatetimeIndex:
+    """
+    Returns the timestamps of an index. In panel mode, the index is an (id, time)
+    MultiIndex and the timestamps are its last level.
+    """
+    if isinstance(index, pd.MultiIndex):
+        return pd.DatetimeIndex(index.get_level_values(-1))
+    return pd.DatetimeIndex(index)
+
+
+def complete_panel_index(ids: np.ndarray, steps: np.ndarray):
+    """
+    Lists every (id, step) pair from the first to the last step of each id, sorted by
+    (id, step), without looping over the ids.
+
+    Args:
+        ids (np.ndarray): The id of every row.
+        steps (np.ndarray): The integer time step of every row.
+
+    Returns:
+        tuple: The ids and steps of the complete panel.
+    """
+    bounds = pd.Series(steps).groupby(ids).agg(["min", "max"])
+    counts = (bounds["max"] - bounds["min"] + 1).to_numpy()
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return (
+        np.repeat(bounds.index.to_numpy(), counts),
+        np.repeat(bounds["min"].to_numpy(), counts) + offsets,
+    )
+
+
+def _aggregate_daily_chunk(chunk: pd.DataFrame, id_column: str = None) -> pd.DataFrame:
+    """
+    Sums one chunk of minute-level readings into daily totals, per id in panel mode.
+
+    The day is parsed from the 'Date' column alone (with pandas' datetime cache, so each
+    distinct date string is parsed once), which avoids building 'date-time' strings.
+    Chunks coming from a typed cache already hold parsed dates and may omit 'Time'.
+    """
+    days = chunk["Date"]
+    if not pd.api.types.is_datetime64_any_dtype(days):
+        days = pd.to_datetime(days, format="%d/%m/%Y")
+    days = days.rename(None)
+    readings = chunk.drop(columns=["Date", "Time"], errors="ignore").rename(
+        columns={"Global_active_power": "total_consumption"}
+    )
+    if id_column is None:
+        return readings.groupby(days).sum()
+    return readings.drop(columns=id_column).groupby([chunk[id_column], days]).sum()
+
+
+def prepare_power_consumption_data(
+    consumptions, panel_params: dict = None
+) -> pd.DataFrame:
     """
     Preprocess the household power consumption data.
 
+    The data can be given either as a single DataFrame or, when the catalog entry sets a
+    `chunksize` in its `load_args`, as an iterator of DataFrame chunks. Each chunk is folded
+    into running daily sums, so peak memory stays bounded by the chunk size rather than the
+    length of the history.
+
+    In panel mode (an 'id_column' in the panel parameters), the readings of many meters
+    are summed per meter and day, and the result is indexed by (id, day).
+
     Args:
-        consumptions (pd.DataFrame): DataFrame containing the power consumption data.
+        consumptions (pd.DataFrame | Iterable[pd.DataFrame]): The power consumption data.
+        panel_params (dict, optional): The panel parameters.
 
     Returns:
         pd.DataFrame: The preprocessed power consumption data, resampled daily.
     """
+    logger = logging.getLogger(__name__)
+
+    id_column = (panel_params or {}).get("id_column")
+
+    if isinstance(consumptions, pd.DataFrame):
+        consumptions = [consumptions]
+
+    # Fold every chunk into the running daily totals
+    consumptions_df = None
+    n_rows = 0
+    for chunk in consumptions:
+        n_rows += len(chunk)
+        chunk_daily = _aggregate_daily_chunk(chunk, id_column)
+        if consumptions_df is None:
+            consumptions_df = chunk_daily
+        else:
+            # Days split across two chunks are summed together
+            consumptions_df = consumptions_df.add(chunk_daily, fill_value=0)
+
+    # Fill missing days with zeros, as a daily resample would
+    if id_column is None:
+        consumptions_df = consumptions_df.sort_index().asfreq("D", fill_value=0)
+        n_series = 1
+    else:
+        day = pd.Timedelta("1D").value
+        ids, days = complete_panel_index(
+            consumptions_df.index.get_level_values(0).to_numpy(),
+            consumptions_df.index.get_level_values(1).asi8 // day,
+        )
+        consumptions_df = consumptions_df.reindex(
+            pd.MultiIndex.from_arrays(
+                [ids, pd.to_datetime(days * day)], names=[id_column, None]
+            ),
+            fill_value=0,
+        )
+        n_series = len(np.unique(ids))
+
+    logger.info(
+        f"Aggregated {n_rows} power consumption readings into "
+        f"{len(consumptions_df)} days of {n_series} series."
+    )
+    return consumptions_df
+
+
+def _parse_timestamps(chunk: pd.DataFrame) -> pd.Series:
+    """
+    Builds the timestamp of each reading by adding the parsed 'Time' to the parsed 'Date',
+    without concatenating strings. Columns already parsed by a typed cache are reused.
+    """
+    dates = chunk["Date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="%d/%m/%Y")
+    times = chunk["Time"]
+    if not pd.api.types.is_timedelta64_dtype(times):
+        times = pd.to_timedelta(times)
+    return dates + times
 
-    # Standardise column names using lower case
-    consumptions.rename(
-        columns={
-            "Date": "date",
-            "Time": "time",
-            "Global_active_power": "total_consumption",
+
+def _aggregate_chunk(
+    chunk: pd.DataFrame, resolution: pd.Timedelta, id_column: str = None
+) -> pd.DataFrame:
+    """
+    Reduces one chunk of readings to partial sums, counts, minimums and maximums per
+    time bin, and per id in panel mode. Bins are integer codes of the timestamps, so
+    grouping needs no resampling.
+    """
+    timestamps = _parse_timestamps(chunk).to_numpy(dtype="datetime64[ns]")
+    keys = [timestamps.view("int64") // resolution.value]
+    readings = chunk.drop(columns=["Date", "Time"]).rename(
+        columns={"Global_active_power": "total_consumption"}
+    )
+    if id_column is not None:
+        keys.insert(0, readings.pop(id_column).to_numpy())
+    grouped = readings.groupby(keys)
+    return pd.concat(
+        {
+            "sum": grouped.sum(),
+            "count": grouped.count(),
+            "min": grouped.min(),
+            "max": grouped.max(),
         },
-        inplace=True,
+        axis=1,
     )
 
-    # Define the dataframe index based on the timestamp (date-time)
-    consumptions.index = pd.to_datetime(
-        consumptions.date + "-" + consumptions.time, format="%d/%m/%Y-%H:%M:%S"
+
+def _index_keys(index: pd.Index) -> list:
+    """
+    Returns the values of every level of an index, as grouping keys.
+    """
+    return [index.get_level_values(level).to_numpy() for level in range(index.nlevels)]
+
+
+def _reduce_partials(partials: pd.DataFrame, codes) -> pd.DataFrame:
+    """
+    Combines partial aggregates sharing the same bin code (and id in panel mode).
+    """
+    return pd.concat(
+        {
+            "sum": partials["sum"].groupby(codes).sum(),
+            "count": partials["count"].groupby(codes).sum(),
+            "min": partials["min"].groupby(codes).min(),
+            "max": partials["max"].groupby(codes).max(),
+        },
+        axis=1,
     )
 
-    # Drop the date and time variables that are now redundant with the index
-    consumptions.drop(columns=["date", "time"], inplace=True)
 
-    # Resample the data to daily sums
-    consumptions_df = consumptions.resample("D").sum()
+def aggregate_power_consumption(
+    consumptions, params: dict, panel_params: dict = None
+) -> dict:
+    """
+    Aggregates minute-level readings at several resolutions in a single pass.
 
-    return consumptions_df
+    The raw readings are only scanned once, at the finest configured resolution. Each
+    chunk is folded into running aggregates at that resolution, so peak memory stays
+    bounded by the chunk size and the number of bins rather than the number of readings.
+    Every coarser resolution is then reduced from those aggregates, so each additional
+    resolution or statistic costs a fraction of a rescan. Empty bins are kept, with a sum
+    and count of zero, as `resample` would.
+
+    Args:
+        consumptions (pd.DataFrame | Iterable[pd.DataFrame]): The power consumption
+            readings, including the 'Date' and 'Time' columns.
+        params (dict): The aggregation parameters, with the 'resolutions' (pandas
+            offset aliases) and the 'statistics' among sum, mean, min, max and count.
+        panel_params (dict, optional): The panel parameters. With an 'id_column', the
+            statistics are computed per id and indexed by (id, time).
+
+    Returns:
+        dict: A DataFrame of statistics per resolution, with `<column>_<statistic>`
+            columns, keyed by resolution.
+    """
+    logger = logging.getLogger(__name__)
+
+    id_column = (panel_params or {}).get("id_column")
+
+    resolutions = sorted(params["resolutions"], key=pd.to_timedelta)
+    statistics = params["statistics"]
+    finest = pd.to_timedelta(resolutions[0])
+    for resolution in resolutions:
+        if pd.to_timedelta(resolution) % finest:
+            raise ValueError(
+                f"Resolution '{resolution}' is not a multiple of the finest "
+                f"resolution '{resolutions[0]}'."
+            )
+
+    if isinstance(consumptions, pd.DataFrame):
+        consumptions = [consumptions]
+
+    # Single pass over the readings at the finest resolution, folding every chunk into
+    # the running aggregates
+    finest_aggregates = None
+    for chunk in consumptions:
+        partials = _aggregate_chunk(chunk, finest, id_column)
+        if finest_aggregates is not None:
+            # Bins split across two chunks are combined
+            partials = pd.concat([finest_aggregates, partials])
+        finest_aggregates = _reduce_partials(partials, _index_keys(partials.index))
+
+    aggregates = {}
+    for resolution in resolutions:
+        offset = pd.to_timedelta(resolution)
+        keys = _index_keys(finest_aggregates.index)
+        keys[-1] = keys[-1] * finest.value // offset.value
+        reduced = _reduce_partials(finest_aggregates, keys)
+
+        # Keep empty bins, as resample would
+        if id_column is None:
+            reduced = reduced.reindex(np.arange(keys[-1].min(), keys[-1].max() + 1))
+        else:
+            ids, codes = complete_panel_index(*_index_keys(reduced.index))
+            reduced = reduced.reindex(pd.MultiIndex.from_arrays([ids, codes]))
+        reduced["sum"] = reduced["sum"].fillna(0)
+        reduced["count"] = reduced["count"].fillna(0).astype("int64")
+        reduced = pd.concat(
+            [reduced, pd.concat({"mean": reduced["sum"] / reduced["count"]}, axis=1)],
+            axis=1,
+        )
+
+        # Flatten to <column>_<statistic>, grouped by column
+        resolution_df = reduced[statistics].swaplevel(axis=1)
+        resolution_df = resolution_df[resolution_df.columns.get_level_values(0).unique()]
+        resolution_df.columns = [
+            f"{column}_{statistic}" for column, statistic in resolution_df.columns
+        ]
+        if id_column is None:
+            resolution_df.index = pd.DatetimeIndex(
+                reduced.index.to_numpy() * offset.value, freq=offset
+            )
+        else:
+            ids, codes = _index_keys(reduced.index)
+            resolution_df.index = pd.MultiIndex.from_arrays(
+                [ids, pd.to_datetime(codes * offset.value)], names=[id_column, None]
+            )
+        aggregates[resolution] = resolution_df
+
+        logger.info(
+            f"Aggregated power consumption into {len(resolution_df)} bins of {resolution}."
+        )
+
+    return aggregates
 
 
 def prepare_weather_data(
@@ -76,9 +318,102 @@ def calculate_day_length(df, sunrise_col="sunrise", sunset_col="sunset"):
     return df.drop([sunrise_col, sunset_col], axis=1)
 
 
-def preprocess_weather_data(df, params):
+def _normalise_categories(series: pd.Series) -> pd.Categorical:
+    """
+    Cleans a string column with `clean_string`, running it once per distinct value
+    rather than once per row.
+    """
+    codes, uniques = pd.factorize(series)
+    # Distinct raw values may clean to the same string, so factorize them once more
+    cleaned_codes, cleaned = pd.factorize(pd.Index(uniques).map(clean_string))
+    codes = np.where(codes >= 0, cleaned_codes[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=cleaned)
+
+
+def learn_weather_conditions_vocabulary(
+    weather_data: pd.DataFrame, params: dict, previous_vocabulary=None
+):
+    """
+    Learns the sorted list of cleaned values of the encoded column over the whole weather
+    history, so the one-hot columns do not depend on the selected date interval.
+
+    The vocabulary is learned once: when a previous vocabulary exists, it is kept as it
+    is, without scanning the history, so the encoded columns stay the same from run to
+    run. With `extend_vocabulary`, the history is scanned and the values it holds that
+    are not in the previous vocabulary are appended to it, in sorted order.
+
+    Args:
+        weather_data (pd.DataFrame): The full weather data.
+        params (dict): The data processing parameters.
+        previous_vocabulary (list, optional): The persisted vocabulary, if any.
+
+    Returns:
+        list: The vocabulary of cleaned values.
+    """
+    logger = logging.getLogger(__name__)
+
+    if previous_vocabulary is not None and not params.get("extend_vocabulary"):
+        return previous_vocabulary
+
+    column_to_encode = params["column_to_encode"]
+    categories = _normalise_categories(weather_data[column_to_encode].dropna())
+    if previous_vocabulary is None:
+        return sorted(categories.categories)
+
+    new_values = sorted(set(categories.categories) - set(previous_vocabulary))
+    if new_values:
+        logger.info(f"Extending the {column_to_encode} vocabulary with {new_values}.")
+    return previous_vocabulary + new_values
+
+
+def vocabulary_columns(vocabulary: list, prefix: str) -> list:
+    """
+    The names of the one-hot columns encoding a vocabulary, `<prefix>_<value>`.
+    """
+    return [f"{prefix}_{value}" for value in vocabulary]
+
+
+def encode_with_vocabulary(
+    series: pd.Series, vocabulary: list, prefix: str
+) -> pd.DataFrame:
+    """
+    One-hot encodes a string column against a fixed vocabulary.
+
+    Every vocabulary entry gets a boolean column, whether or not it appears in `series`,
+    and values outside the vocabulary are left with all columns False.
+
+    Args:
+        series (pd.Series): The raw string column.
+        vocabulary (list): The cleaned values to encode.
+        prefix (str): The prefix of the encoded column names.
+
+    Returns:
+        pd.DataFrame: A boolean block with one column per vocabulary entry.
+    """
+    logger = logging.getLogger(__name__)
+
+    categories = _normalise_categories(series).set_categories(vocabulary)
+    codes = categories.codes
+    known = codes >= 0
+
+    unknown_values = series[~known & series.notna().to_numpy()].unique()
+    if len(unknown_values):
+        logger.warning(f"Values outside the {prefix} vocabulary: {list(unknown_values)}")
+
+    # Fill the block directly from the category codes
+    block = np.zeros((len(series), len(vocabulary)), dtype=bool)
+    block[np.flatnonzero(known), codes[known]] = True
+
+    return pd.DataFrame(
+        block,
+        index=series.index,
+        columns=vocabulary_columns(vocabulary, prefix),
+    )
+
+
+def preprocess_weather_data(df, params, vocabulary):
     """
-    Preprocesses weather data: sorts by index, filters by date, selects columns, encodes a column, and calculates day length.
+    Preprocesses weather data: sorts by index, filters by date, selects columns, encodes a column against a fixed vocabulary, and calculates day length.
     """
     # Extract parameters
     start_date = params["date_interval"]["start_date"]
@@ -92,14 +427,16 @@ def preprocess_weather_data(df, params):
     # Select specified columns
     df_selected = df.loc[:, columns_to_keep].copy()
 
-    # Filter by date range
-    df_filtered = df_selected.loc[
-        (df_selected.index >= start_date) & (df_selected.index <= end_date)
-    ].copy()
+    # Filter by date range (an empty end date leaves the interval open-ended)
+    in_interval = df_selected.index >= start_date
+    if end_date is not None:
+        in_interval &= df_selected.index <= end_date
+    df_filtered = df_selected.loc[in_interval].copy()
 
     # Clean and encode specified column
-    df_filtered[column_to_encode] = df_filtered[column_to_encode].apply(clean_string)
-    dummies = pd.get_dummies(df_filtered[column_to_encode], prefix=column_to_encode)
+    dummies = encode_with_vocabulary(
+        df_filtered[column_to_encode], vocabulary, prefix=column_to_encode
+    )
     df_encoded = pd.concat([df_filtered, dummies], axis=1).drop(
         column_to_encode, axis=1
     )
@@ -108,46 +445,316 @@ def preprocess_weather_data(df, params):
     return calculate_day_length(df_encoded)
 
 
+def asof_positions(
+    left_index: pd.DatetimeIndex,
+    right_index: pd.DatetimeIndex,
+    direction: str = "backward",
+    tolerance=None,
+    fill_limit: int = 0,
+    groups: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Finds, for every timestamp of a sorted left index, the position of the matching row of
+    a sorted right index, by binary search rather than by merging or resampling.
+    In panel mode, the left index is sorted within each group.
+
+    Args:
+        left_index (pd.DatetimeIndex): Sorted timestamps to align.
+        right_index (pd.DatetimeIndex): Sorted timestamps to align on.
+        direction (str): 'backward' matches the last right timestamp at or before each
+            left one, 'forward' the first at or after it, and 'nearest' the closest one.
+        tolerance: Maximum distance between matched timestamps, as a timedelta string.
+            No limit when None.
+        fill_limit (int): Number of consecutive unmatched left rows that are filled with
+            the previous match.
+        groups (np.ndarray, optional): The group of every left row; matches are only
+            filled within a group.
+
+    Returns:
+        np.ndarray: The matched right positions, or -1 for unmatched left rows.
+    """
+    left = left_index.asi8
+    right = right_index.asi8
+    if len(right) == 0:
+        return np.full(len(left), -1)
+
+    # Candidates at or before, and at or after, each left timestamp
+    before = np.searchsorted(right, left, side="right") - 1
+    after = np.searchsorted(right, left, side="left")
+    before_distance = np.where(
+        before >= 0, left - right[before.clip(min=0)], np.iinfo(np.int64).max
+    )
+    after_distance = np.where(
+        after < len(right),
+        right[after.clip(max=len(right) - 1)] - left,
+        np.iinfo(np.int64).max,
+    )
+
+    if direction == "backward":
+        positions, distances = before, before_distance
+    elif direction == "forward":
+        positions, distances = after, after_distance
+    elif direction == "nearest":
+        use_after = after_distance < before_distance
+        positions = np.where(use_after, after, before)
+        distances = np.where(use_after, after_distance, before_distance)
+    else:
+        raise ValueError(f"Unknown as-of direction '{direction}'.")
+
+    max_distance = (
+        pd.to_timedelta(tolerance).value
+        if tolerance is not None
+        else np.iinfo(np.int64).max - 1
+    )
+    positions = np.where(distances <= max_distance, positions, -1)
+
+    if fill_limit:
+        positions = pd.Series(positions, dtype="float64").where(positions >= 0)
+        if groups is None:
+            positions = positions.ffill(limit=fill_limit)
+        else:
+            positions = positions.groupby(groups).ffill(limit=fill_limit)
+        positions = positions.fillna(-1).to_numpy(dtype="int64")
+    return positions
+
+
 def merge_consumption_and_weather_data(
-    power_consumption_data: pd.DataFrame, processed_weather_data: pd.DataFrame
+    power_consumption_data: pd.DataFrame,
+    processed_weather_data: pd.DataFrame,
+    params: dict,
 ) -> pd.DataFrame:
     """
-    Merges power consumption data with processed weather data on their indices.
+    Aligns processed weather data onto power consumption data with an as-of join, so the
+    two series may have different granularities (e.g. hourly consumption, daily weather).
+    In panel mode, the same weather is aligned onto the consumption of every id.
 
     Args:
         power_consumption_data (pd.DataFrame): DataFrame containing power consumption data.
         processed_weather_data (pd.DataFrame): DataFrame containing processed weather data.
+        params (dict): The alignment parameters: 'direction', 'tolerance' and
+            'fill_limit' (see `asof_positions`), and 'how', which is 'inner' to drop
+            unmatched consumption rows or 'left' to keep them with missing weather.
 
     Returns:
         pd.DataFrame: The merged DataFrame.
     """
-    merged_df = pd.merge(
-        power_consumption_data,
-        processed_weather_data,
-        left_index=True,
-        right_index=True,
+    logger = logging.getLogger(__name__)
+
+    power_consumption_data = power_consumption_data.sort_index()
+    processed_weather_data = processed_weather_data.sort_index()
+
+    positions = asof_positions(
+        time_index(power_consumption_data.index),
+        processed_weather_data.index,
+        direction=params.get("direction", "backward"),
+        tolerance=params.get("tolerance"),
+        fill_limit=params.get("fill_limit", 0),
+        groups=_index_keys(power_consumption_data.index)[0]
+        if isinstance(power_consumption_data.index, pd.MultiIndex)
+        else None,
+    )
+    matched = positions >= 0
+
+    logger.info(
+        f"Aligned weather onto {matched.sum()} of {len(positions)} consumption rows "
+        f"({(~matched).sum()} unmatched)."
     )
+
+    if params.get("how", "inner") == "inner":
+        consumption = power_consumption_data.loc[matched]
+        weather = processed_weather_data.iloc[positions[matched]]
+    else:
+        consumption = power_consumption_data
+        weather = processed_weather_data.iloc[np.where(matched, positions, 0)]
+        weather = weather.where(pd.Series(matched, index=weather.index), axis=0)
+
+    merged_df = pd.concat([consumption, weather.set_axis(consumption.index)], axis=1)
     return merged_df
 
 
-def mark_holidays(df: pd.DataFrame, holidays_df: pd.DataFrame) -> pd.DataFrame:
+def build_calendar(holidays_df: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """
+    Precomputes a daily calendar table over a configurable span.
+
+    The table holds the basic date fields (day of week, quarter, month, year, day of
+    year), whether each day is a holiday or a bridge day (a working day between a holiday
+    and a weekend), and the number of days until the next and since the previous holiday.
+
+    Args:
+        holidays_df (pd.DataFrame): DataFrame with a column 'date' of holiday dates.
+        params (dict): The calendar parameters, with its 'start_date' and 'end_date'.
+
+    Returns:
+        pd.DataFrame: The calendar table, indexed by day.
+    """
+    days = pd.date_range(params["start_date"], params["end_date"], freq="D")
+    holidays = np.unique(pd.to_datetime(holidays_df["date"]).to_numpy("datetime64[D]"))
+    day_numbers = days.to_numpy("datetime64[D]")
+
+    is_holiday = np.isin(day_numbers, holidays)
+    is_weekend = days.dayofweek.to_numpy() >= 5
+    is_day_off = is_holiday | is_weekend
+
+    # A bridge day is a working day squeezed between a holiday and a weekend
+    previous_day_off = np.r_[False, is_day_off[:-1]]
+    next_day_off = np.r_[is_day_off[1:], False]
+    previous_holiday = np.r_[False, is_holiday[:-1]]
+    next_holiday = np.r_[is_holiday[1:], False]
+    is_bridge_day = (
+        ~is_day_off
+        & previous_day_off
+        & next_day_off
+        & (previous_holiday | next_holiday)
+    )
+
+    # Distances to the surrounding holidays, by binary search in the sorted holidays
+    next_position = np.searchsorted(holidays, day_numbers, side="left")
+    previous_position = np.searchsorted(holidays, day_numbers, side="right") - 1
+    holiday_numbers = holidays.astype("int64")
+    day_integers = day_numbers.astype("int64")
+    days_until_holiday = np.where(
+        next_position < len(holidays),
+        holiday_numbers[next_position.clip(max=len(holidays) - 1)] - day_integers,
+        np.nan,
+    )
+    days_since_holiday = np.where(
+        previous_position >= 0,
+        day_integers - holiday_numbers[previous_position.clip(min=0)],
+        np.nan,
+    )
+
+    return pd.DataFrame(
+        {
+            "dayofweek": days.dayofweek,
+            "quarter": days.quarter,
+            "month": days.month,
+            "year": days.year,
+            "dayofyear": days.dayofyear,
+            "is_holiday": is_holiday,
+            "is_bridge_day": is_bridge_day,
+            "days_until_holiday": days_until_holiday,
+            "days_since_holiday": days_since_holiday,
+        },
+        index=days,
+    )
+
+
+def lookup_calendar_features(
+    index: pd.DatetimeIndex, calendar: pd.DataFrame, columns: list
+) -> pd.DataFrame:
+    """
+    Looks up calendar columns for every timestamp of an index.
+
+    Timestamps are matched to their day by binary search in the sorted calendar index,
+    so any granularity (daily, hourly, minute) can be joined without building sets or
+    merging.
+
+    Args:
+        index (pd.Index): The timestamps to look up, or an (id, time) panel index.
+        calendar (pd.DataFrame): The calendar table from `build_calendar`.
+        columns (list): The calendar columns to return.
+
+    Returns:
+        pd.DataFrame: The calendar columns, aligned on `index`.
+    """
+    calendar_days = calendar.index.to_numpy("datetime64[D]")
+    days = time_index(index).to_numpy("datetime64[D]")
+    positions = np.searchsorted(calendar_days, days)
+
+    found = positions < len(calendar_days)
+    found[found] = calendar_days[positions[found]] == days[found]
+    if not found.all():
+        raise ValueError(
+            f"{(~found).sum()} timestamps fall outside the calendar span "
+            f"{calendar.index.min().date()} to {calendar.index.max().date()}."
+        )
+
+    features = calendar[columns].iloc[positions]
+    features.index = index
+    return features
+
+
+def mark_holidays(df: pd.DataFrame, calendar: pd.DataFrame) -> pd.DataFrame:
     """
-    Mark days as holidays in a DataFrame based on a provided list of holiday dates.
+    Mark days as holidays in a DataFrame based on the precomputed calendar table.
 
     Parameters:
     - df: pd.DataFrame with a DateTimeIndex.
-    - holidays_df: pd.DataFrame with a column 'date' that contains holiday dates.
+    - calendar: pd.DataFrame built by `build_calendar`.
 
     Returns:
-    - pd.DataFrame: The original DataFrame with an added boolean column 'is_holiday'
+    - pd.DataFrame: A copy of the DataFrame with an added boolean column 'is_holiday'
                     indicating whether each date is a holiday.
     """
-    # Convert the 'date' column in holidays_df to pandas datetime
-    holidays_df["date"] = pd.to_datetime(holidays_df["date"])
+    df = df.copy()
+    df["is_holiday"] = lookup_calendar_features(df.index, calendar, ["is_holiday"])[
+        "is_holiday"
+    ]
+    return df
 
-    # Convert the list of dates to a set for faster lookup
-    french_holidays_set = set(holidays_df["date"])
 
-    # Add a new column 'is_holiday' to the DataFrame, marking rows that match dates in the holidays set
-    df["is_holiday"] = df.index.isin(french_holidays_set)
-    return df
+def compute_processing_watermark(processed_data: pd.DataFrame) -> dict:
+    """
+    Returns the high-watermark of the processed data, i.e. the last day it covers.
+
+    Args:
+        processed_data (pd.DataFrame): Processed data with a DatetimeIndex.
+
+    Returns:
+        dict: {"watermark": "YYYY-MM-DD"} for the last processed day.
+    """
+    return {"watermark": processed_data.index.max().strftime("%Y-%m-%d")}
+
+
+def select_incremental_interval(params: dict, watermark: dict) -> dict:
+    """
+    Restricts the data processing parameters to the days from the watermark onwards.
+
+    The watermark day itself is included, since it may only have been partially
+    recorded when it was last processed. The interval is left open-ended so new days
+    after the configured end date are picked up.
+
+    Args:
+        params (dict): The data processing parameters.
+        watermark (dict): The current processing watermark.
+
+    Returns:
+        dict: A copy of the parameters with an updated 'date_interval'.
+    """
+    return {
+        **params,
+        "date_interval": {"start_date": watermark["watermark"], "end_date": None},
+    }
+
+
+def upsert_processed_data(processed_data: pd.DataFrame, new_data: pd.DataFrame):
+    """
+    Upserts newly processed days into the existing processed data.
+
+    Days present in both frames are replaced by their new values, and flag columns that
+    are missing from the new rows (e.g. weather conditions not seen since the watermark)
+    are set to False.
+
+    Args:
+        processed_data (pd.DataFrame): The previously processed data.
+        new_data (pd.DataFrame): The processed data from the watermark onwards.
+
+    Returns:
+        tuple: The updated processed data and its new watermark.
+    """
+    logger = logging.getLogger(__name__)
+
+    new_data = new_data.reindex(columns=processed_data.columns)
+    flag_columns = processed_data.columns[processed_data.dtypes == bool]
+    new_data[flag_columns] = new_data[flag_columns].eq(True)
+
+    replaced_days = processed_data.index.isin(new_data.index)
+    updated_data = pd.concat(
+        [processed_data.loc[~replaced_days], new_data]
+    ).sort_index()
+
+    logger.info(
+        f"Upserted {len(new_data)} days into the processed data "
+        f"({replaced_days.sum()} replaced, {len(new_data) - replaced_days.sum()} added)."
+    )
+    return updated_data, compute_processing_watermark(updated_data)
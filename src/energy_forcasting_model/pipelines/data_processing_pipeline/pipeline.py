@@ -2,10 +2,16 @@ from kedro.pipeline import Pipeline, node, pipeline
 
 from .nodes import (
     prepare_power_consumption_data,
+    aggregate_power_consumption,
     prepare_weather_data,
+    learn_weather_conditions_vocabulary,
     preprocess_weather_data,
     merge_consumption_and_weather_data,
+    build_calendar,
     mark_holidays,
+    compute_processing_watermark,
+    select_incremental_interval,
+    upsert_processed_data,
 )
 
 
@@ -14,7 +20,7 @@ def create_pipeline(**kwargs) -> Pipeline:
         [
             node(
                 func=prepare_power_consumption_data,
-                inputs="household_power_consumption",
+                inputs=["household_power_consumption", "params:data_processing.panel"],
                 outputs="power_consumption_data",
                 name="prepare_power_consumption_data_node",
                 tags=["data_preparation", "power_consumption"],
@@ -26,27 +32,60 @@ def create_pipeline(**kwargs) -> Pipeline:
                 name="prepare_weather_data_node",
                 tags=["data_preparation", "weather_data"],
             ),
+            node(
+                func=learn_weather_conditions_vocabulary,
+                inputs=[
+                    "weather_data",
+                    "params:data_processing",
+                    "previous_weather_conditions_vocabulary",
+                ],
+                outputs="weather_conditions_vocabulary",
+                name="learn_weather_conditions_vocabulary_node",
+                tags=["data_preprocessing", "weather_data"],
+            ),
             node(
                 func=preprocess_weather_data,
-                inputs=["weather_data", "params:data_processing"],
+                inputs=[
+                    "weather_data",
+                    "params:data_processing",
+                    "weather_conditions_vocabulary",
+                ],
                 outputs="processed_weather_data",
                 name="preprocess_weather_data_node",
                 tags=["data_preprocessing", "weather_data"],
             ),
             node(
                 func=merge_consumption_and_weather_data,
-                inputs=["power_consumption_data", "processed_weather_data"],
+                inputs=[
+                    "power_consumption_data",
+                    "processed_weather_data",
+                    "params:data_processing.alignment",
+                ],
                 outputs="weather_and_consumption_data",
                 name="merge_consumption_and_weather_data_node",
                 tags=["data_merging"],
             ),
+            node(
+                func=build_calendar,
+                inputs=["french_holidays", "params:calendar"],
+                outputs="calendar_features",
+                name="build_calendar_node",
+                tags=["feature_engineering", "holidays"],
+            ),
             node(
                 func=mark_holidays,
-                inputs=["weather_and_consumption_data", "french_holidays"],
+                inputs=["weather_and_consumption_data", "calendar_features"],
                 outputs="processed_weather_and_consumption_data",
                 name="mark_holidays_node",
                 tags=["feature_engineering", "holidays"],
             ),
+            node(
+                func=compute_processing_watermark,
+                inputs="processed_weather_and_consumption_data",
+                outputs="processing_watermark",
+                name="compute_processing_watermark_node",
+                tags=["incremental"],
+            ),
         ],
         tags="data_processing_pipeline",
         namespace="data_processing_pipeline",
@@ -55,6 +94,131 @@ def create_pipeline(**kwargs) -> Pipeline:
             "weather_data_part1",
             "weather_data_part2",
             "french_holidays",
+            "previous_weather_conditions_vocabulary",
+        ],
+        outputs=[
+            "processed_weather_and_consumption_data",
+            "processing_watermark",
+            "weather_conditions_vocabulary",
+            "calendar_features",
+        ],
+    )
+
+
+def create_aggregation_pipeline(**kwargs) -> Pipeline:
+    """
+    Aggregates the minute-level readings at several resolutions. No other pipeline
+    uses the aggregates, and reading every minute of the history is the slowest step of
+    the data processing, so it is only run on demand, with
+    `kedro run --pipeline=data_processing_aggregation_pipeline`.
+    """
+    return pipeline(
+        [
+            node(
+                func=aggregate_power_consumption,
+                inputs=[
+                    "household_power_consumption_readings",
+                    "params:data_processing.aggregation",
+                    "params:data_processing.panel",
+                ],
+                outputs="power_consumption_aggregates",
+                name="aggregate_power_consumption_node",
+                tags=["data_preparation", "power_consumption"],
+            ),
+        ],
+        tags="data_processing_pipeline",
+        namespace="data_processing_pipeline",
+        inputs="household_power_consumption_readings",
+        outputs="power_consumption_aggregates",
+    )
+
+
+def create_incremental_pipeline(**kwargs) -> Pipeline:
+    """
+    Processes only the days from the processing watermark onwards and upserts them into
+    the existing processed data. Run it with
+    `kedro run --pipeline=data_processing_incremental_pipeline` after one full run.
+    """
+    return pipeline(
+        [
+            node(
+                func=select_incremental_interval,
+                inputs=["params:data_processing", "previous_processing_watermark"],
+                outputs="incremental_data_processing_params",
+                name="select_incremental_interval_node",
+                tags=["incremental"],
+            ),
+            node(
+                func=prepare_power_consumption_data,
+                inputs="household_power_consumption_since_watermark",
+                outputs="power_consumption_data",
+                name="prepare_power_consumption_data_node",
+                tags=["data_preparation", "power_consumption"],
+            ),
+            node(
+                func=prepare_weather_data,
+                inputs=["weather_data_part1", "weather_data_part2"],
+                outputs="weather_data",
+                name="prepare_weather_data_node",
+                tags=["data_preparation", "weather_data"],
+            ),
+            node(
+                func=preprocess_weather_data,
+                inputs=[
+                    "weather_data",
+                    "incremental_data_processing_params",
+                    "weather_conditions_vocabulary",
+                ],
+                outputs="processed_weather_data",
+                name="preprocess_weather_data_node",
+                tags=["data_preprocessing", "weather_data"],
+            ),
+            node(
+                func=merge_consumption_and_weather_data,
+                inputs=[
+                    "power_consumption_data",
+                    "processed_weather_data",
+                    "params:data_processing.alignment",
+                ],
+                outputs="weather_and_consumption_data",
+                name="merge_consumption_and_weather_data_node",
+                tags=["data_merging"],
+            ),
+            node(
+                func=mark_holidays,
+                inputs=["weather_and_consumption_data", "calendar_features"],
+                outputs="new_processed_weather_and_consumption_data",
+                name="mark_holidays_node",
+                tags=["feature_engineering", "holidays"],
+            ),
+            node(
+                func=upsert_processed_data,
+                inputs=[
+                    "previous_processed_weather_and_consumption_data",
+                    "new_processed_weather_and_consumption_data",
+                ],
+                outputs=[
+                    "processed_weather_and_consumption_data",
+                    "processing_watermark",
+                ],
+                name="upsert_processed_data_node",
+                tags=["incremental"],
+            ),
+        ],
+        tags=["data_processing_pipeline", "incremental"],
+        namespace="data_processing_pipeline",
+        inputs=[
+            "household_power_consumption_since_watermark",
+            "weather_data_part1",
+            "weather_data_part2",
+            "calendar_features",
+            "previous_processed_weather_and_consumption_data",
+            "previous_processing_watermark",
+            "weather_conditions_vocabulary",
+        ],
+        outputs=[
+            "processed_weather_and_consumption_data",
+            "processing_watermark",
+            "new_processed_weather_and_consumption_data",
         ],
-        outputs="processed_weather_and_consumption_data",
     )
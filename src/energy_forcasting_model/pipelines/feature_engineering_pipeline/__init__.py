@@ -3,8 +3,8 @@ This is a boilerplate pipeline 'feature_engineering_pipeline'
 generated using Kedro 0.19.3
 """
 
-from .pipeline import create_pipeline
+from .pipeline import create_online_pipeline, create_pipeline
 
-__all__ = ["create_pipeline"]
+__all__ = ["create_pipeline", "create_online_pipeline"]
 
 __version__ = "0.1"
@@ -1,47 +1,1057 @@
+import hashlib
+import logging
+import numpy as np
 import pandas as pd
 
+from ..data_processing_pipeline.nodes import lookup_calendar_features, time_index
+
 
 # Node 1
-def create_features(df: pd.DataFrame, feature_params: dict):
+def create_features(df: pd.DataFrame, feature_params: dict, calendar: pd.DataFrame):
     """
     Create time series features based on time series index and add lag and rolling features for specified columns.
     Adapted to accept feature parameters as a single dictionary and addresses DataFrame fragmentation issues.
+    Basic features found in the precomputed calendar table are looked up from it, the others are read from the index.
+    In panel mode (an (id, time) index), lags and rolling windows never cross two ids.
+    The rolling statistics (mean, std, min, max, ewm) are set by 'rolling_statistics'.
     """
     column_names = feature_params["column_names"]
     lags = feature_params["lags"]
     window_sizes = feature_params["window_sizes"]
     basic_features = feature_params["basic_features"]
+    statistics = feature_params.get("rolling_statistics", ["mean"])
+
+    df, group_positions = sort_panel(df)
 
     # List to store created feature names
     created_features = []
 
-    for feature in basic_features:
-        # Add basic time series features to the DataFrame
-        df[feature] = getattr(df.index, feature)
-        created_features.append(feature)
+    # Add basic time series features to the DataFrame
+    add_basic_features(df, basic_features, calendar)
+    created_features.extend(basic_features)
 
-    # Create lag features and rolling window features using pd.concat
-    lag_features = []
-    rolling_mean_features = []
-    for column_name in column_names:
-        # Lag features for each specified column
-        for lag in lags:
-            lag_feature_name = f"{column_name}_lag_{lag}"
-            lag_features.append(df[column_name].shift(lag).rename(lag_feature_name))
-
-        # Rolling window features for each specified column
-        for window in window_sizes:
-            rolling_mean_name = f"{column_name}_rolling_mean_{window}"
-            rolling_mean_features.append(
-                df[column_name]
-                .shift(1)  # Shift by one day
-                .rolling(window=window)
-                .mean()
-                .rename(rolling_mean_name)
-            )
+    # Create lag features and rolling window features in one preallocated block, each
+    # written straight into its columns
+    values = df[column_names].to_numpy(dtype="float64")
+    lag_names, rolling_names = lag_and_rolling_names(
+        column_names, lags, window_sizes, statistics
+    )
+    block = np.empty((len(df), len(lag_names) + len(rolling_names)))
+    lag_features(values, lags, group_positions, out=block[:, : len(lag_names)])
+    rolling_features(
+        values,
+        window_sizes,
+        statistics,
+        group_positions,
+        out=block[:, len(lag_names) :],
+    )
+    features_block = pd.DataFrame(
+        block, index=df.index, columns=lag_names + rolling_names, copy=False
+    )
 
     # Concatenate lag features and rolling window features
-    df = pd.concat([df] + lag_features + rolling_mean_features, axis=1)
-    created_features.extend([f.name for f in lag_features + rolling_mean_features])
+    df = pd.concat([df, features_block], axis=1)
+    created_features.extend(lag_names + rolling_names)
 
     return df, created_features
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Returns a short fingerprint of the values and index of a DataFrame.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()[:16]
+
+
+def create_features_with_cache(
+    df: pd.DataFrame,
+    feature_params: dict,
+    calendar: pd.DataFrame,
+    feature_cache: dict,
+    selected_features: list = None,
+):
+    """
+    Creates the same features as `create_features`, reusing the lag and rolling
+    features already cached for the same input column and only computing the new ones.
+
+    The cache is keyed by a fingerprint of every source column and of the index, then
+    by feature name, so a change to one column only recomputes the features of that
+    column. The returned cache update lists the requested features of every column,
+    with the new ones computed, and the cached features that are no longer requested
+    are pruned from the cache when it is saved.
+
+    When a list of selected features is given (the pruned features) and the
+    `use_pruned_features` parameter is on, only the features of that list are created.
+
+    Args:
+        df (pd.DataFrame): The processed data.
+        feature_params (dict): The feature engineering parameters.
+        calendar (pd.DataFrame): The calendar table.
+        feature_cache (dict): {fingerprint: {feature name: loader}} from the cache.
+        selected_features (list, optional): The features to keep, all of them if None.
+
+    Returns:
+        tuple: The featured data, the created feature names, and the cache update,
+            {fingerprint: {feature name: new values, or None for a cached feature}}.
+    """
+    logger = logging.getLogger(__name__)
+
+    column_names = feature_params["column_names"]
+    lags = feature_params["lags"]
+    window_sizes = feature_params["window_sizes"]
+    basic_features = feature_params["basic_features"]
+    statistics = feature_params.get("rolling_statistics", ["mean"])
+
+    lag_names, rolling_names = lag_and_rolling_names(
+        column_names, lags, window_sizes, statistics
+    )
+    feature_names = lag_names + rolling_names
+
+    use_pruned_features = feature_params.get("feature_selection", {}).get(
+        "use_pruned_features", False
+    )
+    if use_pruned_features and selected_features is not None:
+        selected = set(selected_features)
+        basic_features = [f for f in basic_features if f in selected]
+        feature_names = [name for name in feature_names if name in selected]
+        logger.info(
+            f"Creating the {len(basic_features) + len(feature_names)} pruned features."
+        )
+
+    df, group_positions = sort_panel(df)
+
+    # Add basic time series features to the DataFrame
+    add_basic_features(df, basic_features, calendar)
+
+    features_block = np.empty((len(df), len(feature_names)))
+    positions = {name: i for i, name in enumerate(feature_names)}
+    cache_update = {}
+    n_computed = 0
+    for column_name in column_names:
+        fingerprint = data_fingerprint(df[[column_name]])
+        cached = feature_cache.get(fingerprint, {})
+        entries = cache_update.setdefault(fingerprint, {})
+        values = df[[column_name]].to_numpy(dtype="float64")
+
+        # Compute only the features of this column that are not cached yet
+        missing_lags = [
+            lag
+            for lag in lags
+            if f"{column_name}_lag_{lag}" in positions
+            and f"{column_name}_lag_{lag}" not in cached
+        ]
+        if missing_lags:
+            computed = lag_features(values, missing_lags, group_positions)
+            for lag, column in zip(missing_lags, computed.T):
+                entries[f"{column_name}_lag_{lag}"] = np.ascontiguousarray(column)
+
+        for statistic in statistics:
+            missing_windows = [
+                window
+                for window in window_sizes
+                if rolling_feature_name(column_name, statistic, window) in positions
+                and rolling_feature_name(column_name, statistic, window) not in cached
+            ]
+            if not missing_windows:
+                continue
+            computed = rolling_features(
+                values,
+                missing_windows,
+                [statistic],
+                group_positions,
+                block_size=max(window_sizes),
+            )
+            for window, column in zip(missing_windows, computed.T):
+                name = rolling_feature_name(column_name, statistic, window)
+                entries[name] = np.ascontiguousarray(column)
+
+        column_lag_names, column_rolling_names = lag_and_rolling_names(
+            [column_name], lags, window_sizes, statistics
+        )
+        for name in column_lag_names + column_rolling_names:
+            if name not in positions:
+                continue
+            if entries.get(name) is None:
+                entries[name] = None
+                features_block[:, positions[name]] = cached[name]()
+            else:
+                n_computed += 1
+                features_block[:, positions[name]] = entries[name]
+
+    logger.info(
+        f"Feature cache: reused {len(feature_names) - n_computed} features, "
+        f"computed {n_computed}."
+    )
+
+    df = pd.concat(
+        [df, pd.DataFrame(features_block, index=df.index, columns=feature_names)],
+        axis=1,
+    )
+    return df, basic_features + feature_names, cache_update
+
+
+def add_basic_features(df: pd.DataFrame, basic_features: list, calendar: pd.DataFrame):
+    """
+    Adds basic time series features to a DataFrame, looking them up from the calendar table
+    when it has them and reading them from the index otherwise.
+    """
+    calendar_columns = [f for f in basic_features if f in calendar.columns]
+    calendar_features = lookup_calendar_features(df.index, calendar, calendar_columns)
+    for feature in basic_features:
+        if feature in calendar_features:
+            df[feature] = calendar_features[feature]
+        else:
+            df[feature] = getattr(time_index(df.index), feature)
+    return df
+
+
+def rolling_feature_name(column_name: str, statistic: str, window: int) -> str:
+    """
+    Returns the name of a rolling feature, e.g. 'temp_rolling_mean_7' or 'temp_ewm_7'.
+    """
+    if statistic == "ewm":
+        return f"{column_name}_ewm_{window}"
+    return f"{column_name}_rolling_{statistic}_{window}"
+
+
+def lag_and_rolling_names(
+    column_names: list, lags: list, window_sizes: list, statistics=("mean",)
+):
+    """
+    Returns the names of the lag features and of the rolling features, in the order
+    of the feature blocks.
+    """
+    lag_names = [f"{c}_lag_{lag}" for c in column_names for lag in lags]
+    rolling_names = [
+        rolling_feature_name(c, statistic, window)
+        for statistic in statistics
+        for c in column_names
+        for window in window_sizes
+    ]
+    return lag_names, rolling_names
+
+
+def sort_panel(df: pd.DataFrame):
+    """
+    Sorts panel data by (id, time) and returns it with the position of every row within
+    its id, or None for a single series.
+    """
+    if not isinstance(df.index, pd.MultiIndex):
+        return df, None
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    ids = df.index.codes[0]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    lengths = np.diff(np.r_[starts, len(ids)])
+    positions = np.arange(len(ids)) - np.repeat(starts, lengths)
+    return df, positions
+
+
+def _feature_block(out: np.ndarray, n_rows: int, n_columns: int, n_features: int):
+    """
+    Returns `out`, or a new array when it is None, of shape
+    (rows, columns * features), and a view of it of shape (rows, columns, features),
+    filled with missing values.
+    """
+    if out is None:
+        out = np.empty((n_rows, n_columns * n_features))
+    block = out.reshape(n_rows, n_columns, n_features)
+    if not np.may_share_memory(block, out):
+        raise ValueError("The output columns cannot be viewed by column and feature.")
+    block[...] = np.nan
+    return out, block
+
+
+def lag_features(
+    values: np.ndarray,
+    lags: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the lags of every column of a 2-D array at once, by copying offset views of the
+    array into one preallocated block.
+
+    For panel data sorted by (id, time), the lags reaching back before the first row of
+    their id are left missing, so all the ids are handled in the same pass.
+
+    Args:
+        values (np.ndarray): Array of shape (rows, columns).
+        lags (list): The lags, in rows.
+        group_positions (np.ndarray, optional): Position of every row within its id.
+        out (np.ndarray, optional): The array to write the lags into, e.g. columns of a
+            larger feature block. A new one is allocated when omitted.
+
+    Returns:
+        np.ndarray: Array of shape (rows, columns * len(lags)), holding the lags of the
+            first column, then those of the second column, and so on.
+    """
+    n_rows, n_columns = values.shape
+    out, block = _feature_block(out, n_rows, n_columns, len(lags))
+    for position, lag in enumerate(lags):
+        if lag < n_rows:
+            block[lag:, :, position] = values[: n_rows - lag]
+        if group_positions is not None:
+            block[group_positions < lag, :, position] = np.nan
+    return out
+
+
+def _cumulative_sums(values: np.ndarray, group_positions: np.ndarray = None):
+    """
+    Returns the cumulative sums of every column of a 2-D array without missing values,
+    with a leading row of zeros, so rows [a, b) sum to sums[b] - sums[a]. In panel mode
+    they restart at the first row of every id, as those of the online feature state do.
+    """
+    n_rows, n_columns = values.shape
+    sums = np.zeros((n_rows + 1, n_columns))
+    if group_positions is None:
+        np.cumsum(values, axis=0, out=sums[1:])
+    else:
+        starts = np.flatnonzero(group_positions == 0)
+        for start, end in zip(starts, np.r_[starts[1:], n_rows]):
+            np.cumsum(values[start:end], axis=0, out=sums[start + 1 : end + 1])
+    return sums
+
+
+def _window_sums(
+    sums: np.ndarray, window: int, group_positions: np.ndarray = None
+) -> np.ndarray:
+    """
+    Returns the sums of rows [t - window, t) for every row t >= window, from the
+    cumulative sums of `_cumulative_sums`. A window starting at the first row of an id
+    is the cumulative sum at its end.
+    """
+    n_rows = len(sums) - 1
+    start_sums = sums[: n_rows - window]
+    if group_positions is not None:
+        start_sums = np.where(
+            group_positions[: n_rows - window, None] == 0, 0.0, start_sums
+        )
+    return sums[window:n_rows] - start_sums
+
+
+def _missing_counts(missing: np.ndarray) -> np.ndarray:
+    """
+    Returns the cumulative counts of missing values of every column, with a leading row
+    of zeros.
+    """
+    missing_count = np.zeros((missing.shape[0] + 1, missing.shape[1]), dtype=np.int64)
+    np.cumsum(missing, axis=0, out=missing_count[1:])
+    return missing_count
+
+
+def rolling_mean_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the rolling means of the previous `window` rows of every column of a 2-D array,
+    as `shift(1).rolling(window).mean()` would, from cumulative sums shared by all windows.
+
+    A window holding a missing value gives a missing mean. For panel data sorted by
+    (id, time), windows reaching back before the first row of their id are left missing.
+
+    Args:
+        values (np.ndarray): Array of shape (rows, columns).
+        window_sizes (list): The window sizes, in rows.
+        group_positions (np.ndarray, optional): Position of every row within its id.
+        out (np.ndarray, optional): The array to write the means into, as in
+            `lag_features`.
+
+    Returns:
+        np.ndarray: Array of shape (rows, columns * len(window_sizes)), holding the
+            rolling means of the first column, then those of the second column, and so on.
+    """
+    n_rows, n_columns = values.shape
+    missing = np.isnan(values)
+    sums = _cumulative_sums(np.where(missing, 0.0, values), group_positions)
+    missing_count = _missing_counts(missing)
+
+    out, block = _feature_block(out, n_rows, n_columns, len(window_sizes))
+    for position, window in enumerate(window_sizes):
+        if window >= n_rows:
+            continue
+        # The mean at row t covers rows [t - window, t)
+        window_sum = _window_sums(sums, window, group_positions)
+        window_missing = missing_count[window:n_rows] - missing_count[: n_rows - window]
+        block[window:, :, position] = np.where(
+            window_missing == 0, window_sum / window, np.nan
+        )
+        if group_positions is not None:
+            block[group_positions < window, :, position] = np.nan
+    return out
+
+
+def _window_reductions(values: np.ndarray, window_sizes: list, reduce: np.ufunc):
+    """
+    Reduces (minimums or maximums) every window of consecutive rows of a 2-D array
+    without missing values, for all the window sizes in one sweep of doubling spans:
+    each pass reduces the spans of the previous one two by two, so after k passes the
+    reductions of every span of 2**k rows are known, and a window of w rows is the
+    reduction of the two, overlapping, spans of the largest 2**k <= w rows at its ends.
+    The passes go up to the largest window only, whatever the number of windows, and
+    only the last one is kept.
+
+    Yields:
+        tuple: Every window size shorter than the rows, in increasing order, and the
+            reduction of rows [s, s + window) for every start s, in
+            (rows - window, columns).
+    """
+    n_rows = len(values)
+    spans, span = values, 1
+    for window in sorted(set(window_sizes)):
+        if window >= n_rows:
+            break
+        while 2 * span <= window:
+            spans = reduce(spans[:-span], spans[span:])
+            span *= 2
+        n_windows = n_rows - window
+        yield window, reduce(
+            spans[:n_windows], spans[window - span : window - span + n_windows]
+        )
+
+
+def series_centers(
+    values: np.ndarray, group_positions: np.ndarray = None
+) -> np.ndarray:
+    """
+    Returns the first observed value of every column of a 2-D array, within the id of
+    every row in panel mode, as an array of shape (rows, columns). Missing until a
+    value is observed.
+    """
+    n_rows, n_columns = values.shape
+    ids = np.zeros(n_rows, dtype=np.int64)
+    if group_positions is not None:
+        ids = np.cumsum(group_positions == 0) - 1
+    firsts = pd.DataFrame(values).groupby(ids).first().to_numpy()
+    return firsts.reshape(-1, n_columns)[ids]
+
+
+def block_prefix_sums(
+    values: np.ndarray, window: int, group_positions: np.ndarray = None
+) -> np.ndarray:
+    """
+    Returns the running sums of every column of a 2-D array within blocks of `window`
+    rows, restarting every `window` rows of every series (of every id in panel mode), as
+    the online feature state accumulates them row by row.
+    """
+    n_rows, n_columns = values.shape
+    if group_positions is None:
+        padded_rows = np.arange(n_rows)
+        n_padded = -(-n_rows // window) * window
+    else:
+        # Pad every id to whole blocks, so its blocks start at its first row
+        starts = np.flatnonzero(group_positions == 0)
+        lengths = np.diff(np.r_[starts, n_rows])
+        padded_lengths = -(-lengths // window) * window
+        padded_starts = np.cumsum(padded_lengths) - padded_lengths
+        padded_rows = np.repeat(padded_starts, lengths) + group_positions
+        n_padded = padded_lengths.sum()
+    padded = np.zeros((n_padded, n_columns))
+    padded[padded_rows] = values
+    sums = np.cumsum(padded.reshape(-1, window, n_columns), axis=1)
+    return sums.reshape(-1, n_columns)[padded_rows]
+
+
+def window_std(
+    sums: tuple,
+    squares: tuple,
+    starts_block: np.ndarray,
+    split: np.ndarray,
+    window,
+) -> np.ndarray:
+    """
+    Returns the standard deviations (ddof=1) of windows of `window` centered values, for
+    both the batch and the online features.
+
+    The running sums restart every block of rows at least as long as the largest window
+    (see `block_prefix_sums`), so a window lies within one block, or is `split` between
+    the tail of one block and the head of the next. `sums` and `squares` hold the
+    running sums of the values and of their squares at the last row of the window, at
+    the end of its first block and before its first row, unless the window
+    `starts_block`. Their rounding errors are within a few ulps of the sums of squares
+    of the blocks, so variances within that error of zero, e.g. for windows of equal
+    values, are set to exactly zero.
+    """
+
+    def window_sums(last, block_end, before):
+        before = np.where(starts_block, 0.0, before)
+        return np.where(split, (block_end - before) + last, last - before)
+
+    window_sum = window_sums(*sums)
+    window_squares = window_sums(*squares)
+    scale = squares[0] + np.where(split, squares[1], 0.0)
+    variance = (window_squares - window_sum**2 / window) / (window - 1)
+    rounding_error = 8 * window * np.finfo(float).eps * scale / (window - 1)
+    return np.sqrt(np.where(variance > rounding_error, variance, 0.0))
+
+
+def rolling_std_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+    block_size: int = None,
+) -> np.ndarray:
+    """
+    Builds the rolling standard deviations (ddof=1) of the previous `window` rows of every
+    column of a 2-D array, from running sums and sums of squares restarting every
+    `block_size` rows, the largest window by default, as the online feature state keeps
+    them (see `window_std`). The running sums are computed in one sweep for all the
+    windows, and their rounding errors depend on the values of two blocks, not on the
+    length of the history.
+
+    Every series is centered on its first observed value, so the sums of squares grow
+    with the spread of the series around its level rather than with the level itself.
+    The layout and missing values follow `rolling_mean_features`.
+    """
+    n_rows, n_columns = values.shape
+    missing = np.isnan(values)
+    centered = np.where(missing, 0.0, values - series_centers(values, group_positions))
+    positions = np.arange(n_rows) if group_positions is None else group_positions
+    has_missing = missing.any()
+    missing_count = _missing_counts(missing)
+    block_size = block_size or max(window_sizes, default=1)
+    sums = block_prefix_sums(centered, block_size, group_positions)
+    squares = block_prefix_sums(centered**2, block_size, group_positions)
+
+    out, block = _feature_block(out, n_rows, n_columns, len(window_sizes))
+    for position, window in enumerate(window_sizes):
+        if window >= n_rows or window < 2:
+            continue
+        # The window of row t covers rows [t - window, t)
+        last = np.arange(window - 1, n_rows - 1)
+        first = last - window + 1
+        offset = positions[first] % block_size
+        block_end = np.minimum(first - offset + block_size - 1, n_rows - 1)
+        rows = (last, block_end, np.maximum(first - 1, 0))
+        std = window_std(
+            tuple(sums[r] for r in rows),
+            tuple(squares[r] for r in rows),
+            (offset == 0)[:, None],
+            (positions[first] // block_size != positions[last] // block_size)[
+                :, None
+            ],
+            window,
+        )
+        if has_missing:
+            window_missing = (
+                missing_count[window:n_rows] - missing_count[: n_rows - window]
+            )
+            std[window_missing > 0] = np.nan
+        block[window:, :, position] = std
+        if group_positions is not None:
+            block[group_positions < window, :, position] = np.nan
+    return out
+
+
+def _rolling_extremum_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray,
+    reduce: np.ufunc,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the rolling minimums or maximums of the previous `window` rows of every column,
+    for all the windows in one sweep (see `_window_reductions`). The online features
+    compute them the same way, on the tail of the history.
+    """
+    n_rows, n_columns = values.shape
+    missing = np.isnan(values)
+    filled = np.where(missing, np.inf if reduce is np.minimum else -np.inf, values)
+    has_missing = missing.any()
+    missing_count = _missing_counts(missing)
+
+    out, block = _feature_block(out, n_rows, n_columns, len(window_sizes))
+    for window, extremums in _window_reductions(filled, window_sizes, reduce):
+        # The window of row t covers rows [t - window, t)
+        if has_missing:
+            window_missing = (
+                missing_count[window:n_rows] - missing_count[: n_rows - window]
+            )
+            extremums[window_missing > 0] = np.nan
+        for position in np.flatnonzero(np.asarray(window_sizes) == window):
+            block[window:, :, position] = extremums
+            if group_positions is not None:
+                block[group_positions < window, :, position] = np.nan
+    return out
+
+
+def rolling_min_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the rolling minimums of the previous `window` rows of every column of a 2-D
+    array. The layout and missing values follow `rolling_mean_features`.
+    """
+    return _rolling_extremum_features(
+        values, window_sizes, group_positions, np.minimum, out
+    )
+
+
+def rolling_max_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the rolling maximums of the previous `window` rows of every column of a 2-D
+    array. The layout and missing values follow `rolling_mean_features`.
+    """
+    return _rolling_extremum_features(
+        values, window_sizes, group_positions, np.maximum, out
+    )
+
+
+def ewm_values(
+    values: np.ndarray, window: int, group_positions: np.ndarray = None
+) -> np.ndarray:
+    """
+    Computes the exponentially weighted means of every column up to and including each
+    row, with a span of `window` rows, by the recursion e = (1 - a) * e + a * x.
+    Missing values are skipped, and in panel mode the recursion restarts at each id.
+    """
+    frame = pd.DataFrame(values)
+    ewm_args = dict(span=window, adjust=False, ignore_na=True)
+    if group_positions is None:
+        return frame.ewm(**ewm_args).mean().to_numpy()
+    ids = np.cumsum(group_positions == 0)
+    return frame.groupby(ids).ewm(**ewm_args).mean().to_numpy()
+
+
+def ewm_features(
+    values: np.ndarray,
+    window_sizes: list,
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Builds the exponentially weighted means of the previous rows of every column of a 2-D
+    array, with a span of `window` rows for every window size. A mean is missing until
+    `window` values have been observed.
+
+    Returns:
+        np.ndarray: Array of shape (rows, columns * len(window_sizes)), laid out as in
+            `rolling_mean_features`.
+    """
+    n_rows, n_columns = values.shape
+    positions = np.arange(n_rows) if group_positions is None else group_positions
+
+    # Number of values observed up to each row, within its id
+    missing = np.isnan(values)
+    observed = None
+    if missing.any():
+        observed = np.cumsum(~missing, axis=0)
+        starts = np.arange(n_rows) - positions
+        observed = observed - np.where(starts[:, None] > 0, observed[starts - 1], 0)
+
+    out, block = _feature_block(out, n_rows, n_columns, len(window_sizes))
+    for position, window in enumerate(window_sizes):
+        ewm = ewm_values(values, window, group_positions)
+        if observed is None:
+            ewm[positions + 1 < window] = np.nan
+        else:
+            ewm[observed < window] = np.nan
+        block[1:, :, position] = ewm[:-1]
+        if group_positions is not None:
+            block[group_positions < 1, :, position] = np.nan
+    return out
+
+
+# Version of the layout of the online feature state, states of other versions are
+# rebuilt
+FEATURE_STATE_VERSION = 2
+
+ROLLING_FEATURES = {
+    "mean": rolling_mean_features,
+    "std": rolling_std_features,
+    "min": rolling_min_features,
+    "max": rolling_max_features,
+    "ewm": ewm_features,
+}
+
+
+def rolling_features(
+    values: np.ndarray,
+    window_sizes: list,
+    statistics=("mean",),
+    group_positions: np.ndarray = None,
+    out: np.ndarray = None,
+    block_size: int = None,
+) -> np.ndarray:
+    """
+    Builds the rolling statistics of every column of a 2-D array, one block per
+    statistic, in the order of `lag_and_rolling_names`. Every statistic is written
+    straight into its columns of `out`, allocated when omitted. `block_size` sets the
+    blocks of the running sums of the std (see `rolling_std_features`), e.g. to compute
+    some of the windows as they are computed with all of them.
+    """
+    unknown = set(statistics) - set(ROLLING_FEATURES)
+    if unknown:
+        raise ValueError(
+            f"Unknown rolling statistics {sorted(unknown)}, "
+            f"expected some of {list(ROLLING_FEATURES)}."
+        )
+    n_rows, n_columns = values.shape
+    width = n_columns * len(window_sizes)
+    if out is None:
+        out = np.empty((n_rows, width * len(statistics)))
+    for position, statistic in enumerate(statistics):
+        block_args = {"block_size": block_size} if statistic == "std" else {}
+        ROLLING_FEATURES[statistic](
+            values,
+            window_sizes,
+            group_positions,
+            out=out[:, position * width : (position + 1) * width],
+            **block_args,
+        )
+    return out
+
+
+def build_feature_state(df: pd.DataFrame, feature_params: dict) -> dict:
+    """
+    Builds the online feature state from the processed history, so features of new days
+    can be computed without recomputing the whole history.
+
+    The state keeps, in ring buffers covering the largest lag or window (plus
+    'max_rewind' rows that may be replaced later), the timestamps, values, cumulative sums
+    and cumulative missing counts of the feature columns. The cumulative sums are
+    accumulated in the same order as in `rolling_mean_features`, so online features
+    match the batch ones exactly. With the 'std' rolling statistic, it also keeps the
+    running sums and sums of squares of the centered values, in blocks of the largest
+    window, as `rolling_std_features` computes them, and with 'ewm' the exponentially
+    weighted means of every window. The rolling 'min' and 'max' are computed from the
+    values of the ring buffer, as in batch.
+
+    Panel data, with an (id, time) index, gets one state per id under the 'panel' key.
+
+    Args:
+        df (pd.DataFrame): The processed history, with a DatetimeIndex.
+        feature_params (dict): The feature engineering parameters.
+
+    Returns:
+        dict: The feature state.
+    """
+    if isinstance(df.index, pd.MultiIndex):
+        return {
+            "panel": {
+                series_id: build_feature_state(series.droplevel(0), feature_params)
+                for series_id, series in df.groupby(level=0)
+            },
+            "id_name": df.index.names[0],
+        }
+
+    column_names = feature_params["column_names"]
+    lags = feature_params["lags"]
+    window_sizes = feature_params["window_sizes"]
+    statistics = feature_params.get("rolling_statistics", ["mean"])
+    max_rewind = feature_params.get("online_state", {}).get("max_rewind", 7)
+    capacity = max(lags + window_sizes) + 1 + max_rewind
+
+    values = df[column_names].to_numpy(dtype="float64")
+    missing = np.isnan(values)
+    cumsum = np.cumsum(np.where(missing, 0.0, values), axis=0)
+    missing_count = np.cumsum(missing, axis=0)
+
+    # Keep the tail of the history, laid out at its ring buffer positions
+    n_rows = len(df)
+    rows = np.arange(max(n_rows - capacity, 0), n_rows)
+    state = {
+        "version": FEATURE_STATE_VERSION,
+        "column_names": list(column_names),
+        "lags": list(lags),
+        "window_sizes": list(window_sizes),
+        "rolling_statistics": list(statistics),
+        "capacity": capacity,
+        "max_rewind": max_rewind,
+        "n_rows": n_rows,
+        "timestamps": np.full(capacity, np.datetime64("NaT"), dtype="datetime64[ns]"),
+        "values": np.full((capacity, len(column_names)), np.nan),
+        "cumsum": np.zeros((capacity, len(column_names))),
+        "missing_count": np.zeros((capacity, len(column_names)), dtype=np.int64),
+    }
+    positions = rows % capacity
+    state["timestamps"][positions] = df.index.to_numpy(dtype="datetime64[ns]")[rows]
+    state["values"][positions] = values[rows]
+    state["cumsum"][positions] = cumsum[rows]
+    state["missing_count"][positions] = missing_count[rows]
+    if "std" in statistics:
+        # Centered on the first observed value of every column, as in batch
+        observed = ~missing
+        first = np.full(len(column_names), -1)
+        if len(values):
+            first = np.where(observed.any(axis=0), observed.argmax(axis=0), -1)
+        state["center"] = np.full(len(column_names), np.nan)
+        has_center = np.flatnonzero(first >= 0)
+        state["center"][has_center] = values[first[has_center], has_center]
+        state["center_row"] = first
+        centered = np.where(missing, 0.0, values - state["center"])
+        block_size = max(window_sizes)
+        state["sum"] = np.zeros((capacity, len(column_names)))
+        state["squares"] = np.zeros((capacity, len(column_names)))
+        state["sum"][positions] = block_prefix_sums(centered, block_size)[rows]
+        state["squares"][positions] = block_prefix_sums(centered**2, block_size)[rows]
+    if "ewm" in statistics:
+        state["ewm"] = np.full((capacity, len(window_sizes), len(column_names)), np.nan)
+        for k, window in enumerate(window_sizes):
+            state["ewm"][positions, k] = ewm_values(values, window)[rows]
+    return state
+
+
+def _ewm_alphas(window_sizes: np.ndarray) -> np.ndarray:
+    """
+    Returns the smoothing factor of every span, computed as pandas does.
+    """
+    com = (window_sizes - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+def _rewind_feature_state(state: dict, first_timestamp: np.datetime64) -> dict:
+    """
+    Forgets the rows of the state at or after a timestamp, so they can be replaced.
+    """
+    n_rows, capacity = state["n_rows"], state["capacity"]
+    rows = np.arange(max(n_rows - capacity, 0), n_rows)
+    n_replaced = int((state["timestamps"][rows % capacity] >= first_timestamp).sum())
+    if n_replaced > state["max_rewind"]:
+        raise ValueError(
+            f"Cannot replace {n_replaced} rows already in the feature state, "
+            f"at most {state['max_rewind']} can be replaced."
+        )
+    state["n_rows"] = n_rows - n_replaced
+    if n_replaced and "center" in state:
+        # Centers observed in the replaced rows are observed again, maybe differently
+        replaced = state["center_row"] >= state["n_rows"]
+        state["center"] = np.where(replaced, np.nan, state["center"])
+        state["center_row"] = np.where(replaced, -1, state["center_row"])
+    return state
+
+
+def update_feature_state(
+    state: dict, new_rows: pd.DataFrame, feature_params: dict, calendar: pd.DataFrame
+):
+    """
+    Computes the features of new processed rows from the online feature state, in constant
+    time per row and feature whatever the window sizes, and returns the updated state.
+    The rolling minimums and maximums are computed as in batch, on the new rows and the
+    largest window of rows before them, so they take time proportional to that window,
+    not to the history. The features are equal to those `create_features` computes on
+    the whole history.
+
+    Rows at or before the last row of the state (e.g. a day that was only partially
+    recorded) replace the rows they overlap.
+
+    Args:
+        state (dict): The feature state from `build_feature_state`.
+        new_rows (pd.DataFrame): The new processed rows, with a DatetimeIndex.
+        feature_params (dict): The feature engineering parameters.
+        calendar (pd.DataFrame): The calendar table.
+
+    Returns:
+        tuple: The featured new rows, the created feature names and the updated state.
+    """
+    if "panel" in state:
+        return _update_panel_feature_state(state, new_rows, feature_params, calendar)
+
+    column_names = state["column_names"]
+    lags = np.asarray(state["lags"])
+    window_sizes = np.asarray(state["window_sizes"])
+    statistics = state.get("rolling_statistics", ["mean"])
+    if [column_names, list(lags), list(window_sizes), statistics] != [
+        feature_params["column_names"],
+        feature_params["lags"],
+        feature_params["window_sizes"],
+        feature_params.get("rolling_statistics", ["mean"]),
+    ]:
+        raise ValueError(
+            "The feature state was built with other feature parameters, rebuild it."
+        )
+    if state.get("version") != FEATURE_STATE_VERSION:
+        raise ValueError(
+            "The feature state was built by an older version of the pipeline, "
+            "rebuild it."
+        )
+
+    capacity = state["capacity"]
+    block_size = max(window_sizes)
+
+    # Work on a copy, so the loaded state is left untouched
+    state = {
+        key: value.copy() if isinstance(value, np.ndarray) else value
+        for key, value in state.items()
+    }
+    new_rows = new_rows.sort_index()
+    state = _rewind_feature_state(state, new_rows.index[0].to_datetime64())
+    # The rows before the new ones that their rolling minimums and maximums cover
+    first_row = state["n_rows"]
+    previous_rows = np.arange(max(first_row - max(window_sizes), 0), first_row)
+    previous_values = state["values"][previous_rows % capacity]
+
+    n_columns = len(column_names)
+    values = new_rows[column_names].to_numpy(dtype="float64")
+    # The lag and rolling features are written into views of one preallocated block
+    n_new = len(new_rows)
+    width = n_columns * len(window_sizes)
+    block = np.empty((n_new, n_columns * len(lags) + width * len(statistics)))
+    _, lag_block = _feature_block(
+        block[:, : n_columns * len(lags)], n_new, n_columns, len(lags)
+    )
+    rolling_blocks = {}
+    for position, statistic in enumerate(statistics):
+        start = n_columns * len(lags) + position * width
+        _, rolling_blocks[statistic] = _feature_block(
+            block[:, start : start + width], n_new, n_columns, len(window_sizes)
+        )
+    alphas = _ewm_alphas(window_sizes)[:, None]
+
+    for i, row_values in enumerate(values):
+        row = state["n_rows"]
+
+        # Lags come straight from the ring buffer of values
+        has_lag = lags <= row
+        lag_block[i][:, has_lag] = state["values"][(row - lags[has_lag]) % capacity].T
+
+        # Rolling means and std over rows [row - window, row), from cumulative sums
+        has_window = window_sizes <= row
+        if row > 0 and has_window.any():
+            end = (row - 1) % capacity
+            starts = row - window_sizes[has_window] - 1
+
+            def window_sums(sums):
+                start_sums = np.where(starts[:, None] >= 0, sums[starts % capacity], 0)
+                return sums[end] - start_sums
+
+            window_sum = window_sums(state["cumsum"])
+            window_missing = window_sums(state["missing_count"])
+            if "mean" in rolling_blocks:
+                rolling_blocks["mean"][i][:, has_window] = np.where(
+                    window_missing == 0,
+                    window_sum / window_sizes[has_window][:, None],
+                    np.nan,
+                ).T
+            if "std" in rolling_blocks:
+                windows = window_sizes[has_window]
+                first = row - windows
+                offset = first % block_size
+                rows = (
+                    np.full(len(windows), end),
+                    (first - offset + block_size - 1) % capacity,
+                    (first - 1) % capacity,
+                )
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    std = window_std(
+                        tuple(state["sum"][r] for r in rows),
+                        tuple(state["squares"][r] for r in rows),
+                        (offset == 0)[:, None],
+                        (first // block_size != (row - 1) // block_size)[:, None],
+                        windows[:, None],
+                    )
+                rolling_blocks["std"][i][:, has_window] = np.where(
+                    (window_missing == 0) & (windows[:, None] >= 2), std, np.nan
+                ).T
+
+
+        # Exponentially weighted means up to the previous row, once `window` values
+        # have been observed
+        if "ewm" in rolling_blocks and row > 0:
+            previous_ewm = state["ewm"][(row - 1) % capacity]
+            observed = row - state["missing_count"][(row - 1) % capacity]
+            rolling_blocks["ewm"][i] = np.where(
+                observed >= window_sizes[:, None], previous_ewm, np.nan
+            ).T
+
+        # Push the new row into the ring buffers
+        missing = np.isnan(row_values)
+        previous = (row - 1) % capacity
+        position = row % capacity
+        previous_cumsum = state["cumsum"][previous] if row > 0 else 0.0
+        previous_missing = state["missing_count"][previous] if row > 0 else 0
+        state["cumsum"][position] = previous_cumsum + np.where(
+            missing, 0.0, row_values
+        )
+        state["missing_count"][position] = previous_missing + missing
+        if "center" in state:
+            new_center = np.isnan(state["center"]) & ~missing
+            state["center"] = np.where(new_center, row_values, state["center"])
+            state["center_row"] = np.where(new_center, row, state["center_row"])
+            centered = np.where(missing, 0.0, row_values - state["center"])
+            # The running sums restart at every block of `block_size` rows
+            block_start = row % block_size == 0
+            state["sum"][position] = (
+                0.0 if block_start else state["sum"][previous]
+            ) + centered
+            state["squares"][position] = (
+                0.0 if block_start else state["squares"][previous]
+            ) + centered**2
+        state["values"][position] = row_values
+        if "ewm" in state:
+            # Same recursion as pandas' ewm(adjust=False, ignore_na=True)
+            previous_ewm = (
+                state["ewm"][previous] if row > 0 else np.full(alphas.shape, np.nan)
+            )
+            updated = ((1.0 - alphas) * previous_ewm + alphas * row_values) / (
+                (1.0 - alphas) + alphas
+            )
+            state["ewm"][position] = np.where(
+                missing,
+                previous_ewm,
+                np.where(
+                    np.isnan(previous_ewm),
+                    row_values,
+                    np.where(previous_ewm != row_values, updated, previous_ewm),
+                ),
+            )
+        state["timestamps"][position] = new_rows.index[i].to_datetime64()
+        state["n_rows"] = row + 1
+
+    # Rolling min and max of the new rows, from the rows before them, as in batch
+    extremums = [s for s in statistics if s in ("min", "max")]
+    if extremums:
+        recent = np.concatenate([previous_values, values])
+        for statistic in extremums:
+            recent_block = ROLLING_FEATURES[statistic](recent, list(window_sizes))
+            rolling_blocks[statistic][...] = recent_block[
+                len(previous_values) :
+            ].reshape(n_new, n_columns, len(window_sizes))
+
+    # Assemble the feature rows as create_features does
+    basic_features = feature_params["basic_features"]
+    df = add_basic_features(new_rows.copy(), basic_features, calendar)
+    lag_names, rolling_names = lag_and_rolling_names(
+        column_names, list(lags), list(window_sizes), statistics
+    )
+    features_block = pd.DataFrame(
+        block, index=df.index, columns=lag_names + rolling_names, copy=False
+    )
+    df = pd.concat([df, features_block], axis=1)
+    return df, basic_features + lag_names + rolling_names, state
+
+
+def _update_panel_feature_state(
+    state: dict, new_rows: pd.DataFrame, feature_params: dict, calendar: pd.DataFrame
+):
+    """
+    Updates the state of every id found in the new panel rows, starting from an empty
+    state for new ids.
+    """
+    panel = dict(state["panel"])
+    featured = {}
+    for series_id, series in new_rows.groupby(level=0):
+        series = series.droplevel(0)
+        series_state = panel.get(series_id)
+        if series_state is None:
+            series_state = build_feature_state(series.iloc[:0], feature_params)
+        featured[series_id], created_features, panel[series_id] = update_feature_state(
+            series_state, series, feature_params, calendar
+        )
+
+    df = pd.concat(featured, names=[state["id_name"], None])
+    return df, created_features, {"panel": panel, "id_name": state["id_name"]}
@@ -1,27 +1,88 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import create_features
+from .nodes import build_feature_state, create_features_with_cache, update_feature_state
 
 
 def create_pipeline(**kwargs) -> Pipeline:
     return pipeline(
         [
             node(
-                func=create_features,
+                func=create_features_with_cache,
                 inputs=[
                     "processed_weather_and_consumption_data",
                     "params:feature_engineering",
+                    "calendar_features",
+                    "feature_cache",
+                    "selected_features",
                 ],
                 outputs=[
                     "featured_data",
                     "created_features",
+                    "feature_cache_update",
                 ],
                 name="create_features_node",
                 tags=["feature_creation"],
             ),
+            node(
+                func=build_feature_state,
+                inputs=[
+                    "processed_weather_and_consumption_data",
+                    "params:feature_engineering",
+                ],
+                outputs="feature_state",
+                name="build_feature_state_node",
+                tags=["feature_creation", "online"],
+            ),
         ],
         tags="feature_engineering_pipeline",
         namespace="feature_engineering_pipeline",
-        inputs=["processed_weather_and_consumption_data"],
-        outputs=["featured_data", "created_features"],
+        inputs=[
+            "processed_weather_and_consumption_data",
+            "calendar_features",
+            "feature_cache",
+            "selected_features",
+        ],
+        outputs=[
+            "featured_data",
+            "created_features",
+            "feature_state",
+            "feature_cache_update",
+        ],
+    )
+
+
+def create_online_pipeline(**kwargs) -> Pipeline:
+    """
+    Computes the features of the newly processed days from the saved feature state,
+    without recomputing the history. Run it with
+    `kedro run --pipeline=feature_engineering_online_pipeline` after the incremental
+    data processing pipeline.
+    """
+    return pipeline(
+        [
+            node(
+                func=update_feature_state,
+                inputs=[
+                    "previous_feature_state",
+                    "new_processed_weather_and_consumption_data",
+                    "params:feature_engineering",
+                    "calendar_features",
+                ],
+                outputs=[
+                    "online_featured_data",
+                    "online_created_features",
+                    "feature_state",
+                ],
+                name="update_feature_state_node",
+                tags=["feature_creation", "online"],
+            ),
+        ],
+        tags=["feature_engineering_pipeline", "online"],
+        namespace="feature_engineering_pipeline",
+        inputs=[
+            "previous_feature_state",
+            "new_processed_weather_and_consumption_data",
+            "calendar_features",
+        ],
+        outputs=["online_featured_data", "feature_state"],
     )
@@ -0,0 +1,10 @@
+"""
+This is a pipeline 'feature_pruning_pipeline'
+keeping the features that cover most of the importance of the trained models
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,131 @@
+import logging
+import time
+import numpy as np
+import pandas as pd
+
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+
+
+# Node 1
+def collect_feature_importances(X_train: pd.DataFrame, **models) -> pd.DataFrame:
+    """
+    Gathers the feature importances of the trained models into one table.
+
+    The importances of every model are normalised to sum to one, since each library uses
+    its own scale (gain, split counts, percentages), and averaged across the models.
+
+    Args:
+        X_train (pd.DataFrame): The training features the models were trained on.
+        **models: The trained models, by name, exposing `feature_importances_`.
+
+    Returns:
+        pd.DataFrame: One row per feature, sorted by decreasing mean importance, with the
+            importance of each model, the mean importance and its cumulative share.
+    """
+    importances = pd.DataFrame(index=pd.Index(X_train.columns, name="feature"))
+    for name, model in models.items():
+        # A CatBoost model loaded from its model file computes its importances on demand
+        if hasattr(model, "get_feature_importance"):
+            model_importances = model.get_feature_importance()
+        else:
+            model_importances = model.feature_importances_
+        model_importances = np.asarray(model_importances, dtype="float64")
+        total = model_importances.sum()
+        importances[name] = model_importances / total if total > 0 else 0.0
+
+    importances["mean_importance"] = importances[list(models)].mean(axis=1)
+    importances = importances.sort_values("mean_importance", ascending=False)
+    importances["cumulative_importance"] = importances["mean_importance"].cumsum()
+    return importances
+
+
+# Node 2
+def select_pruned_features(importances: pd.DataFrame, params: dict) -> list:
+    """
+    Keeps the most important features until they cover the configured share of the
+    cumulative importance, and at least the configured minimum number of features.
+
+    Args:
+        importances (pd.DataFrame): The table from `collect_feature_importances`.
+        params (dict): The pruning parameters (`cumulative_importance`, `min_features`).
+
+    Returns:
+        list: The kept feature names, by decreasing importance.
+    """
+    logger = logging.getLogger(__name__)
+
+    share = params["cumulative_importance"]
+    cumulative = importances["cumulative_importance"].to_numpy()
+    n_kept = int(np.searchsorted(cumulative, share, side="left")) + 1
+    n_kept = min(max(n_kept, params.get("min_features", 1)), len(importances))
+
+    pruned_features = importances.index[:n_kept].tolist()
+    logger.info(
+        f"Kept {n_kept} of {len(importances)} features, covering "
+        f"{cumulative[n_kept - 1]:.1%} of the importance."
+    )
+    return pruned_features
+
+
+# Node 3
+def evaluate_feature_pruning(
+    X_train: pd.DataFrame,
+    y_train: pd.DataFrame,
+    X_test: pd.DataFrame,
+    y_test: pd.DataFrame,
+    pruned_features: list,
+    **models,
+) -> pd.DataFrame:
+    """
+    Refits every model with its own parameters on the pruned features only, and compares
+    its test RMSE and timings with those of the model trained on all the features.
+
+    Returns:
+        pd.DataFrame: One row per model with the number of features, the test RMSE and the
+            prediction time before and after pruning, and the fit time after pruning.
+    """
+    logger = logging.getLogger(__name__)
+
+    X_train_clean = X_train.dropna()
+    y_train_clean = y_train.loc[X_train_clean.index].squeeze()
+    X_train_pruned = X_train_clean[pruned_features]
+    X_test_pruned = X_test[pruned_features]
+
+    rows = []
+    for name, model in models.items():
+        start = time.perf_counter()
+        predictions = model.predict(X_test)
+        predict_seconds = time.perf_counter() - start
+
+        logger.info(f"Refitting {name} on {len(pruned_features)} pruned features...")
+        pruned_model = clone(model)
+        start = time.perf_counter()
+        pruned_model.fit(X_train_pruned, y_train_clean)
+        pruned_fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pruned_predictions = pruned_model.predict(X_test_pruned)
+        pruned_predict_seconds = time.perf_counter() - start
+
+        rmse = np.sqrt(mean_squared_error(y_test, predictions))
+        pruned_rmse = np.sqrt(mean_squared_error(y_test, pruned_predictions))
+        rows.append(
+            {
+                "model": name,
+                "features": X_train.shape[1],
+                "pruned_features": len(pruned_features),
+                "rmse": rmse,
+                "pruned_rmse": pruned_rmse,
+                "rmse_change_pct": 100 * (pruned_rmse - rmse) / rmse,
+                "predict_seconds": predict_seconds,
+                "pruned_predict_seconds": pruned_predict_seconds,
+                "pruned_fit_seconds": pruned_fit_seconds,
+            }
+        )
+        logger.info(
+            f"{name}: RMSE {rmse:.2f} with {X_train.shape[1]} features, "
+            f"{pruned_rmse:.2f} with {len(pruned_features)} pruned features."
+        )
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,53 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import (
+    collect_feature_importances,
+    evaluate_feature_pruning,
+    select_pruned_features,
+)
+
+MODELS = {
+    "xgboost": "xgboost_model",
+    "lightgbm": "lightgbm_model",
+    "catboost": "catboost_model",
+    "random_forest": "random_forest_model",
+}
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(  # Node 1
+                func=collect_feature_importances,
+                inputs={"X_train": "X_train", **MODELS},
+                outputs="feature_importances",
+                name="collect_feature_importances_node",
+                tags=["feature_importance"],
+            ),
+            node(  # Node 2
+                func=select_pruned_features,
+                inputs=["feature_importances", "params:feature_pruning"],
+                outputs="pruned_features",
+                name="select_pruned_features_node",
+                tags=["feature_selection"],
+            ),
+            node(  # Node 3
+                func=evaluate_feature_pruning,
+                inputs={
+                    "X_train": "X_train",
+                    "y_train": "y_train",
+                    "X_test": "X_test",
+                    "y_test": "y_test",
+                    "pruned_features": "pruned_features",
+                    **MODELS,
+                },
+                outputs="feature_pruning_report",
+                name="evaluate_feature_pruning_node",
+                tags=["feature_selection", "reporting"],
+            ),
+        ],
+        tags="feature_pruning_pipeline",
+        namespace="feature_pruning_pipeline",
+        inputs=["X_train", "y_train", "X_test", "y_test", *MODELS.values()],
+        outputs=["feature_importances", "pruned_features", "feature_pruning_report"],
+    )
@@ -0,0 +1,10 @@
+"""
+This is a pipeline 'hyperparameter_tuning_pipeline'
+searching the parameters of every model with Hyperband
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,360 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+from threadpoolctl import threadpool_limits
+
+from ...datasets import MemmapDataset
+from ...training import THREAD_PARAMS, thread_params
+from ..data_processing_pipeline.nodes import time_index
+from ..feature_engineering_pipeline.nodes import data_fingerprint
+
+# Parameters setting the number of boosting rounds or trees of each model library
+ITERATION_PARAMS = ("n_estimators", "iterations")
+
+# Model input and thread budget of the current worker process
+_worker = {}
+
+
+def apply_tuned_params(model, tuned_params: dict, name: str, enabled: bool = True):
+    """
+    Sets the parameters found by the hyperparameter tuning pipeline for a model on that
+    model, when they exist and `enabled` is on, and returns the model.
+    """
+    if not enabled or not tuned_params or name not in tuned_params:
+        return model
+    logging.getLogger(__name__).info(
+        f"Using the tuned {name} parameters: {tuned_params[name]}"
+    )
+    return model.set_params(**tuned_params[name])
+
+
+def hyperband_brackets(min_budget: float, max_budget: float, eta: int) -> list:
+    """
+    Lists the brackets of a Hyperband search, from the most aggressive one, which starts
+    the most configurations on the smallest budget, to plain random search on the full
+    budget.
+
+    Within a bracket, each rung keeps the best `1 / eta` of the configurations of the
+    previous rung and gives them `eta` times its budget, up to `max_budget`.
+
+    Args:
+        min_budget (float): The smallest budget of a trial.
+        max_budget (float): The full budget of a trial.
+        eta (int): The budget growth and inverse promotion rate between rungs.
+
+    Returns:
+        list: For every bracket, the (number of configurations, budget) of its rungs.
+    """
+    s_max = int(np.floor(np.log(max_budget / min_budget) / np.log(eta) + 1e-9))
+    brackets = []
+    for s in range(s_max, -1, -1):
+        n_configs = int(np.ceil((s_max + 1) / (s + 1) * eta**s))
+        brackets.append(
+            [
+                (max(n_configs // eta**rung, 1), max_budget * eta ** (rung - s))
+                for rung in range(s + 1)
+            ]
+        )
+    return brackets
+
+
+def sample_config(space: dict, rng: np.random.Generator) -> dict:
+    """
+    Draws a configuration from a search space, where every parameter is an `int` or a
+    `float` between `low` and `high`, sampled on a log scale with `log: true`, or a
+    `choice` between `values`.
+    """
+    config = {}
+    for name, dist in space.items():
+        kind = dist.get("type", "float")
+        if kind == "choice":
+            config[name] = dist["values"][int(rng.integers(len(dist["values"])))]
+        elif kind == "int":
+            config[name] = int(rng.integers(dist["low"], dist["high"] + 1))
+        elif kind == "float" and dist.get("log"):
+            low, high = np.log(dist["low"]), np.log(dist["high"])
+            config[name] = float(np.exp(rng.uniform(low, high)))
+        elif kind == "float":
+            config[name] = float(rng.uniform(dist["low"], dist["high"]))
+        else:
+            raise ValueError(f"Unknown type '{kind}' of the parameter '{name}'.")
+    return config
+
+
+def _init_worker(directory: str, threads: int) -> None:
+    """Memory-maps the published model input and limits the threads of the worker."""
+    threadpool_limits(threads)
+    for name in ("features", "target", "validation_features", "validation_target"):
+        _worker[name] = MemmapDataset(filepath=f"{directory}/{name}").load()
+    _worker["times"] = time_index(_worker["features"].index)
+    _worker["unique_times"] = np.unique(_worker["times"])
+    _worker["threads"] = threads
+
+
+def _run_trial(model, config: dict, budget: float):
+    """
+    Fits a model with a configuration on a budget, i.e. on the most recent `budget`
+    fraction of the training period and with that fraction of its iterations, and
+    scores it on the validation holdout, in a worker holding the model input.
+    """
+    unique_times = _worker["unique_times"]
+    first = min(int((1 - budget) * len(unique_times)), len(unique_times) - 1)
+    rows = _worker["times"] >= unique_times[first]
+    X_train, y_train = _worker["features"], _worker["target"]
+    if not rows.all():
+        X_train, y_train = X_train[rows], y_train[rows]
+
+    trial_model = clone(model)
+    model_params = trial_model.get_params()
+    iterations = next(param for param in ITERATION_PARAMS if param in model_params)
+    trial_model.set_params(
+        **config,
+        **{iterations: max(1, round(model_params[iterations] * budget))},
+        **{param: _worker["threads"] for param in thread_params(trial_model)},
+        **({"verbose": 0} if "verbose" in model_params else {}),
+    )
+
+    start_time = time.perf_counter()
+    trial_model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start_time
+    predictions = trial_model.predict(_worker["validation_features"])
+    rmse = np.sqrt(mean_squared_error(_worker["validation_target"], predictions))
+    return float(rmse), fit_seconds
+
+
+def _study_id(name: str, model, space: dict, params: dict, data_key: str) -> str:
+    """Identifies the study of a model by everything its trial scores depend on, except
+    the thread counts and the tuned parameters."""
+    base_params = {
+        key: value
+        for key, value in model.get_params().items()
+        if key not in space and key not in THREAD_PARAMS
+    }
+    key = json.dumps(
+        {
+            "base_params": base_params,
+            "space": space,
+            "hyperband": [params[k] for k in ("min_budget", "max_budget", "eta")],
+            "seed": params.get("seed", 42),
+            "data": data_key,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return f"{name}-{hashlib.sha256(key.encode()).hexdigest()[:12]}"
+
+
+# Node 1
+def tune_hyperparameters(
+    fit_features: pd.DataFrame,
+    fit_target: pd.Series,
+    validation_features: pd.DataFrame,
+    validation_target: pd.Series,
+    model_input_fingerprint: str,
+    study,
+    params: dict,
+    search_spaces: dict,
+    **models,
+):
+    """
+    Searches the parameters of every model with Hyperband, scoring the configurations
+    on the validation holdout of the model input.
+
+    Every bracket samples random configurations and runs successive halving on them:
+    all of them are first fitted on a small budget, i.e. on fewer rows and with fewer
+    iterations, and only the best `1 / eta` of each rung are fitted again with `eta`
+    times the budget. The trials of a rung of every model and bracket are fanned out to
+    a pool of worker processes memory-mapping the model input. Every finished trial is
+    recorded in the study, and trials already recorded are not run again, so an
+    interrupted search resumes where it stopped.
+
+    Args:
+        fit_features (pd.DataFrame): The model input the models are fitted on.
+        fit_target (pd.Series): Its target.
+        validation_features (pd.DataFrame): The validation holdout.
+        validation_target (pd.Series): Its target.
+        model_input_fingerprint (str): The fingerprint of the model input.
+        study (TuningStudy): The study recording the trials.
+        params (dict): The tuning parameters (`models`, `min_budget`, `max_budget`,
+            `eta`, `n_brackets`, `seed` and the `executor`).
+        search_spaces (dict): The search space of every model.
+        **models: The trained models, by name, whose other parameters are kept.
+
+    Returns:
+        tuple: The best parameters of every model, and every trial of the studies.
+    """
+    logger = logging.getLogger(__name__)
+
+    if len(validation_features) == 0:
+        raise ValueError(
+            "The hyperparameter tuning scores the models on the validation holdout, "
+            "set `validation_period` in the model input parameters."
+        )
+    names = [
+        name
+        for name in params.get("models", list(models))
+        if name in models and name in search_spaces
+    ]
+    max_budget = params["max_budget"]
+    brackets = hyperband_brackets(params["min_budget"], max_budget, params["eta"])
+    brackets = brackets[: params.get("n_brackets") or len(brackets)]
+    seed = params.get("seed", 42)
+
+    data_key = (
+        f"{model_input_fingerprint}-"
+        f"{data_fingerprint(validation_target.to_frame())}"
+    )
+    study_ids = {
+        name: _study_id(name, models[name], search_spaces[name], params, data_key)
+        for name in names
+    }
+    # The configurations of a bracket only depend on the seed, the model and the
+    # bracket, so a resumed search draws the same ones. The last bracket, on the full
+    # budget, also tries the current parameters of the model, so the best parameters
+    # are never worse than them on the validation holdout.
+    configs = {}
+    for name in names:
+        for bracket, rungs in enumerate(brackets):
+            rng = np.random.default_rng([seed, zlib.crc32(name.encode()), bracket])
+            configs[(name, bracket)] = [
+                sample_config(search_spaces[name], rng) for _ in range(rungs[0][0])
+            ]
+        current = models[name].get_params()
+        configs[(name, len(brackets) - 1)][0] = {
+            key: current[key]
+            for key in search_spaces[name]
+            if current.get(key) is not None
+        }
+
+    executor_params = params.get("executor", {})
+    threads = executor_params.get("threads_per_worker") or 1
+    n_workers = executor_params.get("n_workers") or max(
+        1, (os.cpu_count() or 1) // threads
+    )
+
+    start = time.perf_counter()
+    n_run = n_resumed = 0
+    shared_dir = executor_params.get("shared_dir")
+    with tempfile.TemporaryDirectory(dir=shared_dir) as directory:
+        for name, data in {
+            "features": fit_features,
+            "target": fit_target,
+            "validation_features": validation_features,
+            "validation_target": validation_target,
+        }.items():
+            MemmapDataset(filepath=f"{directory}/{name}").save(data)
+
+        if n_workers == 1:
+            _init_worker(directory, threads)
+            executor = None
+        else:
+            # Forked workers can deadlock in the OpenMP runtime of the parent
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(directory, threads),
+            )
+
+        try:
+            survivors = {key: list(range(len(configs[key]))) for key in configs}
+            rung = 0
+            while survivors:
+                scores, jobs = {}, []
+                for (name, bracket), configs_left in survivors.items():
+                    budget = brackets[bracket][rung][1]
+                    for config in configs_left:
+                        key = (study_ids[name], name, bracket, config, rung)
+                        trial = study.trial(*key)
+                        config_params = configs[(name, bracket)][config]
+                        if trial is not None and trial["params"] == config_params:
+                            scores[(name, bracket, config)] = trial["rmse"]
+                            n_resumed += 1
+                        else:
+                            jobs.append((name, bracket, config, budget))
+                jobs.sort(key=lambda job: -job[3])
+
+                logger.info(
+                    f"Rung {rung}: running {len(jobs)} trials on {n_workers} workers..."
+                )
+                trials = [
+                    (models[name], configs[(name, bracket)][config], budget)
+                    for name, bracket, config, budget in jobs
+                ]
+                if executor is None:
+                    outputs = (
+                        (job, _run_trial(*trial)) for job, trial in zip(jobs, trials)
+                    )
+                else:
+                    futures = {
+                        executor.submit(_run_trial, *trial): job
+                        for job, trial in zip(jobs, trials)
+                    }
+                    outputs = (
+                        (futures[future], future.result())
+                        for future in as_completed(futures)
+                    )
+                for (name, bracket, config, budget), (rmse, fit_seconds) in outputs:
+                    study.record(
+                        study_ids[name],
+                        name,
+                        bracket,
+                        config,
+                        rung,
+                        budget,
+                        configs[(name, bracket)][config],
+                        rmse,
+                        fit_seconds,
+                    )
+                    scores[(name, bracket, config)] = rmse
+                    n_run += 1
+
+                # Promote the best configurations of every bracket to the next rung
+                promoted = {}
+                for (name, bracket), configs_left in survivors.items():
+                    if rung + 1 < len(brackets[bracket]):
+                        n_promoted = brackets[bracket][rung + 1][0]
+                        promoted[(name, bracket)] = sorted(
+                            configs_left,
+                            key=lambda config: scores[(name, bracket, config)],
+                        )[:n_promoted]
+                survivors = promoted
+                rung += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            _worker.clear()
+
+    results = study.trials(list(study_ids.values()))
+    best_params = {}
+    for name in names:
+        full_budget = results[
+            (results["study"] == study_ids[name])
+            & np.isclose(results["budget"], max_budget)
+        ]
+        best = full_budget.loc[full_budget["rmse"].idxmin()]
+        best_params[name] = json.loads(best["params"])
+        logger.info(
+            f"{name}: best validation RMSE {best['rmse']:.2f} with "
+            f"{best_params[name]}."
+        )
+    logger.info(
+        f"Ran {n_run} trials and resumed {n_resumed} in "
+        f"{time.perf_counter() - start:.1f}s."
+    )
+    results = results.sort_values(
+        ["model", "bracket", "rung", "rmse"], ignore_index=True
+    )
+    return best_params, results
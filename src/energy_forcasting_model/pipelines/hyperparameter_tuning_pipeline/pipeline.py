@@ -0,0 +1,46 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import tune_hyperparameters
+
+MODELS = {
+    "xgboost": "xgboost_model",
+    "lightgbm": "lightgbm_model",
+    "catboost": "catboost_model",
+    "random_forest": "random_forest_model",
+}
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(  # Node 1
+                func=tune_hyperparameters,
+                inputs={
+                    "fit_features": "model_input_fit_features",
+                    "fit_target": "model_input_fit_target",
+                    "validation_features": "model_input_validation_features",
+                    "validation_target": "model_input_validation_target",
+                    "model_input_fingerprint": "model_input_fingerprint",
+                    "study": "tuning_study",
+                    "params": "params:tuning",
+                    "search_spaces": "params:search_spaces",
+                    **MODELS,
+                },
+                outputs=["best_params", "tuning_results"],
+                name="tune_hyperparameters_node",
+                tags=["hyperparameter_tuning"],
+            ),
+        ],
+        tags="hyperparameter_tuning_pipeline",
+        namespace="hyperparameter_tuning_pipeline",
+        inputs=[
+            "model_input_fit_features",
+            "model_input_fit_target",
+            "model_input_validation_features",
+            "model_input_validation_target",
+            "model_input_fingerprint",
+            "tuning_study",
+            *MODELS.values(),
+        ],
+        outputs=["best_params", "tuning_results"],
+    )
@@ -1,50 +1,110 @@
 import lightgbm as lgb
 import logging
 
+from ...training import model_rmse, scheduler, training_info, warm_start_rows
+from ..hyperparameter_tuning_pipeline.nodes import apply_tuned_params
 
-def train_lightgbm_model(X_train, y_train, params):
+
+def train_lightgbm_model(
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    params,
+    tuned_params=None,
+    use_tuned_params=False,
+    previous_model=None,
+    previous_info=None,
+    warm_start=None,
+):
     """
-    Trains a LightGBM regression model using the given training data and parameters.
+    Trains a LightGBM regression model using the given model input and parameters.
+
+    With a validation holdout, training stops once the validation metric has not
+    improved for `early_stopping_rounds` rounds, and the model keeps its best iteration.
+
+    With warm starts enabled, the previously saved model keeps boosting, for at most
+    `max_added_trees` rounds, on the recent rows rather than being retrained, unless
+    its features or parameters changed or the new rows drifted. The previous model is
+    given as a loader, and only deserialized when it is used.
+
+    Returns the model and its training info.
     """
     # Initialize logger
     logger = logging.getLogger(__name__)
 
-    # Extract model parameters and data types
-    model_params = {k: v for k, v in params.items() if k != "data_types"}
-    data_types = params.get("data_types", {})
-
-    # Convert specified columns to boolean based on provided data types
-    boolean_columns = data_types.get("boolean_columns", [])
-    for col in boolean_columns:
-        if col in X_train.columns:
-            logger.debug(f"Converting column {col} to boolean.")
-            X_train[col] = X_train[col].astype("bool")
-
     # Log the start and parameters of the training process
     logger.info("Starting LightGBM model training...")
-    logger.info(f"LightGBM parameters: {model_params}")
+    logger.info(f"LightGBM parameters: {params}")
 
-    # Drop rows with null values from X_train and align y_train
-    X_train_clean = X_train.dropna()
-    y_train_clean = y_train.loc[X_train_clean.index]
-
-    # Log how many rows were dropped
-    dropped_rows = X_train.shape[0] - X_train_clean.shape[0]
-    logger.info(f"Dropped {dropped_rows} rows with null values from training data.")
-
-    # Create an instance of LGBMRegressor with parameters unpacked
+    # Create an instance of LGBMRegressor with parameters unpacked, and the threads
+    # given by the training scheduler. Early stopping is a training callback, so it is
+    # not set on the model, which can still be refitted without a validation set.
+    model_params = {
+        key: value for key, value in params.items() if key != "early_stopping_rounds"
+    }
+    model_params["n_jobs"] = scheduler.threads("lightgbm", params.get("n_jobs"))
     lgbm_model = lgb.LGBMRegressor(**model_params)
+    lgbm_model = apply_tuned_params(
+        lgbm_model, tuned_params, "lightgbm", use_tuned_params
+    )
+    info = training_info(lgbm_model, X_train)
 
-    # Training the model
+    rows = warm_start_rows(
+        "lightgbm",
+        previous_model,
+        previous_info,
+        info,
+        X_train,
+        y_train,
+        warm_start or {},
+    )
+    n_estimators = lgbm_model.n_estimators
+    if rows is None:
+        X_fit, y_fit, init_model = X_train, y_train, None
+    elif not rows.any():
+        return previous_model(), previous_info
+    else:
+        # Continue boosting the previous model, saved up to its best iteration, on the
+        # recent rows
+        X_fit, y_fit = X_train[rows], y_train[rows]
+        init_model = previous_model().booster_
+        lgbm_model.set_params(n_estimators=warm_start["max_added_trees"])
+    eval_set, callbacks = None, []
+    if len(X_val) > 0:
+        eval_set = [(X_val, y_val)]
+        callbacks = [
+            lgb.early_stopping(params.get("early_stopping_rounds", 50), verbose=False)
+        ]
     logger.info("Training the LightGBM model...")
     lgbm_model.fit(
-        X_train_clean,
-        y_train_clean,
-        eval_set=[(X_train_clean, y_train_clean)],
-        eval_metric=model_params.get("metric", "l2"),
+        X_fit,
+        y_fit,
+        eval_set=eval_set,
+        callbacks=callbacks,
+        init_model=init_model,
+    )
+    # The added trees of a warm start do not change the parameters of the model
+    lgbm_model.set_params(n_estimators=n_estimators)
+    if eval_set:
+        max_iteration = lgbm_model.booster_.current_iteration()
+        scores = ", ".join(
+            f"{metric} {score:.2f}"
+            for metric, score in lgbm_model.best_score_["valid_0"].items()
+        )
+        logger.info(
+            f"Best iteration: {lgbm_model.best_iteration_} of {max_iteration}, "
+            f"validation {scores}."
+        )
+
+    # Reference error of the next warm start, on the holdout or else the training set
+    info["rmse"] = (
+        model_rmse(lgbm_model, X_val, y_val)
+        if len(X_val) > 0
+        else model_rmse(lgbm_model, X_train, y_train)
     )
 
     # Log the completion of the training process
     logger.info("LightGBM model training completed successfully.")
 
-    return lgbm_model
+    return lgbm_model, info
@@ -15,10 +15,21 @@ def create_pipeline(**kwargs) -> Pipeline:
         [
             node(  # Node 1: Train LightGBM Model
                 func=train_lightgbm_model,
-                inputs=["X_train", "y_train", "params:lightgbm_model_params"],
-                outputs="lightgbm_model",
+                inputs=[
+                    "model_input_fit_features",
+                    "model_input_fit_target",
+                    "model_input_validation_features",
+                    "model_input_validation_target",
+                    "params:lightgbm_model_params",
+                    "tuned_params",
+                    "params:training.use_tuned_params",
+                    "previous_lightgbm_model",
+                    "previous_lightgbm_training_info",
+                    "params:training.warm_start",
+                ],
+                outputs=["lightgbm_model", "lightgbm_training_info"],
                 name="train_lightgbm_model_node",
-                tags=["model_training", "lightgbm"],
+                tags=["model_training", "model_fit", "lightgbm"],
             ),
             node(  # Node 2: Plot Feature Importance
                 func=plot_feature_importance,
@@ -41,7 +52,12 @@ def create_pipeline(**kwargs) -> Pipeline:
             ),
             node(  # Node 4: Plot Real Data and Predictions
                 func=plot_real_data_and_predictions_with_train,
-                inputs=["y_train", "y_test", "lightgbm_model_predictions"],
+                inputs=[
+                    "y_train",
+                    "y_test",
+                    "lightgbm_model_predictions",
+                    "params:reporting.max_plot_points",
+                ],
                 outputs="real_data_and_lightgbm_predictions_plot",
                 name="plot_real_data_and_predictions_node",
                 tags=["data_visualization", "lightgbm", "model_training"],
@@ -49,14 +65,27 @@ def create_pipeline(**kwargs) -> Pipeline:
         ],
         tags="model_training",
         namespace="lightgbm_training_pipeline",
+        parameters={
+            "params:reporting.max_plot_points",
+            "params:training.use_tuned_params",
+            "params:training.warm_start",
+        },
         inputs=[
             "X_train",
             "y_train",
             "X_test",
             "y_test",
+            "model_input_fit_features",
+            "model_input_fit_target",
+            "model_input_validation_features",
+            "model_input_validation_target",
+            "tuned_params",
+            "previous_lightgbm_model",
+            "previous_lightgbm_training_info",
         ],
         outputs=[
             "lightgbm_model",
+            "lightgbm_training_info",
             "lightgbm_feature_importance_plot",
             "real_data_and_lightgbm_predictions_plot",
         ],
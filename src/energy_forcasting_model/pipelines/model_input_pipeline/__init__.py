@@ -0,0 +1,10 @@
+"""
+This is a pipeline 'model_input_pipeline'
+preparing the training matrix shared by the models, and their native datasets
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+from ..data_processing_pipeline.nodes import time_index, vocabulary_columns
+from ..feature_engineering_pipeline.nodes import data_fingerprint
+
+
+def build_native_dataset(library: str, features: pd.DataFrame, target, params: dict):
+    """
+    Builds the native training dataset of a model library from the model input.
+
+    Args:
+        library (str): `xgboost` or `catboost`.
+        features (pd.DataFrame): The model input features.
+        target (pd.Series): The model input target.
+        params (dict): The dataset parameters of the library, e.g. its binning.
+
+    Returns:
+        The XGBoost `DMatrix` or the quantized CatBoost `Pool`.
+    """
+    if library == "xgboost":
+        import xgboost as xgb
+
+        return xgb.DMatrix(features, target, enable_categorical=True, **params)
+    if library == "catboost":
+        from catboost import Pool
+
+        pool = Pool(features, target)
+        pool.quantize(**params)
+        return pool
+    raise ValueError(f"Unsupported model library '{library}'.")
+
+
+def native_dataset(library: str, model_input_cache: dict, fingerprint: str):
+    """
+    Loads the cached native training dataset of a model library for the model input.
+
+    Raises:
+        ValueError: If the dataset of the library is not cached for the model input,
+            e.g. because the library is missing from `native_datasets`, rather than
+            training on a dataset built with other parameters.
+    """
+    logger = logging.getLogger(__name__)
+
+    loader = model_input_cache.get(fingerprint, {}).get(library)
+    if loader is None:
+        raise ValueError(
+            f"No cached {library} training dataset for the model input {fingerprint}, "
+            f"add '{library}' to the `native_datasets` of the model input parameters."
+        )
+    logger.info(f"Loading the cached {library} training dataset...")
+    return loader()
+
+
+# Node 1
+def prepare_model_input(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    params: dict,
+    vocabulary: list,
+    encoded_column: str,
+):
+    """
+    Prepares the training matrix shared by all the models, once: casts the boolean
+    columns, drops the rows with missing values and aligns the target.
+
+    The boolean columns are the `boolean_columns` of the parameters and the one-hot
+    columns of the weather conditions vocabulary. `X_train` is not modified, the casts
+    and the dropped rows are applied to a copy.
+
+    Args:
+        X_train (pd.DataFrame): The training features.
+        y_train (pd.Series): The training target.
+        params (dict): The model input parameters (`boolean_columns`).
+        vocabulary (list): The vocabulary of the encoded weather column.
+        encoded_column (str): The encoded weather column, prefix of its one-hot columns.
+
+    Returns:
+        tuple: The model input features and target.
+    """
+    logger = logging.getLogger(__name__)
+
+    boolean_columns = [
+        col
+        for col in params.get("boolean_columns", [])
+        + vocabulary_columns(vocabulary, encoded_column)
+        if col in X_train.columns
+    ]
+    features = X_train.astype({col: "bool" for col in boolean_columns}).dropna()
+    target = y_train.loc[features.index].squeeze()
+
+    logger.info(
+        f"Prepared a model input of {features.shape[0]} rows and {features.shape[1]} "
+        f"features, dropped {X_train.shape[0] - features.shape[0]} rows with null "
+        f"values."
+    )
+    return features, target
+
+
+# Node 2
+def split_validation_holdout(features: pd.DataFrame, target: pd.Series, params: dict):
+    """
+    Holds out the tail of the model input to early stop the boosting models, which are
+    fitted on the rows before it.
+
+    The holdout covers the last `validation_period` of the training period, e.g. `90D`,
+    for every meter in panel mode. Without a `validation_period`, the holdout is empty
+    and the boosting models are fitted on the whole model input.
+
+    Args:
+        features (pd.DataFrame): The model input features.
+        target (pd.Series): The model input target.
+        params (dict): The model input parameters (`validation_period`).
+
+    Returns:
+        tuple: The features and target to fit on, and those of the holdout.
+    """
+    logger = logging.getLogger(__name__)
+
+    times = time_index(features.index)
+    holdout = np.zeros(len(features), dtype=bool)
+    if params.get("validation_period") is not None and len(features):
+        holdout = times > times.max() - pd.Timedelta(params["validation_period"])
+    if holdout.all():
+        raise ValueError(
+            f"The validation period {params['validation_period']} covers the whole "
+            f"model input, nothing is left to fit on."
+        )
+
+    if holdout.any():
+        logger.info(
+            f"Holding out {holdout.sum()} rows from {times[holdout].min().date()} to "
+            f"{times.max().date()} to early stop the boosting models."
+        )
+    else:
+        logger.info("No validation holdout, the boosting models are not early stopped.")
+    return (
+        features[~holdout],
+        target[~holdout],
+        features[holdout],
+        target[holdout],
+    )
+
+
+# Node 3
+def build_native_datasets(
+    features: pd.DataFrame, target: pd.Series, params: dict, model_input_cache: dict
+):
+    """
+    Builds the native training datasets of the model libraries that are not cached yet
+    for the model input the boosting models are fitted on.
+
+    The cache is keyed by a fingerprint of the model input and of the dataset
+    parameters, so repeat trainings on the same data load the datasets instead of
+    converting and binning the features again. The cache update lists every dataset of
+    the model input, the cached ones as None, so saving it prunes the datasets of the
+    previous model inputs.
+
+    Args:
+        features (pd.DataFrame): The model input features.
+        target (pd.Series): The model input target.
+        params (dict): The model input parameters, with the dataset parameters of
+            every library under `native_datasets`.
+        model_input_cache (dict): The cached native datasets, by fingerprint.
+
+    Returns:
+        tuple: The fingerprint of the model input, and the cache update,
+            {fingerprint: {library: new dataset, or None for a cached one}}.
+    """
+    logger = logging.getLogger(__name__)
+
+    native_params = params.get("native_datasets", {})
+    params_hash = hashlib.sha256(
+        json.dumps(native_params, sort_keys=True).encode()
+    ).hexdigest()[:8]
+    fingerprint = (
+        f"{data_fingerprint(features)}-{data_fingerprint(target.to_frame())}-"
+        f"{params_hash}"
+    )
+
+    cached = model_input_cache.get(fingerprint, {})
+    entries = {
+        library: (
+            None
+            if library in cached
+            else build_native_dataset(library, features, target, library_params or {})
+        )
+        for library, library_params in native_params.items()
+    }
+    n_built = sum(entry is not None for entry in entries.values())
+    logger.info(
+        f"Reused {len(entries) - n_built} cached native datasets, built {n_built}."
+    )
+    return fingerprint, {fingerprint: entries}
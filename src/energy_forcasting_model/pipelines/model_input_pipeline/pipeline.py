@@ -0,0 +1,74 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import (
+    build_native_datasets,
+    prepare_model_input,
+    split_validation_holdout,
+)
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(  # Node 1
+                func=prepare_model_input,
+                inputs=[
+                    "X_train",
+                    "y_train",
+                    "params:model_input",
+                    "weather_conditions_vocabulary",
+                    "params:data_processing_pipeline.data_processing.column_to_encode",
+                ],
+                outputs=["model_input_features", "model_input_target"],
+                name="prepare_model_input_node",
+                tags=["model_input"],
+            ),
+            node(  # Node 2
+                func=split_validation_holdout,
+                inputs=[
+                    "model_input_features",
+                    "model_input_target",
+                    "params:model_input",
+                ],
+                outputs=[
+                    "model_input_fit_features",
+                    "model_input_fit_target",
+                    "model_input_validation_features",
+                    "model_input_validation_target",
+                ],
+                name="split_validation_holdout_node",
+                tags=["model_input"],
+            ),
+            node(  # Node 3
+                func=build_native_datasets,
+                inputs=[
+                    "model_input_fit_features",
+                    "model_input_fit_target",
+                    "params:model_input",
+                    "model_input_cache",
+                ],
+                outputs=["model_input_fingerprint", "model_input_cache_update"],
+                name="build_native_datasets_node",
+                tags=["model_input"],
+            ),
+        ],
+        tags="model_input_pipeline",
+        namespace="model_input_pipeline",
+        inputs=[
+            "X_train",
+            "y_train",
+            "model_input_cache",
+            "weather_conditions_vocabulary",
+        ],
+        parameters={"params:data_processing_pipeline.data_processing.column_to_encode"},
+        outputs=[
+            "model_input_features",
+            "model_input_target",
+            "model_input_fit_features",
+            "model_input_fit_target",
+            "model_input_validation_features",
+            "model_input_validation_target",
+            "model_input_fingerprint",
+            "model_input_cache_update",
+        ],
+    )
@@ -9,10 +9,20 @@ import logging
 from sklearn.metrics import mean_squared_error
 from sklearn.ensemble import RandomForestRegressor
 
-
-def train_random_forest_model(X_train, y_train, params):
+from ...reporting import PlotSpec, downsample
+from ...training import scheduler
+from ..hyperparameter_tuning_pipeline.nodes import apply_tuned_params
+
+
+def train_random_forest_model(
+    X_train,
+    y_train,
+    params,
+    tuned_params=None,
+    use_tuned_params=False,
+):
     """
-    Trains a Random Forest regression model using the given training data and parameters.
+    Trains a Random Forest regression model using the given model input and parameters.
     """
     # Initialize logger
     logger = logging.getLogger(__name__)
@@ -20,15 +30,6 @@ def train_random_forest_model(X_train, y_train, params):
     # Log the start of the training process
     logger.info("Starting Random Forest model training...")
 
-    # Drop rows with null values from X_train
-    X_train_clean = X_train.dropna()
-    # Get the indices of the remaining rows after dropping nulls to align y_train
-    y_train_clean = y_train.loc[X_train_clean.index]
-
-    # Log how many rows were dropped
-    dropped_rows = X_train.shape[0] - X_train_clean.shape[0]
-    logger.info(f"Dropped {dropped_rows} rows with null values.")
-
     # Log model parameters for reproducibility/debugging
     logger.info(
         f"Random Forest parameters: n_estimators={params.get('n_estimators', 600)}, max_depth={params.get('max_depth', 3)}, random_state={params.get('random_state', 42)}"
@@ -38,10 +39,14 @@ def train_random_forest_model(X_train, y_train, params):
         n_estimators=params.get("n_estimators", 600),
         max_depth=params.get("max_depth", 3),
         random_state=params.get("random_state", 42),
+        n_jobs=scheduler.threads("random_forest"),
+    )
+    rfr_model = apply_tuned_params(
+        rfr_model, tuned_params, "random_forest", use_tuned_params
     )
 
     # Fit the model
-    rfr_model.fit(X_train_clean, y_train_clean.squeeze())
+    rfr_model.fit(X_train, y_train.squeeze())
 
     # Log the completion of the training process
     logger.info("Random Forest model training completed successfully.")
@@ -52,7 +57,8 @@ def train_random_forest_model(X_train, y_train, params):
 # Node 2
 def plot_feature_importance(trained_model, X_train):
     """
-    Generates a plot of the top 10 features based on importance from a trained XGBoost model.
+    Describes the plot of the top 10 features based on importance from a trained model,
+    drawn later by `draw_feature_importance`.
     """
     # Extracting feature importances
     feature_data_xgb = pd.DataFrame(
@@ -68,11 +74,18 @@ def plot_feature_importance(trained_model, X_train):
         by="Importance", ascending=False
     ).head(10)
 
+    return PlotSpec(draw_feature_importance, {"top_features": top_features_xgb})
+
+
+def draw_feature_importance(top_features):
+    """
+    Generates a plot of the top 10 features based on importance from a trained XGBoost model.
+    """
     # Plotting
     fig, ax = plt.subplots(figsize=(20, 10))
 
     # XGBoost
-    sns.barplot(data=top_features_xgb, x="Importance", y="Feature", ax=ax)
+    sns.barplot(data=top_features, x="Importance", y="Feature", ax=ax)
     ax.set_title("XGBoost: Top 10 Features", fontsize=16)
     ax.set_xlabel("Feature Importance", fontsize=12)
     ax.set_ylabel("Feature", fontsize=12)
@@ -92,10 +105,13 @@ def generate_predictions(X_test, trained_model):
     return predictions
 
 
-def plot_real_data_and_predictions_with_train(y_train, y_test, predictions):
+def plot_real_data_and_predictions_with_train(
+    y_train, y_test, predictions, max_points=None
+):
     """
-    Generates a plot comparing the actual data with model predictions and includes training data,
-    and displays the RMSE score.
+    Computes the RMSE score on the test set and describes the plot comparing the actual data
+    with model predictions, drawn later by `draw_real_data_and_predictions_with_train`,
+    with at most `max_points` points per series.
     """
     # Initialize logger
     logger = logging.getLogger(__name__)
@@ -104,6 +120,24 @@ def plot_real_data_and_predictions_with_train(y_train, y_test, predictions):
     rmse = np.sqrt(mean_squared_error(y_test, predictions))
     logger.info(f"RMSE for the test set: {rmse:.2f}")
 
+    return PlotSpec(
+        draw_real_data_and_predictions_with_train,
+        {
+            "y_train": downsample(y_train, max_points),
+            "y_test": downsample(y_test, max_points),
+            "predictions": downsample(
+                pd.Series(np.ravel(predictions), index=y_test.index), max_points
+            ),
+            "rmse": rmse,
+        },
+    )
+
+
+def draw_real_data_and_predictions_with_train(y_train, y_test, predictions, rmse):
+    """
+    Generates a plot comparing the actual data with model predictions and includes training data,
+    and displays the RMSE score.
+    """
     # Create the figure and axes objects
     fig, ax = plt.subplots(figsize=(18, 7))
 
@@ -114,7 +148,9 @@ def plot_real_data_and_predictions_with_train(y_train, y_test, predictions):
     ax.plot(y_test.index, y_test, label="Test Data", color="forestgreen", linewidth=2)
 
     # Plot predictions
-    ax.scatter(y_test.index, predictions, label="Model Predictions", color="red", s=10)
+    ax.scatter(
+        predictions.index, predictions, label="Model Predictions", color="red", s=10
+    )
 
     # Find the last date of the training set to add a vertical line for visual separation
     last_train_date = y_train.index[-1]
@@ -13,10 +13,16 @@ def create_pipeline(**kwargs) -> Pipeline:
         [
             node(
                 func=train_random_forest_model,
-                inputs=["X_train", "y_train", "params:random_forest_model_params"],
+                inputs=[
+                    "model_input_features",
+                    "model_input_target",
+                    "params:random_forest_model_params",
+                    "tuned_params",
+                    "params:training.use_tuned_params",
+                ],
                 outputs="random_forest_model",
                 name="train_random_forest_model_node",
-                tags=["random_forest", "model_training"],
+                tags=["random_forest", "model_training", "model_fit"],
             ),
             node(
                 func=plot_feature_importance,
@@ -38,6 +44,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                     "y_train",
                     "y_test",
                     "rf_predictions",
+                    "params:reporting.max_plot_points",
                 ],
                 outputs="real_data_and_rf_predictions_plot",
                 name="plot_real_data_and_rf_predictions_node",
@@ -46,11 +53,18 @@ def create_pipeline(**kwargs) -> Pipeline:
         ],
         tags="random_forest_pipeline",
         namespace="random_forest_pipeline",
+        parameters={
+            "params:reporting.max_plot_points",
+            "params:training.use_tuned_params",
+        },
         inputs=[
             "X_train",
             "y_train",
             "X_test",
             "y_test",
+            "model_input_features",
+            "model_input_target",
+            "tuned_params",
         ],
         outputs=[
             "random_forest_model",
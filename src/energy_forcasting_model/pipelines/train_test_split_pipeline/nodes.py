@@ -1,7 +1,13 @@
+import logging
+
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
 
+from ...reporting import PlotSpec, downsample
+from ..data_processing_pipeline.nodes import time_index
+
 
 # Node 2
 def prepare_train_test_sets(featured_data, created_features_list, params):
@@ -31,7 +37,21 @@ def prepare_train_test_sets(featured_data, created_features_list, params):
 
 
 # Node 3
-def train_test_split_plot(y_train, y_test):
+def train_test_split_plot(y_train, y_test, max_points=None):
+    """
+    Describes the plot of the train/test split, drawn later by `draw_train_test_split`,
+    with at most `max_points` points per series.
+    """
+    return PlotSpec(
+        draw_train_test_split,
+        {
+            "y_train": downsample(y_train, max_points),
+            "y_test": downsample(y_test, max_points),
+        },
+    )
+
+
+def draw_train_test_split(y_train, y_test):
     """
     Generates a plot visualizing the train/test split of data over time, including a vertical
     line to indicate the split point.
@@ -76,3 +96,117 @@ def train_test_split_plot(y_train, y_test):
 
     plt.close(fig)
     return fig
+
+
+def walk_forward_folds(timestamps: pd.DatetimeIndex, params: dict) -> list:
+    """
+    Lists the rolling-origin folds over time-sorted data, as positional ranges.
+
+    Every origin starts a test window of `horizon`, after a `gap` following the end of
+    the training window. The training window holds all the rows before the origin with
+    an `expanding` window, or only the last `train_length` of them with a `rolling` one.
+    Origins start at `first_origin` and move forward by `step`, up to `n_origins` of
+    them or as long as a full test window fits in the data.
+
+    Args:
+        timestamps (pd.DatetimeIndex): The sorted timestamps of the rows.
+        params (dict): The walk-forward parameters.
+
+    Returns:
+        list: One dict per fold with its origin and the `[start, stop)` row ranges of
+            its training and test windows.
+    """
+    logger = logging.getLogger(__name__)
+
+    step = pd.Timedelta(params["step"])
+    horizon = pd.Timedelta(params["horizon"])
+    gap = pd.Timedelta(params.get("gap") or 0)
+    window = params.get("window", "expanding")
+    if window not in ("expanding", "rolling"):
+        raise ValueError(f"Unknown walk-forward window '{window}'.")
+    if step <= pd.Timedelta(0) or horizon <= pd.Timedelta(0):
+        raise ValueError("The walk-forward step and horizon must be positive.")
+
+    # The data ends one time step after its last timestamp
+    last_timestamps = timestamps[timestamps < timestamps[-1]]
+    data_end = timestamps[-1]
+    if len(last_timestamps):
+        data_end += timestamps[-1] - last_timestamps[-1]
+
+    n_origins = params.get("n_origins")
+    origin = pd.Timestamp(params["first_origin"])
+    folds = []
+    while n_origins is None or len(folds) < n_origins:
+        test_start = origin + gap
+        test_end = test_start + horizon
+        if test_end > data_end:
+            break
+        if window == "rolling":
+            train_from = origin - pd.Timedelta(params["train_length"])
+        else:
+            train_from = timestamps[0]
+        bounds = timestamps.searchsorted([train_from, origin, test_start, test_end])
+        train_start, train_stop, test_first, test_stop = bounds.tolist()
+        if train_stop > train_start and test_stop > test_first:
+            folds.append(
+                {
+                    "fold": len(folds),
+                    "origin": origin.isoformat(),
+                    "train": [train_start, train_stop],
+                    "test": [test_first, test_stop],
+                }
+            )
+        else:
+            logger.warning(f"Skipped the walk-forward origin {origin}: empty window.")
+        origin += step
+
+    if n_origins is not None and len(folds) < n_origins:
+        logger.warning(
+            f"Only {len(folds)} of {n_origins} walk-forward folds fit in the data."
+        )
+    return folds
+
+
+def fold_data(features: pd.DataFrame, target: pd.Series, fold: dict):
+    """
+    Returns the training and test features and target of a fold as row slices of the
+    shared matrix, which are views rather than copies.
+    """
+    train = slice(*fold["train"])
+    test = slice(*fold["test"])
+    return (
+        features.iloc[train],
+        target.iloc[train],
+        features.iloc[test],
+        target.iloc[test],
+    )
+
+
+# Node 4
+def prepare_walk_forward_data(featured_data, created_features_list, params):
+    """
+    Builds the single feature matrix and target shared by every walk-forward fold,
+    sorted by time, with the folds as positional ranges over it.
+
+    Panel data is sorted by time across the ids, so every fold is one contiguous range
+    holding all the ids.
+
+    Returns:
+        tuple: The feature matrix, the target and the list of folds.
+    """
+    logger = logging.getLogger(__name__)
+
+    timestamps = time_index(featured_data.index)
+    if not timestamps.is_monotonic_increasing:
+        order = np.argsort(timestamps.to_numpy(), kind="stable")
+        featured_data = featured_data.iloc[order]
+        timestamps = timestamps[order]
+
+    features = featured_data[created_features_list]
+    target = featured_data[params["target"]]
+    folds = walk_forward_folds(timestamps, params)
+    logger.info(
+        f"Created {len(folds)} walk-forward folds over one matrix of "
+        f"{features.shape[0]} rows and {features.shape[1]} features."
+    )
+    return features, target, folds
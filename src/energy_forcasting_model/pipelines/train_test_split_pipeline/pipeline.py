@@ -1,6 +1,10 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import prepare_train_test_sets, train_test_split_plot
+from .nodes import (
+    prepare_train_test_sets,
+    prepare_walk_forward_data,
+    train_test_split_plot,
+)
 
 
 def create_pipeline(**kwargs) -> Pipeline:
@@ -27,14 +31,31 @@ def create_pipeline(**kwargs) -> Pipeline:
                 inputs=[
                     "y_train",
                     "y_test",
+                    "params:reporting.max_plot_points",
                 ],
                 outputs="train_test_split_visualization",
                 name="train_test_split_plot_node",
                 tags=["train_test_split_plot"],
             ),
+            node(  # Node 4
+                func=prepare_walk_forward_data,
+                inputs=[
+                    "featured_data",
+                    "created_features",
+                    "params:walk_forward",
+                ],
+                outputs=[
+                    "walk_forward_features",
+                    "walk_forward_target",
+                    "walk_forward_folds",
+                ],
+                name="prepare_walk_forward_data_node",
+                tags=["data_splitting", "backtesting"],
+            ),
         ],
         tags="train_test_split_pipeline",
         namespace="train_test_split_pipeline",
+        parameters={"params:reporting.max_plot_points"},
         inputs=["featured_data", "created_features"],
         outputs=[
             "train_test_split_visualization",
@@ -42,5 +63,8 @@ def create_pipeline(**kwargs) -> Pipeline:
             "y_train",
             "X_test",
             "y_test",
+            "walk_forward_features",
+            "walk_forward_target",
+            "walk_forward_folds",
         ],
     )
@@ -1,10 +1,63 @@
 import xgboost as xgb
 import logging
 
+from ...training import model_rmse, scheduler, training_info, warm_start_rows
+from ..hyperparameter_tuning_pipeline.nodes import apply_tuned_params
+from ..model_input_pipeline.nodes import native_dataset
 
-def train_xgboost_model(X_train, y_train, params):
+
+def fitted_xgb_regressor(xgb_model, booster, evals_result):
+    """
+    Loads a Booster trained with the native API into an XGBRegressor, as the fitted
+    state `XGBRegressor.fit` would leave, leaving its parameters untouched.
+    """
+    params = xgb_model.get_params()
+    xgb_model.load_model(bytearray(booster.save_raw()))
+    # Loading sets the parameters recorded in the model, e.g. its feature types
+    xgb_model.set_params(**params)
+    xgb_model.evals_result_ = evals_result
+    return xgb_model
+
+
+def best_booster(xgb_model):
+    """
+    The Booster of a fitted XGBRegressor, without the trees after its best iteration
+    when it was early stopped.
+    """
+    booster = xgb_model.get_booster()
+    try:
+        return booster[: booster.best_iteration + 1]
+    except AttributeError:
+        return booster
+
+
+def train_xgboost_model(
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    model_input_cache,
+    model_input_fingerprint,
+    params,
+    tuned_params=None,
+    use_tuned_params=False,
+    previous_model=None,
+    previous_info=None,
+    warm_start=None,
+):
     """
-    Trains an XGBoost regression model using the given training data and parameters.
+    Trains an XGBoost regression model using the given model input and parameters,
+    from the native dataset cached for that model input.
+
+    With a validation holdout, training stops once the validation RMSE has not improved
+    for `early_stopping_rounds` rounds, and the model predicts with its best iteration.
+
+    With warm starts enabled, the previously saved model keeps boosting, for at most
+    `max_added_trees` rounds, on the recent rows rather than being retrained, unless
+    its features or parameters changed or the new rows drifted. The previous model is
+    given as a loader, and only deserialized when it is used.
+
+    Returns the model and its training info.
     """
     # Initialize logger
     logger = logging.getLogger(__name__)
@@ -17,21 +70,6 @@ def train_xgboost_model(X_train, y_train, params):
         f"XGBoost parameters: base_score={params['base_score']}, booster={params['booster']}, n_estimators={params['n_estimators']}, early_stopping_rounds={params['early_stopping_rounds']}, objective={params['objective']}, max_depth={params['max_depth']}, learning_rate={params['learning_rate']}, enable_categorical=True, verbose_eval={params['verbose_eval']}"
     )
 
-    # Convert specified columns to boolean based on provided data types
-    boolean_columns = params.get("data_types", {}).get("boolean_columns", [])
-    for col in boolean_columns:
-        if col in X_train.columns:
-            logger.debug(f"Converting column {col} to boolean.")
-            X_train[col] = X_train[col].astype("bool")
-
-    # Drop rows with null values from X_train and align y_train
-    X_train_clean = X_train.dropna()
-    y_train_clean = y_train.loc[X_train_clean.index]
-
-    # Log how many rows were dropped
-    dropped_rows = X_train.shape[0] - X_train_clean.shape[0]
-    logger.info(f"Dropped {dropped_rows} rows with null values from training data.")
-
     # Instantiate XGBoost Regressor with the given parameters
     xgb_model = xgb.XGBRegressor(
         base_score=params["base_score"],
@@ -41,18 +79,67 @@ def train_xgboost_model(X_train, y_train, params):
         max_depth=params["max_depth"],
         learning_rate=params["learning_rate"],
         enable_categorical=True,
+        n_jobs=scheduler.threads("xgboost"),
     )
+    xgb_model = apply_tuned_params(xgb_model, tuned_params, "xgboost", use_tuned_params)
+    info = training_info(xgb_model, X_train)
 
-    # Training the model with verbosity based on the provided configuration
+    rows = warm_start_rows(
+        "xgboost",
+        previous_model,
+        previous_info,
+        info,
+        X_train,
+        y_train,
+        warm_start or {},
+    )
+    if rows is None:
+        # Train on the cached DMatrix of the model input rather than converting X_train
+        dtrain = native_dataset("xgboost", model_input_cache, model_input_fingerprint)
+        init_booster, num_boost_round = None, xgb_model.n_estimators
+    elif not rows.any():
+        return previous_model(), previous_info
+    else:
+        # Continue boosting the best iteration of the previous model on the recent rows
+        dtrain = xgb.DMatrix(X_train[rows], y_train[rows], enable_categorical=True)
+        init_booster = best_booster(previous_model())
+        num_boost_round = warm_start["max_added_trees"]
+    early_stopping = len(X_val) > 0
+    if early_stopping:
+        dval = xgb.DMatrix(X_val, y_val, enable_categorical=True)
+        evals = [(dtrain, "validation_0"), (dval, "validation_1")]
+    else:
+        evals = [(dtrain, "validation_0")]
     logger.info("Training the XGBoost model...")
-    xgb_model.fit(
-        X_train_clean,
-        y_train_clean,
-        eval_set=[(X_train_clean, y_train_clean)],
-        verbose=params["verbose_eval"],
+    evals_result = {}
+    booster = xgb.train(
+        xgb_model.get_xgb_params(),
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=evals,
+        evals_result=evals_result,
+        early_stopping_rounds=(
+            params.get("early_stopping_rounds") if early_stopping else None
+        ),
+        verbose_eval=params["verbose_eval"],
+        xgb_model=init_booster,
+    )
+    xgb_model = fitted_xgb_regressor(xgb_model, booster, evals_result)
+    if early_stopping:
+        logger.info(
+            f"Best iteration: {booster.best_iteration + 1} of "
+            f"{booster.num_boosted_rounds()}, validation RMSE "
+            f"{booster.best_score:.2f}."
+        )
+
+    # Reference error of the next warm start, on the holdout or else the training set
+    info["rmse"] = (
+        model_rmse(xgb_model, X_val, y_val)
+        if len(X_val) > 0
+        else model_rmse(xgb_model, X_train, y_train)
     )
 
     # Log the completion of the training process
     logger.info("XGBoost model training completed successfully.")
 
-    return xgb_model
+    return xgb_model, info
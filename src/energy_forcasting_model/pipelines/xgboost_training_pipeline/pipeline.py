@@ -15,13 +15,22 @@ def create_pipeline(**kwargs) -> Pipeline:
             node(  # Node 1
                 func=train_xgboost_model,
                 inputs=[
-                    "X_train",
-                    "y_train",
+                    "model_input_fit_features",
+                    "model_input_fit_target",
+                    "model_input_validation_features",
+                    "model_input_validation_target",
+                    "model_input_cache",
+                    "model_input_fingerprint",
                     "params:xgboost_model_params",
+                    "tuned_params",
+                    "params:training.use_tuned_params",
+                    "previous_xgboost_model",
+                    "previous_xgboost_training_info",
+                    "params:training.warm_start",
                 ],
-                outputs="xgboost_model",
+                outputs=["xgboost_model", "xgboost_training_info"],
                 name="train_xgboost_model_node",
-                tags=["model_training", "xgboost"],
+                tags=["model_training", "model_fit", "xgboost"],
             ),
             node(  # Node 2
                 func=plot_feature_importance,
@@ -54,6 +63,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                     "y_train",
                     "y_test",
                     "xgboost_model_predictions",
+                    "params:reporting.max_plot_points",
                 ],
                 outputs="real_data_and_xgboost_predictions_plot",
                 name="plot_real_data_and_predictions_node",
@@ -62,14 +72,29 @@ def create_pipeline(**kwargs) -> Pipeline:
         ],
         tags="model_training",
         namespace="xgboost_training_pipeline",
+        parameters={
+            "params:reporting.max_plot_points",
+            "params:training.use_tuned_params",
+            "params:training.warm_start",
+        },
         inputs=[
             "X_train",
             "y_train",
             "X_test",
             "y_test",
+            "model_input_fit_features",
+            "model_input_fit_target",
+            "model_input_validation_features",
+            "model_input_validation_target",
+            "model_input_cache",
+            "model_input_fingerprint",
+            "tuned_params",
+            "previous_xgboost_model",
+            "previous_xgboost_training_info",
         ],
         outputs=[
             "xgboost_model",
+            "xgboost_training_info",
             "xgboost_feature_importance_plot",
             "real_data_and_xgboost_predictions_plot",
         ],
@@ -0,0 +1,191 @@
+"""Report plots described as lightweight specs and rendered off the critical path of the
+pipelines, in background worker processes.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from kedro.io import DatasetError
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlotSpec:
+    """The data of a plot and the module-level function drawing it, so the figure can be
+    drawn later and in another process.
+
+    Attributes:
+        draw: Function taking the data as keyword arguments and returning the figure.
+        data: The data to plot, and any layout option ``draw`` accepts.
+    """
+
+    draw: Callable[..., Figure]
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def figure(self) -> Figure:
+        return self.draw(**self.data)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Selects the points of a series to keep with the Largest-Triangle-Three-Buckets
+    algorithm, which keeps the shape and the peaks of the series with few points.
+
+    The first and last points are kept, and the others are split into ``n_out - 2``
+    buckets. In every bucket, the point kept is the one forming the largest triangle with
+    the point kept in the previous bucket and the mean of the next bucket. The buckets
+    are processed in turn, each with array operations, and the bucket means are computed
+    all at once, so every point is only visited a few times.
+
+    Args:
+        x: The positions of the points, increasing.
+        y: The values of the points.
+        n_out: The number of points to keep, at least 3.
+
+    Returns:
+        The sorted positions of the points kept.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # Bucket edges over the points between the first and the last one
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    means_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / np.diff(edges)
+    means_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / np.diff(edges)
+    # The last bucket looks ahead to the last point
+    next_x = np.append(means_x[1:], x[-1])
+    next_y = np.append(means_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype="int64")
+    indices[0], indices[-1] = 0, n - 1
+    kept = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        a_x, a_y = x[kept], y[kept]
+        areas = np.abs(
+            (a_x - next_x[bucket]) * (y[start:stop] - a_y)
+            - (a_x - x[start:stop]) * (next_y[bucket] - a_y)
+        )
+        kept = start + int(np.argmax(np.nan_to_num(areas, nan=-1.0)))
+        indices[bucket + 1] = kept
+    return indices
+
+
+def downsample(series: pd.Series, max_points: Optional[int]) -> pd.Series:
+    """Keeps at most ``max_points`` points of a time series to plot, picked with LTTB,
+    or the whole series when ``max_points`` is None."""
+    if max_points is None or len(series) <= max_points:
+        return series
+    index = series.index
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(index))
+    return series.iloc[lttb_indices(x, series.to_numpy(), max(max_points, 3))]
+
+
+def render_to_file(
+    plot: Any, filepath: str, save_args: Optional[Dict[str, Any]] = None
+) -> str:
+    """Draws a plot spec, or takes a ready figure, and writes it to a file."""
+    fig = plot.figure() if isinstance(plot, PlotSpec) else plot
+    Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(filepath, **(save_args or {}))
+    plt.close(fig)
+    return filepath
+
+
+def _init_worker() -> None:
+    plt.switch_backend("Agg")
+
+
+class ReportRenderer:
+    """Renders the report plots saved during a run in a pool of worker processes.
+
+    Until it is configured with workers, e.g. outside of a Kedro run, plots are rendered
+    when they are saved. Once configured, saving a plot only submits it to the pool, and
+    ``wait`` blocks until all the submitted plots are written.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._n_workers = 0
+        self._pid = os.getpid()
+        self._executor = None
+        self._jobs = {}
+        self._start = None
+        # Nodes run by a ThreadRunner save their plots from several threads
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool = True, n_workers: int = 0) -> None:
+        """Sets whether plots are rendered at all, and by how many worker processes."""
+        self.enabled = enabled
+        self._n_workers = n_workers
+        self._pid = os.getpid()
+        if not enabled:
+            logger.info("Report plots are disabled and will not be rendered.")
+
+    def submit(
+        self, plot: Any, filepath: str, save_args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Renders a plot to a file in the background, or right away without workers."""
+        if not self.enabled:
+            logger.debug(f"Skipped the report plot {filepath}.")
+            return
+        # Processes started by a parallel runner render their plots themselves
+        if self._n_workers == 0 or os.getpid() != self._pid:
+            render_to_file(plot, filepath, save_args)
+            return
+
+        with self._lock:
+            if self._executor is None:
+                # Forked workers would inherit the state of the running pipeline
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._n_workers,
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                self._start = time.perf_counter()
+            future = self._executor.submit(render_to_file, plot, filepath, save_args)
+            self._jobs[future] = filepath
+
+    def wait(self) -> None:
+        """Waits for the submitted plots, and raises if any of them failed."""
+        if self._executor is None:
+            return
+        failed = []
+        for future in as_completed(self._jobs):
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Failed to render {self._jobs[future]}: {error}")
+                failed.append(self._jobs[future])
+        self._executor.shutdown()
+        logger.info(
+            f"Rendered {len(self._jobs) - len(failed)} report plots in the background, "
+            f"{time.perf_counter() - self._start:.1f}s after the first one was saved."
+        )
+        self._executor = None
+        self._jobs = {}
+        if failed:
+            raise DatasetError(f"Failed to render the report plots {failed}.")
+
+    def cancel(self) -> None:
+        """Drops the plots not rendered yet, e.g. when the pipeline failed."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            self._jobs = {}
+
+
+renderer = ReportRenderer()
@@ -7,7 +7,9 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # from pandas_viz.hooks import ProjectHooks
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+from energy_forcasting_model.hooks import ReportingHooks, TrainingHooks  # noqa: E402
+
+HOOKS = (ReportingHooks(), TrainingHooks())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
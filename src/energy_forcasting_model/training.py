@@ -0,0 +1,300 @@
+"""Scheduling of the model trainings of a run, which share a budget of CPU cores when
+they run at the same time, accounting of their wall and estimated CPU time, and the
+choice between a warm start and a full retrain of the boosting models.
+"""
+
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .pipelines.data_processing_pipeline.nodes import time_index
+
+logger = logging.getLogger(__name__)
+
+# Models trained by the model pipelines, each tagging its training node
+MODELS = ("xgboost", "lightgbm", "catboost", "random_forest")
+
+# Tag of the nodes training a model
+TRAINING_TAG = "model_fit"
+
+# Parameters setting the number of threads of each model library
+THREAD_PARAMS = ("n_jobs", "thread_count")
+
+
+def thread_params(model) -> list:
+    """Lists the parameters setting the number of threads of a model."""
+    names = set(model.get_params()) | set(inspect.signature(type(model)).parameters)
+    return [param for param in THREAD_PARAMS if param in names]
+
+
+def available_cores() -> int:
+    """The number of cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def split_core_budget(
+    budget: int, models: Iterable[str], shares: Optional[Dict[str, float]] = None
+) -> Dict[str, int]:
+    """Splits a budget of cores between models training at the same time, in proportion
+    to their shares, with at least one core each.
+
+    The cores left by rounding down go to the models with the largest remainders, so
+    the thread counts add up to the budget whenever it has a core per model.
+
+    Args:
+        budget: The number of cores to split.
+        models: The models training at the same time.
+        shares: The share of the budget of every model, 1 for the models missing.
+
+    Returns:
+        The number of threads of every model.
+    """
+    models = list(models)
+    if not models:
+        return {}
+    weights = {model: float((shares or {}).get(model, 1)) for model in models}
+    total = sum(weights.values())
+    exact = {model: budget * weight / total for model, weight in weights.items()}
+    threads = {model: int(exact[model]) for model in models}
+    spare = budget - sum(threads.values())
+    for model in sorted(models, key=lambda m: threads[m] - exact[m])[:spare]:
+        threads[model] += 1
+    return {model: max(count, 1) for model, count in threads.items()}
+
+
+class TrainingScheduler:
+    """Gives the model trainings of a run their thread counts, and measures them.
+
+    Kedro runs the nodes one after another by default, with the ``SequentialRunner``,
+    and then every model gets the whole budget. The models only train at the same time
+    with a parallel runner, e.g. ``kedro run --runner=ThreadRunner``, and then the core
+    budget is split between them so they do not oversubscribe the cores. Until it is
+    planned, e.g. outside of a Kedro run, every library keeps its own default.
+
+    The CPU time of a model is an estimate: the libraries train on native threads that
+    Python cannot measure one by one, so the CPU time of the whole process is split
+    between the models training at the time in proportion to their threads. It also
+    counts the CPU time of any other node running at the same time.
+    """
+
+    def __init__(self) -> None:
+        self.core_budget = None
+        self.shares = {}
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._running = {}
+        self._times = {}
+        self._last_cpu = 0.0
+
+    def configure(
+        self, core_budget: Optional[int] = None, shares: Optional[Dict] = None
+    ) -> None:
+        """Sets the cores shared by the trainings, all the available ones when None,
+        and the share of the budget of every model."""
+        self.core_budget = core_budget or available_cores()
+        self.shares = shares or {}
+
+    def plan(self, models: Iterable[str], concurrent: bool) -> None:
+        """Gives their thread counts to the models trained by a run."""
+        models = list(models)
+        budget = self.core_budget or available_cores()
+        if concurrent:
+            self._threads = split_core_budget(budget, models, self.shares)
+            if len(models) > budget:
+                logger.warning(
+                    f"{len(models)} models train at the same time on {budget} cores, "
+                    f"the cores are oversubscribed."
+                )
+        else:
+            self._threads = {model: budget for model in models}
+            if len(models) > 1:
+                logger.info(
+                    "The models train one after another, run with "
+                    "`--runner=ThreadRunner` to train them at the same time."
+                )
+        self._times = {}
+        if self._threads:
+            logger.info(
+                f"Training {', '.join(models)} "
+                f"{'concurrently' if concurrent else 'one after another'} on {budget} "
+                f"cores, with threads {self._threads}."
+            )
+
+    def threads(self, model: str, default: Optional[int] = None) -> Optional[int]:
+        """The number of threads a model trains with, or ``default`` if not planned."""
+        return self._threads.get(model, default)
+
+    def _account_cpu(self) -> None:
+        cpu = time.process_time()
+        total = sum(self._running.values())
+        for model, threads in self._running.items():
+            self._times[model]["cpu"] += (cpu - self._last_cpu) * threads / total
+        self._last_cpu = cpu
+
+    def start(self, model: str) -> None:
+        """Marks the start of the training of a model."""
+        with self._lock:
+            self._account_cpu()
+            self._running[model] = self.threads(model, 1)
+            self._times[model] = {"start": time.perf_counter(), "wall": 0.0, "cpu": 0.0}
+
+    def stop(self, model: str) -> None:
+        """Marks the end, or failure, of the training of a model."""
+        with self._lock:
+            if model not in self._running:
+                return
+            self._account_cpu()
+            del self._running[model]
+            times = self._times[model]
+            times["wall"] = time.perf_counter() - times["start"]
+            logger.info(
+                f"Trained {model} in {times['wall']:.1f}s wall time and "
+                f"an estimated {times['cpu']:.1f}s CPU time, with "
+                f"{self.threads(model)} threads."
+            )
+
+    def report(self) -> pd.DataFrame:
+        """Logs and returns the wall and estimated CPU time of every model trained."""
+        report = pd.DataFrame(
+            [
+                {
+                    "model": model,
+                    "threads": self.threads(model),
+                    "wall_time": round(times["wall"], 2),
+                    "cpu_time_estimate": round(times["cpu"], 2),
+                }
+                for model, times in self._times.items()
+            ],
+            columns=["model", "threads", "wall_time", "cpu_time_estimate"],
+        )
+        if not report.empty:
+            first_start = min(times["start"] for times in self._times.values())
+            last_stop = max(
+                times["start"] + times["wall"] for times in self._times.values()
+            )
+            logger.info(
+                f"Training times (s):\n{report.to_string(index=False)}\n"
+                f"Total training wall time: {last_stop - first_start:.1f}s."
+            )
+        return report
+
+
+scheduler = TrainingScheduler()
+
+
+def training_info(model, features: pd.DataFrame) -> dict:
+    """Describes what a model is trained on, for the next run to tell whether it can
+    continue boosting it: the end of its training period, its features and its
+    parameters. The trainer adds the `rmse` of the fitted model, see ``model_rmse``.
+
+    Args:
+        model: The model, with the parameters it is trained with.
+        features: The features it is trained on.
+
+    Returns:
+        The JSON serializable training info.
+    """
+    params = {
+        key: value
+        for key, value in model.get_params().items()
+        if key not in THREAD_PARAMS
+    }
+    return {
+        "trained_until": str(time_index(features.index).max()),
+        "rows": len(features),
+        "features": list(features.columns),
+        "dtypes": [str(dtype) for dtype in features.dtypes],
+        # Compared with the parameters saved in JSON, so made JSON-like
+        "params": json.loads(json.dumps(params, sort_keys=True, default=str)),
+    }
+
+
+def model_rmse(model, features: pd.DataFrame, target: pd.Series) -> float:
+    """The RMSE of a fitted model, the reference error of its warm starts when
+    measured on its validation holdout."""
+    return float(np.sqrt(np.mean((model.predict(features) - np.asarray(target)) ** 2)))
+
+
+def warm_start_rows(
+    model_name: str,
+    previous_model,
+    previous_info: Optional[dict],
+    info: dict,
+    features: pd.DataFrame,
+    target: pd.Series,
+    params: dict,
+) -> Optional[np.ndarray]:
+    """Picks the rows to continue boosting the previously saved model on, or decides to
+    retrain it from scratch.
+
+    The model is retrained when warm starts are off, when there is no previous model,
+    when its features or parameters changed, or when the data drifted: the RMSE of the
+    previous model on the rows added since its training is more than `max_error_ratio`
+    times its reference RMSE. Otherwise it continues boosting on the rows added since,
+    along with the last `recent_period` of the training period.
+
+    Args:
+        model_name: The name of the model, for the logs.
+        previous_model: Loads the previously saved model, None if there is none. It is
+            only called to measure the drift.
+        previous_info: The training info of the previous model.
+        info: The training info of the model to train.
+        features: The features to train on.
+        target: The target to train on.
+        params: The warm start parameters (`enabled`, `max_error_ratio`,
+            `recent_period`).
+
+    Returns:
+        The mask of the rows to continue boosting on, without any row when nothing was
+        added since the previous training, or None for a full retrain.
+    """
+    if not params.get("enabled"):
+        return None
+    if previous_model is None or previous_info is None:
+        reason = "there is no previous model"
+    elif (previous_info["features"], previous_info["dtypes"]) != (
+        info["features"],
+        info["dtypes"],
+    ):
+        reason = "its features changed"
+    elif previous_info["params"] != info["params"]:
+        reason = "its parameters changed"
+    else:
+        times = time_index(features.index)
+        added = np.asarray(times > pd.Timestamp(previous_info["trained_until"]))
+        if not added.any():
+            logger.info(
+                f"Keeping the previous {model_name} model, no rows were added since "
+                f"its training until {previous_info['trained_until']}."
+            )
+            return added
+        rmse = model_rmse(previous_model(), features[added], target[added])
+        error_ratio = rmse / previous_info["rmse"]
+        if error_ratio > params["max_error_ratio"]:
+            reason = (
+                f"its RMSE on the {added.sum()} rows added is {rmse:.2f}, "
+                f"{error_ratio:.1f} times its reference RMSE"
+            )
+        else:
+            rows = added
+            if params.get("recent_period") is not None:
+                rows = rows | np.asarray(
+                    times > times.max() - pd.Timedelta(params["recent_period"])
+                )
+            logger.info(
+                f"Warm starting {model_name} on {rows.sum()} recent rows, "
+                f"{added.sum()} of them added since its training until "
+                f"{previous_info['trained_until']}, on which its RMSE is {rmse:.2f}."
+            )
+            return rows
+    logger.info(f"Retraining {model_name} from scratch, {reason}.")
+    return None
@@ -0,0 +1,211 @@
+"""
+This is a boilerplate test file for pipeline 'catboost_pipeline'
+generated using Kedro 0.19.3.
+Please add your pipeline tests here.
+
+Kedro recommends using `pytest` framework, more info about it can be found
+in the official documentation:
+https://docs.pytest.org/en/latest/getting-started.html
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from energy_forcasting_model.datasets import (
+    ModelArtifactDataset,
+    ModelInputCacheDataset,
+)
+from energy_forcasting_model.pipelines.catboost_pipeline.nodes import (
+    train_catboost_model,
+)
+from energy_forcasting_model.pipelines.model_input_pipeline.nodes import (
+    build_native_dataset,
+    build_native_datasets,
+)
+from energy_forcasting_model.training import training_info, warm_start_rows
+
+CATBOOST_PARAMS = {
+    "iterations": 200,
+    "depth": 3,
+    "learning_rate": 0.1,
+    "loss_function": "RMSE",
+    "eval_metric": "RMSE",
+    "verbose_eval": False,
+    "random_state": 42,
+    "early_stopping_rounds": 20,
+}
+
+WARM_START = {
+    "enabled": True,
+    "max_added_trees": 10,
+    "recent_period": "100D",
+    "max_error_ratio": 1.5,
+}
+
+
+def _model_input(n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    features = pd.DataFrame(rng.standard_normal((n_days, 3)), index=index)
+    features.columns = ["a", "b", "c"]
+    target = features["a"] * 3.0 + features["b"] ** 2 + rng.standard_normal(n_days)
+    return features, target.rename("target")
+
+
+def _previous(features, target, n_days, level=0.0):
+    """A constant model trained on the first days, with an RMSE of 1."""
+    model = DummyRegressor(strategy="constant", constant=level)
+    model.fit(features[:n_days], target[:n_days])
+    info = {**training_info(model, features[:n_days]), "rmse": 1.0}
+    return model, info
+
+
+def _rows(model, previous_info, features, target, **params):
+    info = training_info(model, features)
+    return warm_start_rows(
+        "dummy",
+        lambda: model,
+        previous_info,
+        info,
+        features,
+        target,
+        {**WARM_START, **params},
+    )
+
+
+def test_warm_start_continues_on_the_recent_rows():
+    features, target = _model_input(400)
+    # The target of the rows added is within 1.5 times the reference RMSE of 0
+    target[300:] = 1.2
+    model, previous_info = _previous(features, target, 300)
+
+    rows = _rows(model, previous_info, features, target, recent_period="150D")
+
+    # The 100 rows added, and those of the last 150 days
+    np.testing.assert_array_equal(rows, np.arange(400) >= 250)
+    rows = _rows(model, previous_info, features, target, recent_period=None)
+    np.testing.assert_array_equal(rows, np.arange(400) >= 300)
+
+
+def test_warm_start_keeps_the_model_without_new_rows():
+    features, target = _model_input(300)
+    model, previous_info = _previous(features, target, 300)
+
+    rows = _rows(model, previous_info, features, target)
+
+    assert rows is not None and not rows.any()
+
+
+@pytest.mark.parametrize("change", ["disabled", "features", "no rows added"])
+def test_warm_start_only_loads_the_previous_model_to_measure_drift(change):
+    features, target = _model_input(400)
+    model, previous_info = _previous(features, target, 300)
+    params = {}
+    if change == "disabled":
+        params["enabled"] = False
+    elif change == "features":
+        features = features.rename(columns={"c": "d"})
+    else:
+        features, target = features[:300], target[:300]
+
+    def load():
+        raise AssertionError("The previous model was loaded.")
+
+    info = training_info(model, features)
+    warm_start_rows(
+        "dummy", load, previous_info, info, features, target, {**WARM_START, **params}
+    )
+
+
+@pytest.mark.parametrize(
+    "change", ["disabled", "no previous model", "features", "params", "drift"]
+)
+def test_warm_start_retrains_from_scratch(change):
+    features, target = _model_input(400)
+    target[300:] = 1.2
+    model, previous_info = _previous(features, target, 300)
+    params = {}
+    if change == "disabled":
+        params["enabled"] = False
+    elif change == "no previous model":
+        previous_info = None
+    elif change == "features":
+        features = features.rename(columns={"c": "d"})
+    elif change == "params":
+        model.set_params(constant=1.0)
+    elif change == "drift":
+        target[300:] = 1.6
+
+    assert _rows(model, previous_info, features, target, **params) is None
+
+
+def _train_catboost(features, target, previous_model=None, previous_info=None):
+    fit, validation = slice(None, -60), slice(-60, None)
+    pool = build_native_dataset("catboost", features[fit], target[fit], {})
+    return train_catboost_model(
+        features[fit],
+        target[fit],
+        features[validation],
+        target[validation],
+        {"fingerprint": {"catboost": lambda: pool}},
+        "fingerprint",
+        CATBOOST_PARAMS,
+        previous_model=previous_model,
+        previous_info=previous_info,
+        warm_start={**WARM_START, "max_error_ratio": 100.0},
+    )
+
+
+def test_catboost_model_round_trip(tmp_path):
+    features, target = _model_input(400)
+    model, _ = _train_catboost(features, target)
+    dataset = ModelArtifactDataset(
+        filepath=str(tmp_path / "catboost_model.cbm"), library="catboost"
+    )
+    dataset.save(model)
+    loaded = dataset.load()
+
+    # The parameters are those of the model, not the training parameters of the file
+    assert loaded.get_params() == model.get_params()
+    np.testing.assert_array_equal(loaded.predict(features), model.predict(features))
+    np.testing.assert_allclose(
+        loaded.get_feature_importance(), model.feature_importances_
+    )
+
+
+def test_catboost_warm_start_adds_at_most_max_added_trees():
+    features, target = _model_input(460)
+    previous_model, previous_info = _train_catboost(features[:400], target[:400])
+    n_trees = previous_model.tree_count_
+
+    model, info = _train_catboost(
+        features, target, lambda: previous_model, previous_info
+    )
+
+    assert n_trees < model.tree_count_ <= n_trees + WARM_START["max_added_trees"]
+    # The model keeps its parameters, so the next run can warm start it again
+    assert model.get_params() == previous_model.get_params()
+    assert model.get_params()["iterations"] == CATBOOST_PARAMS["iterations"]
+    assert info["params"] == previous_info["params"]
+
+
+def test_model_input_cache_keeps_the_last_model_input_only(tmp_path):
+    cache = ModelInputCacheDataset(filepath=str(tmp_path / "model_input_cache"))
+    params = {"native_datasets": {"catboost": {}}}
+    features, target = _model_input(120)
+    first, update = build_native_datasets(features, target, params, {})
+    cache.save(update)
+
+    fingerprint, update = build_native_datasets(features, target, params, cache.load())
+    assert fingerprint == first and update == {first: {"catboost": None}}
+    cache.save(update)
+    assert list(cache.load()) == [first]
+
+    fingerprint, update = build_native_datasets(
+        features[:100], target[:100], params, cache.load()
+    )
+    cache.save(update)
+    assert fingerprint != first and list(cache.load()) == [fingerprint]
+    assert cache.load()[fingerprint]["catboost"]().num_row() == 100
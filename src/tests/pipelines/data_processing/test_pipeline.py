@@ -7,3 +7,461 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+
+import json
+import os
+import shutil
+import zipfile
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_forcasting_model.datasets import (
+    MonthPartitionedParquetDataset,
+    SchemaDataset,
+)
+from energy_forcasting_model.datasets.schema_dataset import apply_schema
+from energy_forcasting_model.pipelines.data_processing_pipeline.nodes import (
+    aggregate_power_consumption,
+    asof_positions,
+    clean_string,
+    compute_processing_watermark,
+    encode_with_vocabulary,
+    learn_weather_conditions_vocabulary,
+    merge_consumption_and_weather_data,
+    select_incremental_interval,
+    upsert_processed_data,
+)
+
+
+def _readings(start, end):
+    timestamps = pd.date_range(start, end, freq="h", inclusive="left")
+    return pd.DataFrame(
+        {
+            "Date": timestamps.strftime("%d/%m/%Y"),
+            "Time": timestamps.strftime("%H:%M:%S"),
+            "Global_active_power": np.arange(len(timestamps), dtype=float),
+        }
+    )
+
+
+def _write_source(path, readings, append=False):
+    readings.to_csv(
+        path, sep=";", index=False, mode="a" if append else "w", header=not append
+    )
+
+
+def _dataset(tmp_path, **kwargs):
+    return MonthPartitionedParquetDataset(
+        filepath=str(tmp_path / "cache"),
+        source_filepath=str(tmp_path / "source.csv"),
+        source_load_args={"sep": ";", "chunksize": 100},
+        **kwargs,
+    )
+
+
+def _load(dataset):
+    return pd.concat(dataset.load(), ignore_index=True)
+
+
+def _part_mtimes(cache, month):
+    return {
+        part.name: part.stat().st_mtime_ns
+        for part in (cache / f"month={month}").iterdir()
+    }
+
+
+def test_cache_loads_in_batches(tmp_path):
+    _write_source(tmp_path / "source.csv", _readings("2020-01-01", "2020-02-01"))
+    dataset = _dataset(tmp_path, columns=["Date", "Global_active_power"])
+
+    batches = list(dataset.load())
+
+    assert max(len(batch) for batch in batches) <= 100
+    assert sum(len(batch) for batch in batches) == 31 * 24
+    assert batches[0]["Date"].dtype == "datetime64[ns]"
+
+
+def test_cache_appends_new_rows_and_rewrites_last_month(tmp_path):
+    source = tmp_path / "source.csv"
+    _write_source(source, _readings("2020-01-01", "2020-02-10"))
+    dataset = _dataset(tmp_path)
+    _load(dataset)
+    january = _part_mtimes(tmp_path / "cache", "2020-01")
+
+    _write_source(source, _readings("2020-02-10", "2020-03-05"), append=True)
+    appended = _load(dataset)
+
+    # The full months before the last cached day are not rewritten
+    assert _part_mtimes(tmp_path / "cache", "2020-01") == january
+    manifest = json.loads((tmp_path / "cache" / "_source.json").read_text())
+    assert manifest["last_date"] == "2020-03-04"
+
+    (tmp_path / "rebuilt").mkdir()
+    shutil.copy(source, tmp_path / "rebuilt" / "source.csv")
+    rebuilt = _load(_dataset(tmp_path / "rebuilt"))
+    sort_columns = ["Date", "Time"]
+    pd.testing.assert_frame_equal(
+        appended.sort_values(sort_columns, ignore_index=True),
+        rebuilt.sort_values(sort_columns, ignore_index=True),
+    )
+
+
+def test_cache_is_rebuilt_when_historical_rows_change(tmp_path):
+    source = tmp_path / "source.csv"
+    readings = _readings("2020-01-01", "2020-02-10")
+    _write_source(source, readings)
+    dataset = _dataset(tmp_path)
+    _load(dataset)
+
+    # Same size, corrected January reading
+    readings.loc[5, "Global_active_power"] = 9.0
+    _write_source(source, readings)
+    loaded = _load(dataset)
+
+    assert loaded.loc[5, "Global_active_power"] == 9.0
+    assert len(loaded) == len(readings)
+
+
+def test_touched_source_only_rewrites_the_last_month(tmp_path):
+    source = tmp_path / "source.csv"
+    _write_source(source, _readings("2020-01-01", "2020-02-10"))
+    dataset = _dataset(tmp_path)
+    expected = _load(dataset)
+    january = _part_mtimes(tmp_path / "cache", "2020-01")
+
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1))
+
+    pd.testing.assert_frame_equal(_load(dataset), expected)
+    assert _part_mtimes(tmp_path / "cache", "2020-01") == january
+
+
+def test_cache_appends_to_a_zipped_source(tmp_path):
+    readings = _readings("2020-01-01", "2020-03-05")
+    _write_source(tmp_path / "source.csv", readings[: 40 * 24])
+    dataset = MonthPartitionedParquetDataset(
+        filepath=str(tmp_path / "cache"),
+        source_filepath=str(tmp_path / "source.zip"),
+        source_load_args={"sep": ";", "chunksize": 100, "compression": "zip"},
+    )
+    with zipfile.ZipFile(tmp_path / "source.zip", "w") as archive:
+        archive.write(tmp_path / "source.csv", "source.csv")
+    _load(dataset)
+    january = _part_mtimes(tmp_path / "cache", "2020-01")
+
+    _write_source(tmp_path / "source.csv", readings[40 * 24 :], append=True)
+    with zipfile.ZipFile(tmp_path / "source.zip", "w") as archive:
+        archive.write(tmp_path / "source.csv", "source.csv")
+
+    assert len(_load(dataset)) == len(readings)
+    assert _part_mtimes(tmp_path / "cache", "2020-01") == january
+
+
+def test_cache_is_rebuilt_when_the_source_shrinks(tmp_path):
+    source = tmp_path / "source.csv"
+    _write_source(source, _readings("2020-01-01", "2020-03-01"))
+    dataset = _dataset(tmp_path)
+    _load(dataset)
+
+    _write_source(source, _readings("2020-01-01", "2020-01-15"))
+
+    assert len(_load(dataset)) == 14 * 24
+    assert not (tmp_path / "cache" / "month=2020-02").exists()
+
+
+def test_chunked_aggregation_matches_resample():
+    timestamps = pd.date_range("2020-01-01", periods=500, freq="min")
+    rng = np.random.default_rng(0)
+    readings = pd.DataFrame(
+        {
+            "Date": timestamps.strftime("%d/%m/%Y"),
+            "Time": timestamps.strftime("%H:%M:%S"),
+            "Global_active_power": rng.random(len(timestamps)),
+        }
+    )
+    readings.loc[rng.choice(len(readings), 50), "Global_active_power"] = np.nan
+    statistics = ["sum", "mean", "min", "max", "count"]
+
+    # Chunks of 70 rows split the 15 minute and hourly bins
+    aggregates = aggregate_power_consumption(
+        (readings[start : start + 70] for start in range(0, len(readings), 70)),
+        {"resolutions": ["1h", "15min"], "statistics": statistics},
+    )
+
+    consumption = readings.set_index(timestamps)["Global_active_power"]
+    for resolution in ["15min", "1h"]:
+        expected = consumption.resample(resolution).agg(statistics)
+        expected.columns = [f"total_consumption_{stat}" for stat in statistics]
+        pd.testing.assert_frame_equal(
+            aggregates[resolution], expected, check_dtype=False, check_freq=False
+        )
+
+
+def test_watermark_starts_the_load_at_the_watermark_day(tmp_path):
+    _write_source(tmp_path / "source.csv", _readings("2020-01-01", "2020-03-01"))
+    watermark = tmp_path / "watermark.json"
+    dataset = _dataset(
+        tmp_path, start_date="2020-01-10", watermark_filepath=str(watermark)
+    )
+
+    assert _load(dataset)["Date"].min() == pd.Timestamp("2020-01-10")
+
+    watermark.write_text(json.dumps({"watermark": "2020-02-20"}))
+    loaded = _load(dataset)
+
+    # The watermark day itself is reloaded, as it may have been partial
+    assert loaded["Date"].min() == pd.Timestamp("2020-02-20")
+    assert len(loaded) == 10 * 24
+
+
+def test_incremental_interval_starts_at_the_watermark():
+    params = {"date_interval": {"start_date": "2007-01-01", "end_date": "2010-01-01"}}
+
+    interval = select_incremental_interval(params, {"watermark": "2009-06-30"})
+
+    assert interval["date_interval"] == {"start_date": "2009-06-30", "end_date": None}
+    assert params["date_interval"]["start_date"] == "2007-01-01"
+
+
+def test_upsert_replaces_and_adds_days():
+    days = pd.date_range("2020-01-01", periods=4, freq="D")
+    processed = pd.DataFrame(
+        {
+            "total_consumption": [1.0, 2.0, 3.0, 4.0],
+            "conditions_rain": [True, False, True, False],
+        },
+        index=days,
+    )
+    # The last processed day was partial, and rain was not seen since
+    new = pd.DataFrame(
+        {"total_consumption": [40.0, 5.0]},
+        index=pd.date_range("2020-01-04", periods=2, freq="D"),
+    )
+
+    updated, watermark = upsert_processed_data(processed, new)
+
+    assert updated["total_consumption"].tolist() == [1.0, 2.0, 3.0, 40.0, 5.0]
+    assert updated["conditions_rain"].tolist() == [True, False, True, False, False]
+    assert updated["conditions_rain"].dtype == bool
+    assert updated.index.is_monotonic_increasing
+    assert watermark == {"watermark": "2020-01-05"}
+    assert watermark == compute_processing_watermark(updated)
+
+
+def test_upsert_is_idempotent():
+    processed = pd.DataFrame(
+        {"total_consumption": [1.0, 2.0, 3.0]},
+        index=pd.date_range("2020-01-01", periods=3, freq="D"),
+    )
+    new = processed.iloc[-2:]
+
+    updated, _ = upsert_processed_data(processed, new)
+    updated_again, _ = upsert_processed_data(updated, new)
+
+    pd.testing.assert_frame_equal(updated, processed)
+    pd.testing.assert_frame_equal(updated_again, processed)
+
+
+def _conditions(values):
+    return pd.Series(
+        values,
+        index=pd.date_range("2020-01-01", periods=len(values), freq="D"),
+        name="conditions",
+    )
+
+
+def test_vocabulary_is_sorted_and_cleaned():
+    weather = _conditions(["Rain, Overcast", "Clear", "rain overcast", None, "Clear"])
+
+    vocabulary = learn_weather_conditions_vocabulary(
+        weather.to_frame(), {"column_to_encode": "conditions"}
+    )
+
+    assert vocabulary == ["clear", "rainovercast"]
+
+
+def test_persisted_vocabulary_is_reused_and_only_extended_explicitly():
+    weather = _conditions(["Clear", "Hail", "Rain, Overcast"]).to_frame()
+    previous = ["rainovercast", "clear"]
+    params = {"column_to_encode": "conditions"}
+
+    kept = learn_weather_conditions_vocabulary(weather, params, previous)
+    extended = learn_weather_conditions_vocabulary(
+        weather, {**params, "extend_vocabulary": True}, previous
+    )
+
+    assert kept == previous
+    # The known values keep their columns, the new ones come after them
+    assert extended == ["rainovercast", "clear", "hail"]
+
+
+def test_encoding_matches_one_hot_of_the_cleaned_values():
+    conditions = _conditions(["Rain, Overcast", "Clear", "Snow", "Clear", "Overcast"])
+    vocabulary = sorted(conditions.map(clean_string).unique())
+
+    encoded = encode_with_vocabulary(conditions, vocabulary, prefix="conditions")
+
+    expected = pd.get_dummies(conditions.map(clean_string), prefix="conditions")
+    pd.testing.assert_frame_equal(encoded, expected)
+
+
+def test_encoding_columns_do_not_depend_on_the_values_seen(caplog):
+    vocabulary = ["clear", "overcast", "rainovercast"]
+    conditions = _conditions(["Clear", "Hail", None])
+
+    with caplog.at_level(logging.WARNING):
+        encoded = encode_with_vocabulary(conditions, vocabulary, prefix="conditions")
+
+    assert encoded.columns.tolist() == [
+        "conditions_clear",
+        "conditions_overcast",
+        "conditions_rainovercast",
+    ]
+    assert (encoded.dtypes == bool).all()
+    # Unknown and missing values have no column set
+    assert encoded.sum(axis=1).tolist() == [1, 0, 0]
+    assert "Hail" in caplog.text
+
+
+@pytest.mark.parametrize("direction", ["backward", "forward", "nearest"])
+@pytest.mark.parametrize("tolerance", [None, "0min", "30min", "2h"])
+def test_asof_positions_match_merge_asof(direction, tolerance):
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2020-01-01").value
+    minute = pd.Timedelta("1min").value
+    left = pd.DatetimeIndex(np.sort(start + rng.integers(0, 3000, 200) * minute))
+    right = pd.DatetimeIndex(np.unique(start + rng.integers(0, 3000, 40) * minute))
+
+    positions = asof_positions(left, right, direction=direction, tolerance=tolerance)
+
+    expected = pd.merge_asof(
+        pd.DataFrame({"time": left}),
+        pd.DataFrame({"time": right, "position": np.arange(len(right))}),
+        on="time",
+        direction=direction,
+        tolerance=None if tolerance is None else pd.Timedelta(tolerance),
+    )["position"]
+    matched = positions >= 0
+    np.testing.assert_array_equal(matched, expected.notna().to_numpy())
+    # Nearest ties may be broken either way, so compare the matched timestamps
+    np.testing.assert_array_equal(
+        right[positions[matched]], right[expected[matched].astype(int)]
+    )
+
+
+def test_asof_fill_limit_stays_within_groups():
+    left = pd.DatetimeIndex(
+        ["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-04"] * 2
+    )
+    right = pd.DatetimeIndex(["2020-01-01", "2020-01-04"])
+    groups = np.repeat(["a", "b"], 4)
+
+    positions = asof_positions(
+        left, right, tolerance="0min", fill_limit=1, groups=groups
+    )
+
+    # Only one unmatched day is filled after each match, and never across meters
+    np.testing.assert_array_equal(positions, [0, 0, -1, 1, 0, 0, -1, 1])
+
+
+def _hourly_consumption():
+    return pd.DataFrame(
+        {"total_consumption": np.arange(6, dtype=float)},
+        index=pd.date_range("2020-01-01 22:00", periods=6, freq="h"),
+    )
+
+
+def test_merge_aligns_daily_weather_onto_hourly_consumption():
+    weather = pd.DataFrame(
+        {"temp": [1.0, 2.0]},
+        index=pd.DatetimeIndex(["2020-01-01", "2020-01-02"]),
+    )
+    params = {"direction": "backward", "tolerance": "1D", "how": "inner"}
+
+    merged = merge_consumption_and_weather_data(_hourly_consumption(), weather, params)
+
+    assert merged.index.equals(_hourly_consumption().index)
+    assert merged["temp"].tolist() == [1.0, 1.0, 2.0, 2.0, 2.0, 2.0]
+
+
+@pytest.mark.parametrize("how, rows", [("inner", 2), ("left", 6)])
+def test_merge_drops_or_keeps_rows_beyond_the_tolerance(how, rows):
+    weather = pd.DataFrame(
+        {"temp": [1.0, 2.0]},
+        index=pd.DatetimeIndex(["2020-01-01 22:00", "2020-01-02 02:00"]),
+    )
+    params = {"direction": "backward", "tolerance": "0min", "how": how}
+
+    merged = merge_consumption_and_weather_data(_hourly_consumption(), weather, params)
+
+    assert len(merged) == rows
+    assert merged["temp"].notna().sum() == 2
+    assert merged["total_consumption"].tolist() == (
+        [0.0, 4.0] if how == "inner" else list(np.arange(6.0))
+    )
+
+
+PROCESSED_SCHEMA = [
+    {"columns": ["is_holiday", "is_bridge_day", "conditions_*"], "dtype": "bool"},
+    {"columns": ["*"], "dtype": "float32"},
+]
+
+
+def test_apply_schema_uses_the_first_matching_rule():
+    data = pd.DataFrame(
+        {
+            "temp": [1.5, 2.5],
+            "conditions_rain": [True, False],
+            "is_holiday": [0.0, 1.0],
+            "total_consumption": [1000, 2000],
+        }
+    )
+
+    typed = apply_schema(data, PROCESSED_SCHEMA)
+
+    assert typed.dtypes.astype(str).to_dict() == {
+        "temp": "float32",
+        "conditions_rain": "bool",
+        "is_holiday": "bool",
+        "total_consumption": "float32",
+    }
+    assert typed["is_holiday"].tolist() == [False, True]
+
+
+def test_apply_schema_keeps_missing_flags_missing():
+    data = pd.DataFrame({"is_holiday": pd.Series([True, None, False], dtype=object)})
+
+    typed = apply_schema(data, PROCESSED_SCHEMA)
+
+    assert typed["is_holiday"].dtype == "boolean"
+    assert typed["is_holiday"].isna().tolist() == [False, True, False]
+
+
+def test_schema_is_enforced_on_save_and_load(tmp_path):
+    dataset = SchemaDataset(
+        dataset={
+            "type": "pandas.CSVDataset",
+            "filepath": str(tmp_path / "processed.csv"),
+            "save_args": {"index": True},
+            "load_args": {"index_col": 0, "parse_dates": [0]},
+        },
+        schema=PROCESSED_SCHEMA,
+    )
+    data = pd.DataFrame(
+        {"temp": [1.25, 2.5], "conditions_rain": [1, 0]},
+        index=pd.date_range("2020-01-01", periods=2, freq="D"),
+    )
+
+    dataset.save(data)
+    loaded = dataset.load()
+
+    # Saving does not cast the data of the node
+    assert data.dtypes.astype(str).tolist() == ["float64", "int64"]
+    assert loaded.dtypes.astype(str).tolist() == ["float32", "bool"]
+    assert loaded["conditions_rain"].tolist() == [True, False]
+    pd.testing.assert_frame_equal(
+        loaded, apply_schema(data.copy(), PROCESSED_SCHEMA), check_freq=False
+    )
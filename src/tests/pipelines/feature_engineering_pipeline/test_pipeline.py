@@ -7,3 +7,288 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_forcasting_model.datasets import FeatureCacheDataset
+from energy_forcasting_model.pipelines.feature_engineering_pipeline.nodes import (
+    build_feature_state,
+    create_features,
+    create_features_with_cache,
+    ewm_features,
+    lag_features,
+    rolling_max_features,
+    rolling_mean_features,
+    rolling_min_features,
+    rolling_features,
+    rolling_std_features,
+    update_feature_state,
+)
+
+FEATURE_PARAMS = {
+    "basic_features": ["dayofweek", "month"],
+    "column_names": ["total_consumption", "temp"],
+    "lags": [1, 2, 7],
+    "window_sizes": [2, 3, 7, 12],
+    "rolling_statistics": ["mean", "std", "min", "max", "ewm"],
+    "online_state": {"max_rewind": 3},
+}
+
+# No calendar columns, so the basic features are read from the index
+CALENDAR = pd.DataFrame(index=pd.date_range("2019-01-01", "2021-12-31", freq="D"))
+
+
+def _processed_data(n_days, start="2020-01-01", seed=0):
+    rng = np.random.default_rng(seed)
+    consumption = 1500.0 + 400.0 * rng.standard_normal(n_days)
+    # A constant stretch, whose windows have an std of exactly zero
+    consumption[20:35] = 1234.5
+    temp = 12.0 + 6.0 * rng.standard_normal(n_days)
+    temp[[day for day in (5, 40, 41) if day < n_days]] = np.nan
+    return pd.DataFrame(
+        {"total_consumption": consumption, "temp": temp},
+        index=pd.date_range(start, periods=n_days, freq="D"),
+    )
+
+
+def _features(df):
+    featured, created = create_features(df.copy(), FEATURE_PARAMS, CALENDAR)
+    return featured[created]
+
+
+def _online_features(history, new_rows, chunk_size=7):
+    """Featurizes the new rows chunk by chunk from the state of the history."""
+    state = build_feature_state(history, FEATURE_PARAMS)
+    featured = []
+    for start in range(0, len(new_rows), chunk_size):
+        chunk, created, state = update_feature_state(
+            state, new_rows.iloc[start : start + chunk_size], FEATURE_PARAMS, CALENDAR
+        )
+        featured.append(chunk[created])
+    return pd.concat(featured)
+
+
+def _assert_equal_features(online, batch):
+    assert online.columns.tolist() == batch.columns.tolist()
+    assert online.index.equals(batch.index)
+    for name in batch.columns:
+        # Bit for bit, missing values included
+        assert np.array_equal(
+            online[name].to_numpy(dtype="float64"),
+            batch[name].to_numpy(dtype="float64"),
+            equal_nan=True,
+        ), name
+
+
+def test_online_features_equal_batch_features():
+    df = _processed_data(120)
+
+    online = _online_features(df.iloc[:50], df.iloc[50:])
+
+    _assert_equal_features(online, _features(df).iloc[50:])
+
+
+def test_online_features_from_an_empty_history():
+    df = _processed_data(60)
+
+    online = _online_features(df.iloc[:0], df)
+
+    _assert_equal_features(online, _features(df))
+
+
+@pytest.mark.parametrize("first_temp", [0, 58])
+def test_online_features_replace_rewound_rows(first_temp):
+    df = _processed_data(90)
+    # The std of temp is centered on a replaced row when its first values are missing
+    df.iloc[:first_temp, 1] = np.nan
+    # The last 3 days of the history were partially recorded, with other values
+    partial = df.iloc[:60].copy()
+    partial.iloc[-3:] = [[10.0, np.nan], [20.0, 1.0], [30.0, 2.0]]
+
+    online = _online_features(partial, df.iloc[57:], chunk_size=5)
+
+    _assert_equal_features(online, _features(df).iloc[57:])
+
+
+def test_online_state_rejects_rewinding_too_far():
+    df = _processed_data(30)
+    state = build_feature_state(df, FEATURE_PARAMS)
+
+    with pytest.raises(ValueError, match="at most 3"):
+        update_feature_state(state, df.iloc[-4:], FEATURE_PARAMS, CALENDAR)
+
+
+def _panel(frames):
+    return pd.concat(frames, names=["meter", None])
+
+
+def test_online_panel_features_equal_batch_features():
+    meters = {
+        "a": _processed_data(80, seed=1),
+        "b": _processed_data(70, start="2020-01-11", seed=2),
+        "c": _processed_data(40, start="2020-02-20", seed=3),
+    }
+    df = _panel(meters)
+    # Meter c is new in the update, and meter b rewinds its last day
+    history = _panel({"a": meters["a"].iloc[:50], "b": meters["b"].iloc[:41]})
+    new_rows = _panel({"a": meters["a"].iloc[50:], "b": meters["b"].iloc[40:]})
+    new_rows = pd.concat([new_rows, _panel({"c": meters["c"]})])
+
+    state = build_feature_state(history, FEATURE_PARAMS)
+    online, created, _ = update_feature_state(
+        state, new_rows, FEATURE_PARAMS, CALENDAR
+    )
+
+    batch = _features(df)
+    _assert_equal_features(online[created], batch.loc[online.index])
+
+
+WINDOWS = [2, 3, 7, 12, 30]
+
+
+def _series(n_rows=400, seed=4):
+    rng = np.random.default_rng(seed)
+    values = 1e3 + 50.0 * rng.standard_normal((n_rows, 2))
+    values[100:140, 0] = 7.25
+    values[[10, 11, 250], 1] = np.nan
+    return values
+
+
+def _pandas_rolling(values, window, statistic):
+    rolling = pd.DataFrame(values).shift(1).rolling(window)
+    return getattr(rolling, statistic)().to_numpy()
+
+
+def _by_window(block, n_columns, n_windows):
+    return block.reshape(len(block), n_columns, n_windows)
+
+
+@pytest.mark.parametrize(
+    "statistic, features",
+    [("min", rolling_min_features), ("max", rolling_max_features)],
+)
+def test_rolling_extremums_equal_pandas(statistic, features):
+    values = _series()
+
+    block = _by_window(features(values, WINDOWS), 2, len(WINDOWS))
+
+    for k, window in enumerate(WINDOWS):
+        np.testing.assert_array_equal(
+            block[:, :, k], _pandas_rolling(values, window, statistic)
+        )
+
+
+@pytest.mark.parametrize(
+    "statistic, features",
+    [("mean", rolling_mean_features), ("std", rolling_std_features)],
+)
+def test_rolling_mean_and_std_match_pandas(statistic, features):
+    values = _series()
+
+    block = _by_window(features(values, WINDOWS), 2, len(WINDOWS))
+
+    # Within 1e-10 of the spread of the series, as pandas has its own rounding errors
+    for k, window in enumerate(WINDOWS):
+        np.testing.assert_allclose(
+            block[:, :, k],
+            _pandas_rolling(values, window, statistic),
+            rtol=1e-10,
+            atol=1e-10 * np.nanstd(values),
+        )
+
+
+def test_features_are_written_into_the_given_columns():
+    values = _series()
+    lags = [1, 2, 7]
+    statistics = ["mean", "std", "min", "max", "ewm"]
+    n_lags = 2 * len(lags)
+    block = np.zeros((len(values), n_lags + 2 * len(WINDOWS) * len(statistics)))
+
+    lag_features(values, lags, out=block[:, :n_lags])
+    rolling_features(values, WINDOWS, statistics, out=block[:, n_lags:])
+
+    np.testing.assert_array_equal(block[:, :n_lags], lag_features(values, lags))
+    np.testing.assert_array_equal(
+        block[:, n_lags:], rolling_features(values, WINDOWS, statistics)
+    )
+
+
+def test_ewm_matches_pandas():
+    values = _series()
+
+    block = _by_window(ewm_features(values, WINDOWS), 2, len(WINDOWS))
+
+    for k, window in enumerate(WINDOWS):
+        expected = (
+            pd.DataFrame(values)
+            .ewm(span=window, adjust=False, ignore_na=True, min_periods=window)
+            .mean()
+            .shift(1)
+            .to_numpy()
+        )
+        np.testing.assert_allclose(block[:, :, k], expected, rtol=1e-10, atol=1e-10)
+
+
+def _cached_features(df, cache, feature_params=FEATURE_PARAMS):
+    """Featurizes the data from the cache, and saves the cache update."""
+    featured, created, update = create_features_with_cache(
+        df.copy(), feature_params, CALENDAR, cache.load()
+    )
+    cache.save(update)
+    return featured[created], update
+
+
+def _computed(update):
+    return sorted(
+        name
+        for features in update.values()
+        for name, values in features.items()
+        if values is not None
+    )
+
+
+def test_cached_features_equal_features(tmp_path):
+    df = _processed_data(120)
+    cache = FeatureCacheDataset(filepath=str(tmp_path / "feature_cache"))
+
+    first, first_update = _cached_features(df, cache)
+    second, second_update = _cached_features(df, cache)
+
+    # One fingerprint per source column, all the features computed once
+    assert len(first_update) == 2
+    assert len(_computed(first_update)) == 2 * (3 + 4 * 5)
+    assert _computed(second_update) == []
+    _assert_equal_features(first, _features(df))
+    _assert_equal_features(second, _features(df))
+
+
+def test_feature_cache_recomputes_changed_columns_only(tmp_path):
+    df = _processed_data(120)
+    cache = FeatureCacheDataset(filepath=str(tmp_path / "feature_cache"))
+    _cached_features(df, cache)
+
+    df.loc[df.index[60], "temp"] += 1.0
+    featured, update = _cached_features(df, cache)
+
+    assert _computed(update) == sorted(
+        name for name in featured.columns if name.startswith("temp_")
+    )
+    _assert_equal_features(featured, _features(df))
+    # The features of the previous temperatures are pruned
+    assert sorted(cache.load()) == sorted(update)
+
+
+def test_feature_cache_prunes_features_no_longer_requested(tmp_path):
+    df = _processed_data(120)
+    cache = FeatureCacheDataset(filepath=str(tmp_path / "feature_cache"))
+    _cached_features(df, cache)
+
+    feature_params = {**FEATURE_PARAMS, "lags": [1], "window_sizes": [7]}
+    featured, update = _cached_features(df, cache, feature_params)
+
+    assert _computed(update) == []
+    cached_names = sorted(name for entries in cache.load().values() for name in entries)
+    basic_features = FEATURE_PARAMS["basic_features"]
+    assert cached_names == sorted(featured.columns.drop(basic_features))
@@ -0,0 +1,120 @@
+"""
+This is a boilerplate test file for pipeline 'hyperparameter_tuning_pipeline'
+generated using Kedro 0.19.3.
+Please add your pipeline tests here.
+
+Kedro recommends using `pytest` framework, more info about it can be found
+in the official documentation:
+https://docs.pytest.org/en/latest/getting-started.html
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from energy_forcasting_model.datasets import TuningStudy
+from energy_forcasting_model.pipelines.hyperparameter_tuning_pipeline import nodes
+from energy_forcasting_model.pipelines.hyperparameter_tuning_pipeline.nodes import (
+    hyperband_brackets,
+    tune_hyperparameters,
+)
+
+TUNING_PARAMS = {
+    "models": ["random_forest"],
+    "min_budget": 0.11,
+    "max_budget": 1.0,
+    "eta": 3,
+    "n_brackets": None,
+    "seed": 42,
+    "executor": {"n_workers": 1, "threads_per_worker": 1},
+}
+
+SEARCH_SPACES = {
+    "random_forest": {
+        "max_depth": {"type": "int", "low": 2, "high": 6},
+        "max_features": {"type": "float", "low": 0.3, "high": 1.0},
+    }
+}
+
+
+def test_hyperband_brackets():
+    assert hyperband_brackets(0.11, 1.0, 3) == [
+        [(9, 1.0 / 9), (3, 1.0 / 3), (1, 1.0)],
+        [(5, 1.0 / 3), (1, 1.0)],
+        [(3, 1.0)],
+    ]
+
+
+def test_hyperband_brackets_promote_one_eta_th():
+    for rungs in hyperband_brackets(0.01, 1.0, 4):
+        n_configs, budgets = zip(*rungs)
+        assert budgets[-1] == 1.0
+        assert np.allclose(np.diff(np.log(budgets)), np.log(4))
+        assert all(
+            n == max(first // 4, 1) for first, n in zip(n_configs, n_configs[1:])
+        )
+
+
+def _model_input(n_days=240, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    features = pd.DataFrame(rng.standard_normal((n_days, 3)), index=index)
+    features.columns = ["a", "b", "c"]
+    target = pd.Series(
+        features["a"] * 2.0 + features["b"] ** 2 + 0.1 * rng.standard_normal(n_days),
+        index=index,
+        name="target",
+    )
+    split = n_days * 3 // 4
+    return features[:split], target[:split], features[split:], target[split:]
+
+
+def _tune(study):
+    model = RandomForestRegressor(n_estimators=9, max_depth=3, random_state=0)
+    return tune_hyperparameters(
+        *_model_input(),
+        "fingerprint",
+        study,
+        TUNING_PARAMS,
+        SEARCH_SPACES,
+        random_forest=model,
+    )
+
+
+def test_tuning_resumes_an_interrupted_search(tmp_path, monkeypatch):
+    best_params, results = _tune(TuningStudy(str(tmp_path / "complete.db")))
+    # 9 + 3 + 1, 5 + 1 and 3 trials
+    assert len(results) == 22
+    full_budget = results[np.isclose(results["budget"], 1.0)]
+    best = full_budget.loc[full_budget["rmse"].idxmin()]
+    assert best_params["random_forest"] == json.loads(best["params"])
+
+    # Interrupt a search after 10 trials
+    run_trial = nodes._run_trial
+    calls = []
+
+    def interrupted_trial(*args):
+        if len(calls) == 10:
+            raise KeyboardInterrupt
+        calls.append(args)
+        return run_trial(*args)
+
+    study = TuningStudy(str(tmp_path / "interrupted.db"))
+    monkeypatch.setattr(nodes, "_run_trial", interrupted_trial)
+    with pytest.raises(KeyboardInterrupt):
+        _tune(study)
+    assert len(study.trials()) == 10
+
+    # Resuming only runs the 12 trials left, and finds the same parameters
+    calls.clear()
+    monkeypatch.setattr(
+        nodes, "_run_trial", lambda *args: calls.append(args) or run_trial(*args)
+    )
+    resumed_params, resumed_results = _tune(study)
+    assert len(calls) == 12
+    assert resumed_params == best_params
+    columns = ["model", "bracket", "config", "rung", "budget", "params", "rmse"]
+    pd.testing.assert_frame_equal(resumed_results[columns], results[columns])
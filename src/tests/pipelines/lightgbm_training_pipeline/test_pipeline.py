@@ -7,3 +7,97 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io import DatasetError
+
+from energy_forcasting_model.datasets import ModelArtifactDataset
+from energy_forcasting_model.pipelines.lightgbm_training_pipeline.nodes import (
+    train_lightgbm_model,
+)
+
+LIGHTGBM_PARAMS = {
+    "num_leaves": 7,
+    "learning_rate": 0.2,
+    "n_estimators": 200,
+    "early_stopping_rounds": 10,
+    "verbose": -1,
+}
+
+WARM_START = {
+    "enabled": True,
+    "max_added_trees": 5,
+    "recent_period": "200D",
+    "max_error_ratio": 100.0,
+}
+
+
+def _model_input(n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    features = pd.DataFrame(rng.standard_normal((n_days, 3)), index=index)
+    features.columns = ["a", "b", "c"]
+    target = features["a"] * 3.0 + features["b"] ** 2 + rng.standard_normal(n_days)
+    return features, target.rename("target")
+
+
+def _train(features, target, previous_model=None, previous_info=None):
+    fit, validation = slice(None, -60), slice(-60, None)
+    return train_lightgbm_model(
+        features[fit],
+        target[fit],
+        features[validation],
+        target[validation],
+        LIGHTGBM_PARAMS,
+        previous_model=previous_model,
+        previous_info=previous_info,
+        warm_start=WARM_START,
+    )
+
+
+def test_lightgbm_model_round_trip(tmp_path):
+    features, target = _model_input(400)
+    model, info = _train(features, target)
+
+    # Early stopped, with the parameters it was created with
+    assert 0 < model.best_iteration_ < LIGHTGBM_PARAMS["n_estimators"]
+    assert model.get_params()["n_estimators"] == LIGHTGBM_PARAMS["n_estimators"]
+    dataset = ModelArtifactDataset(
+        filepath=str(tmp_path / "lightgbm_model.txt"), library="lightgbm"
+    )
+    dataset.save(model)
+    loaded = dataset.load()
+    assert type(loaded) is type(model)
+    np.testing.assert_array_equal(loaded.predict(features), model.predict(features))
+    assert loaded.get_params() == model.get_params()
+
+
+def test_model_with_unserializable_params_is_not_saved(tmp_path):
+    features, target = _model_input(400)
+    model, _ = _train(features, target)
+    model.set_params(objective=lambda y_true, y_pred: (y_pred - y_true, y_true * 0))
+    dataset = ModelArtifactDataset(
+        filepath=str(tmp_path / "lightgbm_model.txt"), library="lightgbm"
+    )
+
+    with pytest.raises(DatasetError, match="not JSON serializable"):
+        dataset.save(model)
+    assert not dataset.exists()
+
+
+def test_lightgbm_warm_start_adds_trees(tmp_path):
+    features, target = _model_input(430)
+    previous_model, previous_info = _train(features[:400], target[:400])
+    n_trees = previous_model.booster_.current_iteration()
+    dataset = ModelArtifactDataset(
+        filepath=str(tmp_path / "lightgbm_model.txt"), library="lightgbm", lazy=True
+    )
+    dataset.save(previous_model)
+
+    model, info = _train(features, target, dataset.load(), previous_info)
+
+    assert n_trees < model.booster_.current_iteration() <= n_trees + 5
+    assert model.get_params() == previous_model.get_params()
+    assert info["params"] == previous_info["params"]
@@ -7,3 +7,148 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_forcasting_model.datasets import MemmapDataset
+from energy_forcasting_model.pipelines.train_test_split_pipeline.nodes import (
+    fold_data,
+    prepare_walk_forward_data,
+    train_test_split_plot,
+    walk_forward_folds,
+)
+from energy_forcasting_model.reporting import downsample, lttb_indices
+
+WALK_FORWARD = {
+    "target": "total_consumption",
+    "first_origin": "2020-03-01",
+    "n_origins": 3,
+    "step": "10D",
+    "horizon": "7D",
+    "gap": "0D",
+    "window": "expanding",
+    "train_length": "30D",
+}
+
+
+def _featured_data(n_days=120):
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    return pd.DataFrame(
+        {
+            "total_consumption": rng.standard_normal(n_days),
+            "lag_1": rng.standard_normal(n_days),
+            "dayofweek": index.dayofweek.astype("int32"),
+        },
+        index=index,
+    )
+
+
+@pytest.mark.parametrize(
+    "window, train_starts", [("expanding", [0, 0, 0]), ("rolling", [30, 40, 50])]
+)
+def test_walk_forward_folds(window, train_starts):
+    timestamps = _featured_data().index
+    params = {**WALK_FORWARD, "window": window}
+
+    folds = walk_forward_folds(timestamps, params)
+
+    # 2020-03-01 is the 61st day
+    assert [fold["train"] for fold in folds] == [
+        [start, 60 + 10 * k] for k, start in enumerate(train_starts)
+    ]
+    assert [fold["test"] for fold in folds] == [
+        [60 + 10 * k, 67 + 10 * k] for k in range(3)
+    ]
+
+
+def test_walk_forward_folds_stop_at_the_end_of_the_data():
+    timestamps = _featured_data().index
+    params = {**WALK_FORWARD, "n_origins": None, "gap": "2D"}
+
+    folds = walk_forward_folds(timestamps, params)
+
+    # The last test window, from 2020-04-22 to 2020-04-28, fits in the 120 days
+    assert len(folds) == 6
+    assert folds[-1]["test"] == [112, 119]
+    assert all(fold["test"][0] == fold["train"][1] + 2 for fold in folds)
+
+
+def test_fold_data_are_views_of_the_shared_matrix(tmp_path):
+    features, target, folds = prepare_walk_forward_data(
+        _featured_data(), ["lag_1", "dayofweek"], WALK_FORWARD
+    )
+    MemmapDataset(filepath=str(tmp_path / "features")).save(features)
+    MemmapDataset(filepath=str(tmp_path / "target")).save(target)
+    features = MemmapDataset(filepath=str(tmp_path / "features")).load()
+    target = MemmapDataset(filepath=str(tmp_path / "target")).load()
+
+    for fold in folds:
+        X_train, y_train, X_test, y_test = fold_data(features, target, fold)
+        assert len(X_train) == fold["train"][1] - fold["train"][0]
+        assert len(X_test) == fold["test"][1] - fold["test"][0]
+        for name in features.columns:
+            for fold_features in (X_train, X_test):
+                assert np.shares_memory(
+                    fold_features[name].to_numpy(), features[name].to_numpy()
+                )
+        for fold_target in (y_train, y_test):
+            assert np.shares_memory(fold_target.to_numpy(), target.to_numpy())
+
+
+def _reference_lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets point by point, on the same buckets."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    buckets = [range(edges[i], edges[i + 1]) for i in range(n_out - 2)]
+    indices = [0]
+    for i, bucket in enumerate(buckets):
+        following = buckets[i + 1] if i + 1 < len(buckets) else [n - 1]
+        c_x = sum(x[j] for j in following) / len(following)
+        c_y = sum(y[j] for j in following) / len(following)
+        a_x, a_y = x[indices[-1]], y[indices[-1]]
+        areas = [
+            abs((a_x - c_x) * (y[j] - a_y) - (a_x - x[j]) * (c_y - a_y))
+            for j in bucket
+        ]
+        indices.append(bucket[int(np.argmax(areas))])
+    return np.array(indices + [n - 1])
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 50), (1001, 3), (257, 100)])
+def test_lttb_indices_match_the_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.standard_normal(n))
+
+    indices = lttb_indices(x, y, n_out)
+
+    assert len(indices) == n_out
+    np.testing.assert_array_equal(indices, _reference_lttb(x, y, n_out))
+
+
+def test_lttb_keeps_the_peaks():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234], y[3210] = 10.0, -10.0
+
+    indices = lttb_indices(np.arange(len(y)), y, 100)
+
+    assert {0, 1234, 3210, len(y) - 1} <= set(indices.tolist())
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_downsample():
+    series = _featured_data(500)["total_consumption"]
+
+    assert downsample(series, None) is series
+    assert downsample(series, 500) is series
+    downsampled = downsample(series, 40)
+    assert len(downsampled) == 40
+    assert downsampled.index[[0, -1]].equals(series.index[[0, -1]])
+    assert downsampled.equals(series.loc[downsampled.index])
+
+    plot = train_test_split_plot(series[:400], series[400:], max_points=40)
+    assert len(plot.data["y_train"]) == 40
+    assert len(plot.data["y_test"]) == 40